@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+قياس أداء مسارات الكشف الساخنة في أداة urlget على عينات اصطناعية ثابتة
+
+يقيس عدد العمليات في الثانية والذاكرة المخصصة لكل استدعاء، ويحفظ النتائج بصيغة JSON
+لمقارنتها بتشغيل سابق والإبلاغ عن التراجعات.
+
+الاستخدام:
+    python benchmarks/hotpaths.py --output before.json
+    python benchmarks/hotpaths.py --output after.json --compare before.json
+"""
+
+import os
+import sys
+import gc
+import json
+import time
+import random
+import timeit
+import logging
+import argparse
+import platform
+import tracemalloc
+import subprocess
+
+# تشغيل السكربت من جذر المستودع دون تثبيت الحزمة
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from colorama import Fore, Style, init
+from dnslib import DNSRecord
+
+from urlget.csrf import CSRFGenerator
+from urlget.dns_hijack import DNSHijacker
+from urlget.engine import ResponseSample
+from urlget.fuzzer import HTTPFuzzer
+from urlget.metrics import get_metrics
+from urlget.xss import XSSScanner
+
+# بذرة ثابتة حتى تكون العينات متطابقة بين التشغيلات
+SEED = 1337
+
+SQL_ERROR = "You have an error in your SQL syntax; check the manual near ''' at line 1"
+# حمولة دون محارف يحذفها الماسح قبل البحث، حتى يصل الانعكاس إلى تحليل HTML
+XSS_PAYLOAD = "<svg onload=confirm>"
+
+
+def _words(rng, count):
+    """كلمات عشوائية ثابتة من البذرة"""
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return [''.join(rng.choice(letters) for _ in range(rng.randint(3, 10))) for _ in range(count)]
+
+
+def html_page(rng, paragraphs, extra=""):
+    """صفحة HTML عادية بعدد الفقرات المحدد وإدراج اختياري قبل نهاية الجسم"""
+    rows = []
+    for i in range(paragraphs):
+        words = ' '.join(_words(rng, 12))
+        rows.append(f'<div class="row r{i}"><a href="/item?id={i}" title="{words[:20]}">{words}</a>'
+                    f'<p>{words}</p></div>')
+    return (f"<!DOCTYPE html><html><head><title>bench</title><script>var cfg = {{id: 1}};</script></head>"
+            f"<body>{''.join(rows)}{extra}</body></html>")
+
+
+def html_pathological(depth=2000):
+    """صفحة متداخلة بعمق كبير مع سمات كثيرة وتطابقات جزئية متكررة للحمولة"""
+    opening = ''.join(f'<div id="d{i}" data-a="<scrip" data-b="alert(">' for i in range(depth))
+    return f"<html><body>{opening}{'<scrip alert(' * depth}{'</div>' * depth}</body></html>"
+
+
+def multipart_body(rng, fields, file_size=0, boundary="----urlgetBoundary7MA4YWxkTrZu0gW"):
+    """جسم multipart/form-data بعدد الحقول المحدد وملف اختياري بالحجم المحدد"""
+    parts = []
+    for name in _words(rng, fields):
+        parts.append(f'--{boundary}\nContent-Disposition: form-data; name="{name}"\n\n{" ".join(_words(rng, 4))}\n')
+    if file_size:
+        parts.append(f'--{boundary}\nContent-Disposition: form-data; name="upload"; filename="a.bin"\n'
+                     f'Content-Type: application/octet-stream\n\n{"A" * file_size}\n')
+    parts.append(f'--{boundary}--\n')
+    return f"multipart/form-data; boundary={boundary}", ''.join(parts)
+
+
+def build_corpora():
+    """
+    إنشاء جميع العينات الاصطناعية
+
+    العائد:
+        dict: العينات حسب الاسم
+    """
+    rng = random.Random(SEED)
+    return {
+        'html_small': html_page(rng, 10),
+        'html_large': html_page(rng, 4000),
+        'html_pathological': html_pathological(),
+        'html_large_error': html_page(rng, 4000, f"<pre>{SQL_ERROR}</pre>"),
+        'html_large_reflected': html_page(rng, 4000, f"<span>{XSS_PAYLOAD}</span>"),
+        'multipart_small': multipart_body(rng, 5),
+        'multipart_large': multipart_body(rng, 500),
+        'multipart_file': multipart_body(rng, 3, file_size=1 << 20),
+        'form_large': '&'.join(f"{name}={value}" for name, value in zip(_words(rng, 1000), _words(rng, 1000))),
+        'json_large': json.dumps({name: _words(rng, 3) for name in _words(rng, 1000)}),
+    }
+
+
+def _quiet(logger):
+    """إيقاف رسائل السجل حتى لا يقاس زمن الكتابة إلى وحدة التحكم"""
+    logger.setLevel(logging.CRITICAL)
+    return logger
+
+
+def fuzzer_cases(corpora):
+    """حالات HTTPFuzzer._check_vulnerability على أجسام دون انعكاس (أسوأ حالة: فحص التواقيع كاملاً)"""
+    fuzzer = HTTPFuzzer("http://bench.local/item?id=1", checkpoint=False)
+    _quiet(fuzzer.logger)
+    payload = "1' OR '1'='1"
+
+    def case(body):
+        content = body.encode('utf-8')
+        headers = {'Content-Type': 'text/html; charset=utf-8'}
+        return lambda: fuzzer._check_vulnerability(ResponseSample(200, headers, content, 'utf-8'), payload)
+
+    # بناء مهمة لقيمة متداخلة في جسم JSON كبير (لصق الحمولة دون إعادة التسلسل)
+    json_fuzzer = HTTPFuzzer("http://bench.local/api", json_body=json.loads(corpora['json_large']), checkpoint=False)
+    _quiet(json_fuzzer.logger)
+    json_fuzzer.payloads = [payload]
+    json_target = json_fuzzer.json_body.paths[-1]
+
+    return {
+        'fuzzer.check_vulnerability/small': case(corpora['html_small']),
+        'fuzzer.check_vulnerability/large': case(corpora['html_large']),
+        'fuzzer.check_vulnerability/large_error': case(corpora['html_large_error']),
+        'fuzzer.check_vulnerability/pathological': case(corpora['html_pathological']),
+        'fuzzer.build_task/json_large': lambda: json_fuzzer._build_task('json', json_target, 0,
+                                                                       "http://bench.local/api", {}),
+    }
+
+
+def xss_cases(corpora):
+    """حالات XSSScanner._check_xss_reflection بانعكاس الحمولة ودونه"""
+    scanner = XSSScanner("http://bench.local/search?q=1")
+    _quiet(scanner.logger)
+    check = scanner._check_xss_reflection
+
+    return {
+        'xss.check_reflection/small': lambda: check(corpora['html_small'], XSS_PAYLOAD),
+        'xss.check_reflection/large': lambda: check(corpora['html_large'], XSS_PAYLOAD),
+        'xss.check_reflection/large_reflected': lambda: check(corpora['html_large_reflected'], XSS_PAYLOAD),
+        'xss.check_reflection/pathological': lambda: check(corpora['html_pathological'], "<script>alert(1)</script>"),
+    }
+
+
+def csrf_cases(corpora):
+    """حالات CSRFGenerator.parse_form_data لكل نوع محتوى"""
+
+    def case(content_type, body):
+        generator = CSRFGenerator()
+        _quiet(generator.logger)
+        generator.request_data = {'method': 'POST', 'url': 'http://bench.local/submit',
+                                  'headers': {'Content-Type': content_type}, 'body': body}
+        return generator.parse_form_data
+
+    return {
+        'csrf.parse_form_data/form_large': case('application/x-www-form-urlencoded', corpora['form_large']),
+        'csrf.parse_form_data/json_large': case('application/json', corpora['json_large']),
+        'csrf.parse_form_data/multipart_small': case(*corpora['multipart_small']),
+        'csrf.parse_form_data/multipart_large': case(*corpora['multipart_large']),
+        'csrf.parse_form_data/multipart_file': case(*corpora['multipart_file']),
+    }
+
+
+def dns_cases():
+    """
+    حالات DNSHijackResolver.resolve للسجلات المزيفة
+
+    مسار إعادة التوجيه إلى الخادم الأصلي مستبعد لأنه يقيس الشبكة لا الكود.
+    """
+    # بناء المختطف دون __init__ الذي يتطلب صلاحيات الجذر ويحدد واجهة الشبكة
+    hijacker = DNSHijacker.__new__(DNSHijacker)
+    hijacker.logger = _quiet(logging.getLogger("DNSHijackerBench"))
+    hijacker.stats = {"requests": 0, "spoofed": 0, "forwarded": 0, "errors": 0}
+    hijacker.spoof_records = {}
+    metrics = get_metrics()
+    hijacker.query_metric = metrics.counter("dns_queries_total", "استعلامات DNS حسب النوع والنتيجة")
+    hijacker.upstream_latency = metrics.histogram("dns_upstream_duration_seconds",
+                                                  "زمن إعادة توجيه الاستعلامات إلى الخادم الأصلي")
+
+    hijacker.add_spoof_record("example.com", "A", "192.0.2.10")
+    hijacker.add_spoof_record("example.com", "MX", "10 mail.example.com")
+    for i in range(1000):
+        hijacker.add_spoof_record(f"host{i}.bench.local", "A", f"198.51.100.{i % 250 + 1}")
+    resolver = DNSHijacker.DNSHijackResolver(hijacker)
+
+    def case(name, qtype):
+        # الحزمة تحلل مرة واحدة؛ resolve لا يعدل الطلب
+        request = DNSRecord.parse(DNSRecord.question(name, qtype).pack())
+        return lambda: resolver.resolve(request, None)
+
+    return {
+        'dns.resolve/exact_a': case("example.com", "A"),
+        'dns.resolve/exact_mx': case("example.com", "MX"),
+        'dns.resolve/subdomain': case("www.api.example.com", "A"),
+        # النطاق الفرعي لآخر سجل يمر على جميع النطاقات المزيفة
+        'dns.resolve/subdomain_many_records': case("www.host999.bench.local", "A"),
+    }
+
+
+def measure(func, min_time=0.2, repeat=5):
+    """
+    قياس دالة واحدة
+
+    المعلمات:
+        func (callable): الدالة دون وسائط
+        min_time (float): أقل زمن لكل تكرار قياس بالثواني
+        repeat (int): عدد تكرارات القياس (يؤخذ الأسرع)
+
+    العائد:
+        dict: العمليات في الثانية وذروة الذاكرة والذاكرة المتبقية لكل استدعاء
+    """
+    func()  # إحماء الذاكر المؤقتة (مثل تجميع التعابير النمطية)
+
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        if timer.timeit(number) >= min_time:
+            break
+        number *= 2
+    best = min(timer.repeat(repeat, number)) / number
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        # الدورات المرجعية (مثل شجرة BeautifulSoup) ليست تسريبًا؛ تجمع قبل قياس المتبقي
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'ops_per_sec': 1.0 / best if best > 0 else float('inf'),
+        'seconds_per_op': best,
+        'peak_bytes': peak - before,
+        'retained_bytes': after - before,
+        'number': number,
+    }
+
+
+def collect_cases(corpora):
+    """جميع الحالات حسب الاسم"""
+    cases = {}
+    cases.update(fuzzer_cases(corpora))
+    cases.update(xss_cases(corpora))
+    cases.update(csrf_cases(corpora))
+    cases.update(dns_cases())
+    return cases
+
+
+def _git_revision():
+    """المراجعة الحالية للمستودع إن أمكن"""
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL,
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(selected=None, min_time=0.2, repeat=5):
+    """
+    تشغيل الحالات المحددة
+
+    المعلمات:
+        selected (list): أجزاء من أسماء الحالات للتصفية (None للجميع)
+
+    العائد:
+        dict: النتائج مع معلومات البيئة
+    """
+    corpora = build_corpora()
+    results = {}
+    for name, func in collect_cases(corpora).items():
+        if selected and not any(part in name for part in selected):
+            continue
+        results[name] = measure(func, min_time, repeat)
+        result = results[name]
+        print(f"{Fore.CYAN}{name:<48}{Style.RESET_ALL} {result['ops_per_sec']:>12,.1f} ops/s "
+              f"{result['peak_bytes'] / 1024:>10,.1f} KiB ذروة {result['retained_bytes'] / 1024:>8,.1f} KiB متبقية")
+
+    return {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'revision': _git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': SEED,
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold=0.10):
+    """
+    مقارنة النتائج بتشغيل سابق
+
+    المعلمات:
+        current (dict): نتائج run
+        baseline (dict): نتائج محفوظة سابقًا
+        threshold (float): نسبة التغير المسموح بها قبل اعتباره تراجعًا
+
+    العائد:
+        list: أسماء الحالات المتراجعة
+    """
+    regressions = []
+    print(f"\n{Fore.YELLOW}[*] المقارنة مع {baseline.get('revision') or baseline.get('created')}:{Style.RESET_ALL}")
+    for name, result in current['results'].items():
+        old = baseline['results'].get(name)
+        if old is None:
+            print(f"    {name:<48} جديد")
+            continue
+
+        speed = result['ops_per_sec'] / old['ops_per_sec'] - 1 if old['ops_per_sec'] else 0.0
+        memory = result['peak_bytes'] / old['peak_bytes'] - 1 if old['peak_bytes'] else 0.0
+        regressed = speed < -threshold or memory > threshold
+        color = Fore.RED if regressed else (Fore.GREEN if speed > threshold else Style.RESET_ALL)
+        print(f"    {color}{name:<48} السرعة {speed:+7.1%}  الذاكرة {memory:+7.1%}{Style.RESET_ALL}")
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    """نقطة الدخول"""
+    init()
+    parser = argparse.ArgumentParser(description="قياس أداء مسارات الكشف الساخنة في urlget")
+    parser.add_argument("-o", "--output", help="ملف JSON لحفظ النتائج")
+    parser.add_argument("-c", "--compare", help="ملف JSON لتشغيل سابق للمقارنة معه")
+    parser.add_argument("-t", "--threshold", type=float, default=0.10,
+                        help="نسبة التراجع في السرعة أو الذاكرة التي تعتبر فشلاً (الافتراضي 0.10)")
+    parser.add_argument("-k", "--filter", action="append", help="تشغيل الحالات التي يحتوي اسمها على النص فقط")
+    parser.add_argument("--min-time", type=float, default=0.2, help="أقل زمن لكل تكرار قياس بالثواني")
+    parser.add_argument("--repeat", type=int, default=5, help="عدد تكرارات القياس (يؤخذ الأسرع)")
+    args = parser.parse_args()
+
+    current = run(args.filter, args.min_time, args.repeat)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2, ensure_ascii=False)
+        print(f"{Fore.GREEN}[+] تم حفظ النتائج في: {args.output}{Style.RESET_ALL}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"{Fore.RED}[!] تراجع الأداء في {len(regressions)} حالة{Style.RESET_ALL}")
+            sys.exit(1)
+        print(f"{Fore.GREEN}[+] لا يوجد تراجع في الأداء{Style.RESET_ALL}")
+
+
+if __name__ == "__main__":
+    main()
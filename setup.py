@@ -13,6 +13,7 @@ setup(
     packages=find_packages(),
     install_requires=[
         "requests",
+        "aiohttp",
         "selenium",
         "beautifulsoup4",
         "colorama",
@@ -25,6 +26,9 @@ setup(
         "cryptography",
         "packaging",
     ],
+    extras_require={
+        "http2": ["httpx[http2]"],
+    },
     entry_points={
         "console_scripts": [
             "urlget=urlget.cli:main",
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+أدوات مشتركة لاختبارات urlget: خوادم HTTP محلية في مواضيع خلفية
+"""
+
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+
+class QuietHandler(BaseHTTPRequestHandler):
+    """معالج أساسي دون سجلات مع دعم keep-alive"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, status, body, headers=None):
+        """إرسال استجابة كاملة"""
+        data = body.encode('utf-8') if isinstance(body, str) else body
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def read_body(self):
+        """قراءة جسم الطلب"""
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b""
+
+
+@pytest.fixture
+def http_server():
+    """
+    تشغيل خادم HTTP محلي بمعالج يحدده الاختبار
+
+    العائد:
+        callable: دالة تستقبل فئة المعالج وتعيد العنوان الأساسي للخادم
+    """
+    servers = []
+
+    def start(handler):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        server.daemon_threads = True
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+اختبارات تحديد ترميز الاستجابات وترميز الحمولات للبحث بالبايت
+"""
+
+import codecs
+import html
+from urllib.parse import urlparse, parse_qs
+
+from urlget.charset import (EncodingCache, SNIFF_BYTES, ascii_compatible, bom_encoding, encode_variants,
+                            header_charset, media_type, reflection_forms, sniff_encoding)
+from urlget.fuzzer import HTTPFuzzer
+from urlget.transport import HTTPTransport
+from tests.conftest import QuietHandler
+
+HTML = {'Content-Type': "text/html"}
+
+# نص ثابت في الصفحة حتى لا يغير حذف كلمة منعكسة بصمتها
+ARTICLE = ("يمكنك البحث باستخدام كلمات أقل أو التحقق من الإملاء أو تصفح الأقسام الرئيسية في المتجر "
+           "حيث تجد الكتب والمجلات والأدوات المكتبية والهدايا مع عروض أسبوعية وشحن سريع إلى جميع المدن")
+
+
+def test_header_charset_and_media_type():
+    """معلمة charset تقرأ بأي حالة أحرف ومع علامات الاقتباس، والأسماء توحد"""
+    headers = {'Content-Type': 'Text/HTML; Charset="Windows-1256"'}
+    assert header_charset(headers) == "cp1256"
+    assert media_type(headers) == "text/html"
+    assert header_charset({'Content-Type': "text/html; charset=bogus"}) is None
+    assert header_charset({'Content-Type': "text/html"}) is None
+    assert header_charset(None) is None
+
+
+def test_sniff_reads_bom_then_declarations():
+    """علامة ترتيب البايت تتقدم على التصريح، والتصريح يقرأ من أول SNIFF_BYTES فقط"""
+    assert bom_encoding(codecs.BOM_UTF32_LE + b"x") == "utf-32"
+    assert bom_encoding(codecs.BOM_UTF16_LE + b"x") == "utf-16"
+    assert sniff_encoding(codecs.BOM_UTF8 + b'<meta charset="iso-8859-1">') == "utf-8"
+    assert sniff_encoding(b"<html><meta charset='ISO-8859-1'>") == "iso8859-1"
+    assert sniff_encoding(b'<meta http-equiv="Content-Type" content="text/html; charset=windows-1256">') == "cp1256"
+    assert sniff_encoding(b'<?xml version="1.0" encoding="Shift_JIS"?>') == "shift_jis"
+    assert sniff_encoding(b" " * SNIFF_BYTES + b'<meta charset="cp1256">') is None
+
+
+def test_cache_reuses_sniffed_encoding_per_host_and_type():
+    """الترميز المكتشف من الجسم يعاد استخدامه لنفس المضيف ونوع المحتوى دون الرؤوس الأخرى"""
+    cache = EncodingCache()
+    page = b'<html><head><meta charset="windows-1256"></head>'
+
+    assert cache.resolve("http://a.test/1", HTML, page) == "cp1256"
+    assert cache.expected("http://a.test/2", HTML) == "cp1256"
+    assert cache.resolve("http://a.test/2", HTML, b"<html>no declaration</html>") == "cp1256"
+    assert cache.resolve("http://a.test/x.json", {'Content-Type': "application/json"}, b"{}") == "utf-8"
+    assert cache.resolve("http://b.test/", HTML, b"<html></html>") == "utf-8"
+
+    # الرأس يتقدم على الذاكرة، وعلامة ترتيب البايت تخص جسمها وحده
+    assert cache.resolve("http://a.test/3", {'Content-Type': "text/html; charset=utf-8"}, page) == "utf-8"
+    assert cache.resolve("http://a.test/4", HTML, codecs.BOM_UTF16_LE + "x".encode('utf-16-le')) == "utf-16"
+    assert cache.expected("http://a.test/5", HTML) == "utf-8"
+    assert cache.likely("http://a.test/") == ("cp1256", "utf-8")
+
+
+def test_payload_variants_skip_incompatible_encodings():
+    """الحمولة ترمز بكل ترميز متوافق مع ASCII دون تكرار، والترميزات الأخرى تستبعد"""
+    assert ascii_compatible("cp1256") and not ascii_compatible("utf-16")
+    assert encode_variants("مرحبا'", ("cp1256", "utf-16", "utf-8")) == ("مرحبا'".encode('utf-8'), "مرحبا'".encode('cp1256'))
+    assert encode_variants("é", ("ascii",)) == ("é".encode('utf-8'),)
+
+    forms = reflection_forms("<م>", ("cp1256",))
+    assert html.escape("<م>").encode('cp1256') in forms
+    assert list(forms) == sorted(forms, key=len, reverse=True)
+
+
+class ArabicSearchHandler(QuietHandler):
+    """صفحة بحث بترميز windows-1256 مصرح به في الجسم فقط تعرض الاستعلام بعد ترميز HTML (ودونه تحت /raw)"""
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query).get('q', [''])[0]
+        shown = query if parsed.path.startswith('/raw') else html.escape(query)
+        body = (f'<html><head><meta charset="windows-1256"><title>بحث</title></head>'
+                f'<body><h1>نتائج البحث عن {shown}</h1><p>لا توجد نتائج مطابقة لبحثك.</p>'
+                f'<p>{ARTICLE}</p></body></html>')
+        self.reply(200, body.encode('cp1256'), HTML)
+
+
+def test_transport_sniffs_and_reuses_page_encoding(http_server):
+    """الناقل يحدد ترميز الصفحة من الجسم ويعيده للطلبات التالية على المضيف"""
+    base = http_server(ArabicSearchHandler)
+    transport = HTTPTransport()
+
+    sample = transport.fetch("GET", f"{base}/search?q=كتاب")
+    assert sample.encoding == "cp1256"
+    assert "نتائج البحث عن كتاب" in sample.text
+    assert transport.encodings.expected(f"{base}/other", HTML) == "cp1256"
+    transport.close()
+
+
+def _fuzz(base, path, tmp_path):
+    """تشويش معلمة البحث بحمولات عربية"""
+    payloads = tmp_path / "payloads.txt"
+    payloads.write_text("كتاب\nروايات عربية مترجمة من الأدب العالمي الحديث والمعاصر\n<b>عنوان</b>\n",
+                        encoding='utf-8')
+    fuzzer = HTTPFuzzer(f"{base}{path}?q=test", payloads_file=str(payloads), threads=2, checkpoint=False,
+                        timing_samples=0, transport=HTTPTransport())
+    return fuzzer.start()
+
+
+def test_reflection_in_legacy_encoding(http_server, tmp_path):
+    """الحمولات العربية تكتشف بترميز الصفحة: المرمزة بـ HTML ليست نقطة ضعف والمنعكسة كما هي نقطة ضعف"""
+    base = http_server(ArabicSearchHandler)
+
+    escaped = _fuzz(base, "/search", tmp_path)
+    assert escaped['total_requests'] > 0
+    assert escaped['vulnerable_params'] == []
+
+    raw = _fuzz(base, "/raw", tmp_path)
+    assert [(finding['param_name'], finding['payload']) for finding in raw['vulnerable_params']] == \
+        [("q", "<b>عنوان</b>")]
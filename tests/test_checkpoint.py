@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+اختبارات نقاط الحفظ والاستئناف
+"""
+
+import os
+import json
+import shutil
+import threading
+from urllib.parse import urlparse, parse_qs
+
+from urlget.checkpoint import Checkpoint, run_key
+from urlget.fuzzer import HTTPFuzzer
+from tests.conftest import QuietHandler
+
+PAYLOADS = ["' OR 1=1 --", "admin", "<b>x</b>", "1 AND 1=2", "test", "null", "-1", "{{7*7}}", "../etc", "0"]
+
+
+class ErrorHandler(QuietHandler):
+    """صفحة تظهر خطأ SQL عند وجود علامة اقتباس في أي معلمة"""
+
+    on_request = None
+
+    def do_GET(self):
+        if self.on_request is not None:
+            self.on_request()
+        values = [value for values in parse_qs(urlparse(self.path).query).values() for value in values]
+        body = "You have an error in your SQL syntax" if any("'" in value for value in values) else "Nothing here"
+        self.reply(200, f"<html><body>{body}</body></html>", {"Content-Type": "text/html"})
+
+
+def _records(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_progress_round_trip(tmp_path):
+    """خريطة البتات والمؤشر والنتائج تحفظ وتستعاد، ونقطة حفظ عملية أخرى لا تستعاد"""
+    path = str(tmp_path / "run.ckpt")
+    checkpoint = Checkpoint(path, run_key("a"), [('param', 20), ('header', 5)])
+    for index in (0, 1, 2, 5, 19):
+        checkpoint.mark_done('param', index)
+    checkpoint.mark_all([('header', 4)], lambda: None)
+    checkpoint.start(lambda: {'findings': [{'param_name': 'id'}], 'results': {'total': 6}})
+    checkpoint.close()
+
+    restored = Checkpoint(path, run_key("a"), [('param', 20), ('header', 5)])
+    assert restored.load()
+    assert restored.completed() == 6
+    assert restored.cursor('param') == 3
+    assert restored.is_done('param', 19) and not restored.is_done('param', 18)
+    assert restored.is_done('header', 4)
+    assert restored.findings == [{'param_name': 'id'}]
+    assert restored.results == {'total': 6}
+
+    assert not Checkpoint(path, run_key("b"), [('param', 20), ('header', 5)]).load()
+    assert not Checkpoint(path, run_key("a"), [('param', 21), ('header', 5)]).load()
+
+
+def test_plain_run_writes_no_checkpoint(http_server, tmp_path, monkeypatch):
+    """نقاط الحفظ اختيارية: التشغيل العادي لا يكتب ملفات في المجلد الحالي"""
+    monkeypatch.chdir(tmp_path)
+    base = http_server(ErrorHandler)
+    payloads = tmp_path / "payloads.txt"
+    payloads.write_text("\n".join(PAYLOADS) + "\n", encoding='utf-8')
+
+    fuzzer = HTTPFuzzer(f"{base}/item?id=1", payloads_file=str(payloads), threads=2, timing_samples=0)
+    fuzzer.start()
+    assert fuzzer.checkpoint is None
+    assert sorted(os.listdir(tmp_path)) == ["payloads.txt", "payloads.txt.idx"]
+
+
+def test_resume_after_crash_writes_each_record_once(http_server, tmp_path):
+    """السجلات المكتوبة بعد آخر نقطة حفظ لا تتكرر في ملف النتائج عند الاستئناف"""
+    payloads = tmp_path / "payloads.txt"
+    payloads.write_text("\n".join(PAYLOADS) + "\n", encoding='utf-8')
+    checkpoint_file = str(tmp_path / "run.ckpt")
+    snapshot = str(tmp_path / "snapshot.ckpt")
+    output = str(tmp_path / "out.jsonl")
+    state = {'requests': 0, 'fuzzer': None}
+    lock = threading.Lock()
+
+    class SnapshotHandler(ErrorHandler):
+        def on_request(self):
+            # نسخة من نقطة حفظ دورية في منتصف العملية؛ استعادتها لاحقًا تماثل انهيار العملية بعدها
+            with lock:
+                state['requests'] += 1
+                if state['requests'] == 25:
+                    state['fuzzer'].checkpoint.save()
+                    shutil.copy(checkpoint_file, snapshot)
+
+    base = http_server(SnapshotHandler)
+    url = f"{base}/item?id=1&q=x"
+    options = dict(payloads_file=str(payloads), threads=2, timing_samples=0, baseline_samples=1,
+                   checkpoint_file=checkpoint_file, results_file=output)
+
+    first = state['fuzzer'] = HTTPFuzzer(url, **options)
+    complete = first.start()
+    total = first.count_tasks()
+    assert len(_records(output)) == total
+    assert not os.path.exists(checkpoint_file)
+
+    shutil.copy(snapshot, checkpoint_file)
+    state['requests'] = -10 ** 6
+    resumed = state['fuzzer'] = HTTPFuzzer(url, resume=True, **options)
+    result = resumed.start()
+
+    records = _records(output)
+    keys = [(record['param_name'], record['payload_index']) for record in records]
+    assert len(keys) == len(set(keys)) == total
+    assert result['total_requests'] == total
+    assert result['summary']['status_counts'] == complete['summary']['status_counts']
+    assert sorted(v['payload'] for v in result['vulnerable_params']) == \
+        sorted(v['payload'] for v in complete['vulnerable_params'])
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+اختبارات مجموعات الحمولات المعنونة بالذاكرة
+"""
+
+import os
+import pickle
+
+import pytest
+
+from urlget.corpus import PayloadCorpus, open_corpus
+
+
+def _write(path, text):
+    path.write_bytes(text.encode('utf-8'))
+    return str(path)
+
+
+def test_lines_are_stripped_and_deduplicated(tmp_path):
+    """الأسطر الفارغة تحذف، والمسافات تزال، والمكرر يحذف مع الحفاظ على الترتيب"""
+    path = _write(tmp_path / "payloads.txt", "  ' OR 1=1 --\r\n\n<script>\nadmin\n' OR 1=1 --\n\t\nمرحبا\nadmin")
+    corpus = PayloadCorpus(path)
+    assert list(corpus) == ["' OR 1=1 --", "<script>", "admin", "مرحبا"]
+    assert corpus[-1] == "مرحبا"
+    assert corpus[1:3] == ["<script>", "admin"]
+    with pytest.raises(IndexError):
+        corpus[4]
+    corpus.close()
+
+    assert list(PayloadCorpus(path, dedupe=False)) == ["' OR 1=1 --", "<script>", "admin", "' OR 1=1 --",
+                                                       "مرحبا", "admin"]
+
+
+def test_index_is_reused_until_file_changes(tmp_path):
+    """الفهرس المحفوظ يعين في الذاكرة عند الفتح التالي ويعاد بناؤه إذا تغير الملف"""
+    path = _write(tmp_path / "payloads.txt", "a\nb\nc\n")
+    PayloadCorpus(path).close()
+    assert os.path.exists(path + ".idx")
+
+    reopened = PayloadCorpus(path)
+    assert isinstance(reopened._offsets, memoryview)
+    assert list(reopened) == ["a", "b", "c"]
+    reopened.close()
+
+    _write(tmp_path / "payloads.txt", "a\nb\nc\nd\ne\n")
+    changed = PayloadCorpus(path)
+    assert list(changed) == ["a", "b", "c", "d", "e"]
+    changed.close()
+
+
+def test_empty_file_and_pickling(tmp_path):
+    """الملف الفارغ مجموعة فارغة، والمجموعة تنقل إلى عملية أخرى بمسارها فقط"""
+    assert len(PayloadCorpus(_write(tmp_path / "empty.txt", ""))) == 0
+
+    corpus = PayloadCorpus(_write(tmp_path / "payloads.txt", "x\ny\n"))
+    state = pickle.dumps(corpus)
+    assert len(state) < 200
+    assert list(pickle.loads(state)) == ["x", "y"]
+
+
+def test_open_corpus_is_shared_and_refreshed(tmp_path):
+    """open_corpus يعيد نفس المجموعة لنفس الملف، ومجموعة جديدة بعد تعديله"""
+    path = _write(tmp_path / "payloads.txt", "a\n")
+    first = open_corpus(path)
+    assert open_corpus(path) is first
+
+    _write(tmp_path / "payloads.txt", "a\nb\n")
+    # ضمان تغير وقت التعديل حتى على أنظمة الملفات ذات الدقة المنخفضة
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10 ** 9))
+    refreshed = open_corpus(path)
+    assert refreshed is not first
+    assert list(refreshed) == ["a", "b"]
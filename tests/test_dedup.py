@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+اختبارات ذاكرة الطلبات المتطابقة
+"""
+
+from urlget.dedup import RequestCache, request_key
+
+VERDICT = {
+    'status_code': 500, 'response_time': 0.25, 'response_length': 2048, 'content_length': 2048,
+    'retained_length': 1024, 'truncated': True, 'header_names': ['content-length', 'content-type'],
+    'is_vulnerable': True, 'signatures': [{'name': 'mysql_syntax', 'pack': 'mysql', 'start': 10, 'end': 30}],
+    'anomalies': ['status', 'simhash'], 'timing': None,
+    'fingerprint': {'status': 500, 'length': 2048, 'words': 100, 'lines': 10, 'simhash': 1, 'header_hash': 2},
+}
+
+
+def _expected():
+    return {name: value for name, value in VERDICT.items() if name != 'fingerprint'}
+
+
+def test_memory_round_trip_keeps_everything_but_fingerprint():
+    """النتيجة المختصرة تعاد بكل الحقول اللازمة لإعادة التسجيل"""
+    cache = RequestCache()
+    key = request_key("GET", "http://example.com/", {'q': "1"})
+    cache.put(key, VERDICT)
+    assert cache.get(key) == _expected()
+    assert cache.hits == 1
+
+
+def test_sqlite_round_trip(tmp_path):
+    """النتائج المخزنة على القرص تقرأ في عملية جديدة"""
+    path = str(tmp_path / "dedup.db")
+    key = request_key("POST", "http://example.com/login", body={'user': "admin"})
+    cache = RequestCache(path)
+    cache.put(key, VERDICT)
+    cache.close()
+
+    cache = RequestCache(path)
+    assert cache.get(key) == _expected()
+    cache.close()
+
+
+def test_entries_are_bounded():
+    """الذاكرة تحتفظ بأحدث max_entries نتيجة فقط"""
+    cache = RequestCache(max_entries=10)
+    keys = [request_key("GET", "http://example.com/", {'q': str(i)}) for i in range(25)]
+    for key in keys:
+        cache.put(key, VERDICT)
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[-1]) is not None
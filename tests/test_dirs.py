@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+اختبارات اكتشاف المحتوى على خادم محلي بصفحات "عدم وجود" مختلفة لكل مجلد
+"""
+
+import html
+from urllib.parse import quote
+
+from urlget.dirs import ContentDiscovery
+from tests.conftest import QuietHandler
+
+WORDS = ["admin", "backup", "images", "", "# تعليق", "index", "config", "robots.txt"]
+
+
+class SiteHandler(QuietHandler):
+    """
+    موقع بمعالجات متعددة لعدم الوجود:
+    الجذر يعيد 200 لأي مسار (soft 404) ويحول أي ملف .php إلى صفحة الدخول، و /admin/ يعيد 404 حقيقيًا
+    """
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path == "/admin":
+            self.reply(301, "", {"Location": "/admin/"})
+        elif path == "/admin/":
+            self.reply(200, "<html><body><h1>Administration</h1><a href='users'>Users</a></body></html>")
+        elif path == "/admin/config.php":
+            self.reply(200, "DB_HOST=localhost\nDB_USER=root\nDB_PASSWORD=secret\n", {"Content-Type": "text/plain"})
+        elif path.startswith("/admin/"):
+            self.reply(404, "<html><body>Not Found</body></html>")
+        elif path == "/backup.bak":
+            self.reply(200, b"PK\x03\x04" + bytes(range(256)) * 8, {"Content-Type": "application/octet-stream"})
+        elif path.endswith(".php"):
+            self.reply(302, "", {"Location": f"/login?next={quote(path)}"})
+        else:
+            self.reply(200, f"<html><head><title>Shop</title></head><body><h1>Oops!</h1>"
+                            f"<p>Sorry, the page {html.escape(path)} does not exist. Try the search box above, "
+                            f"browse our catalogue or contact customer support for help.</p></body></html>",
+                       {"Content-Type": "text/html"})
+
+
+def test_soft_404_and_directory_recursion(http_server, tmp_path):
+    """صفحات عدم الوجود المعايرة لكل مجلد وامتداد لا تظهر، والمجلدات المحولة تفحص بدورها"""
+    base = http_server(SiteHandler)
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_text("\n".join(WORDS) + "\n", encoding='utf-8')
+
+    discovery = ContentDiscovery(f"{base}/", wordlist=str(wordlist), extensions=["php", ".bak"], threads=4)
+    results = discovery.start()
+
+    found = {entry['url']: entry for entry in results['found']}
+    assert sorted(found) == [f"{base}/admin/", f"{base}/admin/config.php", f"{base}/backup.bak"]
+    assert found[f"{base}/admin/"]['directory'] and found[f"{base}/admin/"]['status_code'] == 301
+    assert found[f"{base}/admin/config.php"]['depth'] == 1
+    assert not found[f"{base}/backup.bak"]['directory']
+
+    # مجلدان، وفي كل منهما 6 كلمات صالحة مع امتدادين ومعايرة 3 مسارات لكل امتداد
+    assert discovery.scanned == 2
+    assert results['requests'] == 2 * (6 * 3 + 3 * 3)
+    assert set(discovery.baselines) == {(f"{base}/{sub}", suffix) for sub in ("", "admin/")
+                                        for suffix in ("", ".php", ".bak")}
+
+
+def test_max_depth_stops_recursion(http_server, tmp_path):
+    """المجلدات المكتشفة بعد أقصى عمق تسجل ولا تفحص"""
+    base = http_server(SiteHandler)
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_text("\n".join(WORDS) + "\n", encoding='utf-8')
+
+    discovery = ContentDiscovery(f"{base}/", wordlist=str(wordlist), max_depth=0, threads=4)
+    results = discovery.start()
+
+    assert [entry['url'] for entry in results['found']] == [f"{base}/admin/"]
+    assert discovery.scanned == 1
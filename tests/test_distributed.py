@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+اختبارات التشويش الموزع: منسق وعمال في عمليات منفصلة على المضيف المحلي
+"""
+
+import time
+import socket
+import threading
+import multiprocessing
+from urllib.parse import urlparse, parse_qs
+
+import urlget.fuzzer
+from urlget.distributed import Coordinator, Worker
+from urlget.fuzzer import HTTPFuzzer
+from tests.conftest import QuietHandler
+
+PAYLOADS = ["admin", "' OR 1=1 --", "<b>x</b>", "1 AND 1=2", "test123", "' UNION SELECT 1 --",
+            "../../etc/passwd", "{{7*7}}", "null", "-1"]
+
+
+class StubHandler(QuietHandler):
+    """صفحة ثابتة تظهر خطأ SQL عند وجود علامة اقتباس في أي معلمة"""
+
+    def do_GET(self):
+        values = [value for values in parse_qs(urlparse(self.path).query).values() for value in values]
+        if any("'" in value for value in values):
+            body = "<html><body>You have an error in your SQL syntax; check the manual</body></html>"
+        else:
+            body = "<html><body><p>Nothing to see here.</p></body></html>"
+        self.reply(200, body, {"Content-Type": "text/html; charset=utf-8"})
+
+
+class SlowStubHandler(StubHandler):
+    """نفس الصفحة مع تأخير بسيط حتى يبقى لدى العامل نطاق مؤجر لفترة"""
+
+    def do_GET(self):
+        time.sleep(0.02)
+        super().do_GET()
+
+
+def _free_port():
+    """منفذ محلي غير مستخدم"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _run_worker(address, threads=2):
+    """نقطة دخول عملية العامل: انتظار استماع المنسق ثم تنفيذ النطاقات"""
+    host, port = address.rsplit(":", 1)
+    for _ in range(200):
+        try:
+            socket.create_connection((host, int(port)), timeout=1).close()
+            break
+        except OSError:
+            time.sleep(0.05)
+    Worker(address, overrides={'threads': threads}).run()
+
+
+def _requests_sent(fuzzer):
+    """طلبات المشوش عبر جميع المصادر دون طلبات الاستجابات الأساسية"""
+    snapshot = fuzzer.metrics.snapshot()
+    return sum(value for (name, labels), value in snapshot['counters'].items()
+               if name == "http_requests_total" and dict(labels).get('mode') != 'baseline')
+
+
+def _coordinate(fuzzer, workers):
+    """
+    تشغيل المشوش كمنسق في موضوع وتشغيل العمال في عمليات منفصلة
+
+    العائد:
+        tuple: (نتيجة start أو None إذا لم يكتمل التنسيق، عمليات العمال)
+    """
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(fuzzer.start()), daemon=True)
+    thread.start()
+    context = multiprocessing.get_context('spawn')
+    processes = [context.Process(target=_run_worker, args=(fuzzer.listen,), daemon=True) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    return thread, result, processes
+
+
+def _stop(processes):
+    """إنهاء عمليات العمال المتبقية"""
+    for process in processes:
+        process.join(10)
+        if process.is_alive():
+            process.kill()
+            process.join()
+
+
+def test_worker_batches_reach_coordinator(http_server, tmp_path):
+    """دفعات العمال (مع لقطة المقاييس) تصل إلى المنسق وتدمج مقاييسها في سجله"""
+    base = http_server(StubHandler)
+    payloads = tmp_path / "payloads.txt"
+    payloads.write_text("\n".join(PAYLOADS) + "\n", encoding='utf-8')
+
+    fuzzer = HTTPFuzzer(f"{base}/item?id=1&q=x", payloads_file=str(payloads), threads=2, checkpoint=False,
+                        timing_samples=0, listen=f"127.0.0.1:{_free_port()}", lease_size=4)
+    before = _requests_sent(fuzzer)
+    thread, result, processes = _coordinate(fuzzer, 2)
+    try:
+        thread.join(60)
+        assert not thread.is_alive()
+    finally:
+        _stop(processes)
+
+    total = fuzzer.count_tasks()
+    assert result['total_requests'] == total
+    assert _requests_sent(fuzzer) - before == total
+
+
+def _findings(result):
+    """نقاط الضعف كمجموعة (المعلمة، الحمولة) مستقلة عن ترتيب الاكتمال"""
+    return {(vuln['param_name'], vuln['payload']) for vuln in result['vulnerable_params']}
+
+
+def test_distributed_run_matches_single_process(http_server, tmp_path, monkeypatch, caplog):
+    """المنسق مع عاملين يعطي نفس نتائج التشغيل في عملية واحدة، ونطاق العامل المتوقف يعاد تأجيره"""
+    base = http_server(SlowStubHandler)
+    payloads = tmp_path / "payloads.txt"
+    payloads.write_text("\n".join(PAYLOADS) + "\n", encoding='utf-8')
+    url = f"{base}/item?id=1&q=x"
+    options = dict(payloads_file=str(payloads), threads=2, checkpoint=False, timing_samples=0)
+
+    single = HTTPFuzzer(url, **options).start()
+
+    coordinators = []
+
+    def coordinator(*args, **kwargs):
+        # مهلة قصيرة حتى يعاد توزيع نطاق العامل المتوقف خلال الاختبار
+        instance = Coordinator(*args, lease_timeout=2.0, **kwargs)
+        coordinators.append(instance)
+        return instance
+
+    monkeypatch.setattr(urlget.fuzzer, 'Coordinator', coordinator)
+    fuzzer = HTTPFuzzer(url, listen=f"127.0.0.1:{_free_port()}", lease_size=8, **options)
+    thread, result, processes = _coordinate(fuzzer, 1)
+    try:
+        # إيقاف العامل الأول بعد حصوله على نطاق ثم تشغيل عاملين آخرين
+        deadline = time.monotonic() + 30
+        while not (coordinators and coordinators[0].leases) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert coordinators[0].leases
+        processes[0].kill()
+        processes[0].join()
+
+        context = multiprocessing.get_context('spawn')
+        for _ in range(2):
+            process = context.Process(target=_run_worker, args=(fuzzer.listen,), daemon=True)
+            process.start()
+            processes.append(process)
+
+        thread.join(90)
+        assert not thread.is_alive()
+    finally:
+        _stop(processes)
+
+    assert any("انتهت مهلة العامل" in record.getMessage() for record in caplog.records)
+    assert len(coordinators[0].workers) == 3
+    assert result['total_requests'] == single['total_requests'] == fuzzer.count_tasks()
+    assert result['summary']['status_counts'] == single['summary']['status_counts']
+    assert _findings(result) == _findings(single)
+    assert _findings(single)
+
+
+def test_worker_dedup_hits_reach_coordinator(http_server, tmp_path):
+    """نتائج ذاكرة الطلبات في العامل تحتسب في إحصائيات المنسق كما في التشغيل في عملية واحدة"""
+    base = http_server(StubHandler)
+    payloads = tmp_path / "payloads.txt"
+    payloads.write_text("\n".join(PAYLOADS) + "\n", encoding='utf-8')
+    url = f"{base}/item?id=1"
+    # ترميز URL لا يغير الحمولات دون محارف خاصة، فيتكرر نفس الطلب
+    options = dict(payloads_file=str(payloads), threads=1, checkpoint=False, timing_samples=0, mutations="raw,url")
+
+    single = HTTPFuzzer(url, **options)
+    single.start()
+    assert single.dedup.hits > 0
+
+    fuzzer = HTTPFuzzer(url, listen=f"127.0.0.1:{_free_port()}", lease_size=1000, **options)
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(fuzzer.start()), daemon=True)
+    thread.start()
+    # عامل بموضوع واحد حتى تتسلسل الطلبات المتطابقة فتعاد نتيجتها من الذاكرة
+    process = multiprocessing.get_context('spawn').Process(target=_run_worker, args=(fuzzer.listen, 1), daemon=True)
+    process.start()
+    try:
+        thread.join(60)
+        assert not thread.is_alive()
+    finally:
+        _stop([process])
+
+    assert fuzzer.dedup.hits == single.dedup.hits
+
+
+def test_coordinator_rejects_wrong_token(tmp_path):
+    """العامل برمز مختلف يرفض قبل إرسال الإعدادات"""
+    fuzzer = HTTPFuzzer("http://127.0.0.1:9/item?id=1", checkpoint=False)
+    coordinator = Coordinator(fuzzer, "127.0.0.1:0", token="s3cret")
+    for token in ("wrong", "", None, "s3cret-but-longer"):
+        assert coordinator.handle({'type': 'hello', 'worker': 'w', 'token': token})['type'] == 'error'
+    assert not coordinator.workers
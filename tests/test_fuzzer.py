@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+اختبارات المشوش على خوادم محلية
+"""
+
+import html
+import json
+import time
+from urllib.parse import urlparse, parse_qs
+
+from urlget.fuzzer import HTTPFuzzer
+from tests.conftest import QuietHandler
+
+# حمولات تنعكس كما هي أو بعد ترميز HTML في صفحة بحث عادية
+ECHO_PAYLOADS = [
+    "' OR 1=1 --", "' OR '1'='1", "1' OR '1' = '1", "' UNION SELECT 1,2,3 --", "admin' --",
+    "<script>alert(1)</script>", "<img src=x onerror=alert(1)>", "javascript:alert(1)",
+    "\"><svg onload=alert(1)>", "'-alert(1)-'", "{{7*7}}", "${7*7}", "../../../../etc/passwd",
+    "admin", "root", "test123", "hello world", "1 OR 1=1", "1 AND 1=2", "sleep(5)",
+    "waitfor delay '0:0:5'", "; ls -la", "| id", "`id`", "$(id)", "%00", "%27", "%3Cscript%3E",
+    "&lt;b&gt;", "a" * 64, "lorem ipsum dolor sit amet consectetur", "one two three four five six",
+    "SELECT name FROM products", "ORDER BY 10", "-1", "0", "99999999999", "null", "true", "[]",
+    "{}", "a=b&c=d", "#fragment", "/index.php", "http://example.org/", "user@example.com",
+    "<!--", "]]>", "\\u003cscript\\u003e", "' or sleep(1)#",
+]
+
+
+class EchoHandler(QuietHandler):
+    """صفحة بحث تعرض الاستعلام بعد ترميز HTML دون أي سلوك آخر"""
+
+    def _page(self):
+        query = parse_qs(urlparse(self.path).query).get('q', [''])[0]
+        body = (f"<html><head><title>Search</title></head><body><h1>Results for {html.escape(query)}</h1>"
+                f"<p>No products matched your search.</p></body></html>")
+        self.reply(200, body, {"Content-Type": "text/html; charset=utf-8"})
+
+    def do_GET(self):
+        self._page()
+
+    def do_POST(self):
+        self.read_body()
+        self._page()
+
+
+def test_echo_only_endpoint_has_no_findings(http_server, tmp_path):
+    """انعكاس الحمولة وحده (مع ترميز HTML أو دونه) لا يعتبر اختلافًا عن الاستجابات الأساسية"""
+    base = http_server(EchoHandler)
+    payloads = tmp_path / "payloads.txt"
+    payloads.write_text("\n".join(ECHO_PAYLOADS) + "\n", encoding='utf-8')
+
+    fuzzer = HTTPFuzzer(f"{base}/search?q=test", payloads_file=str(payloads), threads=4,
+                        checkpoint=False, timing_samples=0)
+    results = fuzzer.start()
+
+    assert results['total_requests'] > 0
+    assert results['vulnerable_params'] == []
+
+
+def test_cached_verdicts_reach_payload_stats(http_server, tmp_path):
+    """نتائج ذاكرة الطلبات تحتسب في إحصائيات الحمولات كما لو أرسلت الطلبات"""
+    base = http_server(EchoHandler)
+    payloads = tmp_path / "payloads.txt"
+    payloads.write_text("\n".join(ECHO_PAYLOADS[:10]) + "\n", encoding='utf-8')
+    stats = tmp_path / "stats.json"
+    options = dict(payloads_file=str(payloads), threads=4, checkpoint=False, timing_samples=0,
+                   dedup_cache=str(tmp_path / "dedup.db"), payload_stats=str(stats))
+
+    HTTPFuzzer(f"{base}/search?q=test", **options).start()
+    first = json.loads(stats.read_text(encoding='utf-8'))
+
+    # التشغيل الثاني يعيد كل النتائج من الذاكرة دون إرسال
+    fuzzer = HTTPFuzzer(f"{base}/search?q=test", **options)
+    fuzzer.start()
+    second = json.loads(stats.read_text(encoding='utf-8'))
+
+    assert fuzzer.dedup.hits == fuzzer.count_tasks()
+    assert first['sent'] == fuzzer.count_tasks()
+    assert second['sent'] == first['sent'] * 2
+    # صفحة الانعكاس لا تنتج نقاط ضعف فلا تحفظ مدخلات للحمولات
+    assert first['payloads'] == second['payloads'] == {}
+
+
+def test_baseline_latencies_exclude_rate_limit_wait(http_server, tmp_path):
+    """أزمنة الاستجابات الأساسية لا تشمل انتظار المتحكم بسبب max_rate"""
+    base = http_server(EchoHandler)
+    payloads = tmp_path / "payloads.txt"
+    payloads.write_text("admin\n", encoding='utf-8')
+
+    fuzzer = HTTPFuzzer(f"{base}/search?q=test", payloads_file=str(payloads), threads=1, checkpoint=False,
+                        adaptive=True, max_rate=4, baseline_samples=1, timing_samples=5)
+    start_time = time.monotonic()
+    fuzzer.capture_baselines()
+    wall = time.monotonic() - start_time
+
+    # خمسة طلبات بمعدل 4 في الثانية تستغرق ثانية على الأقل، والخادم يرد فورًا
+    assert wall > 0.9
+    profile = next(iter(fuzzer.latencies.values()))
+    assert len(profile.sorted) == 5
+    assert max(profile.sorted) < 0.15
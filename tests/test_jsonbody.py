@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+اختبارات تشويش أجسام JSON المتداخلة
+"""
+
+import json
+import threading
+
+import pytest
+
+from urlget.fuzzer import HTTPFuzzer
+from urlget.jsonbody import JSONBody
+from tests.conftest import QuietHandler
+
+DOCUMENT = {
+    "user": {"name": "bob", "age": 30, "tags": ["a", "b"], "meta": {}},
+    "active": True,
+    "note": None,
+    "weird key": "é",
+    "empty": [],
+}
+
+
+def _set(document, path, value):
+    """نسخة من المستند مع استبدال القيمة في المسار"""
+    copy = json.loads(json.dumps(document))
+    target = copy
+    for step in path[:-1]:
+        target = target[step]
+    target[path[-1]] = value
+    return copy
+
+
+def test_paths_and_kinds_cover_every_leaf():
+    """كل قيمة طرفية على أي عمق نقطة حقن باسم مقروء ونوعها"""
+    body = JSONBody(DOCUMENT)
+
+    assert body.paths == ["user.name", "user.age", "user.tags[0]", "user.tags[1]", "user.meta",
+                          "active", "note", '["weird key"]', "empty"]
+    assert body.kind_counts() == {'string': 4, 'number': 1, 'object': 1, 'array': 1, 'boolean': 1, 'null': 1}
+    assert json.loads(body.data) == DOCUMENT
+
+
+@pytest.mark.parametrize("name, path", [
+    ("user.name", ("user", "name")),
+    ("user.age", ("user", "age")),
+    ("user.tags[1]", ("user", "tags", 1)),
+    ("user.meta", ("user", "meta")),
+    ("note", ("note",)),
+    ('["weird key"]', ("weird key",)),
+])
+def test_render_matches_reserialized_document(name, path):
+    """اللصق في الجسم المسلسل مسبقًا يطابق تعديل المستند وإعادة تسلسله"""
+    body = JSONBody(DOCUMENT)
+    payload = "' OR \"1\"=\"1\" -- \\ é\n"
+
+    rendered = body.render(name, payload)
+    assert rendered == json.dumps(_set(DOCUMENT, path, payload)).encode('ascii')
+    assert json.loads(rendered) == _set(DOCUMENT, path, payload)
+
+
+def test_scalar_and_empty_documents():
+    """المستند البسيط نقطة حقن واحدة والمستند الفارغ بلا نقاط"""
+    scalar = JSONBody("x")
+    assert scalar.paths == ["$"]
+    assert scalar.render("$", "y") == b'"y"'
+
+    empty = JSONBody({})
+    assert len(empty) == 0
+    assert empty.data == b"{}"
+
+
+class JSONHandler(QuietHandler):
+    """واجهة تعرض خطأ SQL عند وجود علامة اقتباس في user.name فقط"""
+
+    bodies = []
+    lock = threading.Lock()
+
+    def do_GET(self):
+        self.reply(200, "ok")
+
+    def do_POST(self):
+        document = json.loads(self.read_body() or b"{}")
+        with self.lock:
+            self.bodies.append(document)
+        user = document.get("user")
+        if isinstance(user, dict) and "'" in str(user.get("name")):
+            self.reply(500, "You have an error in your SQL syntax", {"Content-Type": "text/html"})
+        else:
+            self.reply(200, '{"ok": true}', {"Content-Type": "application/json"})
+
+
+def test_fuzzer_reports_the_nested_path(http_server, tmp_path):
+    """المشوش يرسل جسمًا صالحًا لكل قيمة ويحدد المسار المتداخل الذي أدى إلى الخطأ"""
+    JSONHandler.bodies = []
+    base = http_server(JSONHandler)
+    payloads = tmp_path / "payloads.txt"
+    payloads.write_text("admin\n1'\n", encoding='utf-8')
+    document = {"user": {"name": "bob", "tags": ["a"]}, "page": 1}
+
+    fuzzer = HTTPFuzzer(f"{base}/api", payloads_file=str(payloads), threads=2, checkpoint=False,
+                        timing_samples=0, json_body=document)
+    results = fuzzer.start()
+
+    assert _set(document, ("user", "tags", 0), "1'") in JSONHandler.bodies
+    assert _set(document, ("page",), "admin") in JSONHandler.bodies
+    json_findings = [(finding['param_name'], finding['payload']) for finding in results['vulnerable_params']
+                     if finding['param_name'].startswith("JSON:")]
+    assert json_findings == [("JSON:user.name", "1'")]
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+اختبارات سلاسل تحويلات الحمولات
+"""
+
+from urllib.parse import urlparse, parse_qs, unquote
+
+import pytest
+
+from urlget.fuzzer import HTTPFuzzer
+from urlget.mutations import (MutatedPayloads, apply_chain, mutate, parse_mutations,
+                              payload_origin, with_origin)
+from tests.conftest import QuietHandler
+
+
+def test_parse_mutations_dedupes_and_validates():
+    """السلاسل تحلل بالترتيب دون تكرار، والتحويل غير المعروف يرفض"""
+    assert parse_mutations("raw, url ,url+html,,url,double-url") == \
+        [('raw',), ('url',), ('url', 'html'), ('double-url',)]
+    assert parse_mutations(["upper", ("url", "lower")]) == [('upper',), ('url', 'lower')]
+
+    with pytest.raises(ValueError):
+        parse_mutations("url+rot13")
+
+
+def test_apply_chain_runs_in_order():
+    """كل تحويل يطبق على نتيجة التحويل السابق"""
+    assert apply_chain("<a b>", ('url',)) == "%3Ca%20b%3E"
+    assert apply_chain("<a b>", ('url', 'html')) == "&#x25;3Ca&#x25;20b&#x25;3E"
+    assert apply_chain("'", ('double-url',)) == "%2527"
+    assert apply_chain("<é>", ('unicode',)) == "\\u003c\\u00e9\\u003e"
+    assert apply_chain("select from", ('mixed',)) == "sElEcT fRoM"
+
+
+def test_mutated_payloads_index_like_the_expanded_list():
+    """التسلسل الكسول يطابق قائمة المتغيرات الكاملة في الفهرسة والتقطيع والأصل"""
+    base = ["a'b", "<x>"]
+    chains = parse_mutations("raw,url,upper")
+    payloads = MutatedPayloads(base, chains)
+    expanded = [apply_chain(payload, chain) for payload in base for chain in chains]
+
+    assert len(payloads) == 6
+    assert list(payloads) == expanded
+    assert [payloads[i] for i in range(6)] == expanded
+    assert payloads[-1] == expanded[-1]
+    assert payloads[1:5:2] == expanded[1:5:2]
+    with pytest.raises(IndexError):
+        payloads[6]
+
+    assert [payloads.origin(i) for i in range(6)] == ["a'b"] * 3 + ["<x>"] * 3
+    assert [payloads.chain_name(i) for i in range(3)] == ["raw", "url", "upper"]
+    assert list(with_origin(payloads)) == list(zip(expanded, [payloads.origin(i) for i in range(6)]))
+    assert payload_origin(payloads, 4) == "<x>"
+
+
+def test_mutate_without_real_chains_returns_the_payloads():
+    """بدون وصف أو مع raw وحده تستخدم الحمولات نفسها"""
+    base = ["a", "b"]
+    assert mutate(base, None) is base
+    assert mutate(base, "raw") is base
+    assert isinstance(mutate(base, "raw,url"), MutatedPayloads)
+    assert payload_origin(base, 1) == "b"
+
+
+class DoubleDecodeHandler(QuietHandler):
+    """مرشح يرفض علامة الاقتباس بعد فك الترميز الأول، والتطبيق يفك الترميز مرة ثانية قبل الاستعلام"""
+
+    seen = set()
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query).get('id', [''])[0]
+        self.seen.add(query)
+        if "'" not in query and "'" in unquote(query):
+            self.reply(500, "You have an error in your SQL syntax", {"Content-Type": "text/html"})
+        else:
+            self.reply(200, "<html><body>Item 1</body></html>", {"Content-Type": "text/html"})
+
+
+def test_fuzzer_sends_each_chain_and_reports_the_variant(http_server, tmp_path):
+    """كل سلسلة ترسل كطلب مستقل والنتيجة تحمل المتغير الذي تجاوز المرشح"""
+    DoubleDecodeHandler.seen = set()
+    base = http_server(DoubleDecodeHandler)
+    payloads = tmp_path / "payloads.txt"
+    payloads.write_text("1'\nadmin\n", encoding='utf-8')
+
+    fuzzer = HTTPFuzzer(f"{base}/item?id=1", payloads_file=str(payloads), threads=2, checkpoint=False,
+                        timing_samples=0, mutations="raw,url,double-url")
+    results = fuzzer.start()
+
+    # فك ترميز الاستعلام يعيد متغير url إلى 1%27 فيمر بالمرشح ويصل التطبيق كعلامة اقتباس
+    assert len(fuzzer.payloads) == 6
+    assert {"1'", "1%27", "1%2527", "admin"} <= DoubleDecodeHandler.seen
+    assert [(finding['param_name'], finding['payload']) for finding in results['vulnerable_params']] == \
+        [("id", "1%27")]
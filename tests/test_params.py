@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+اختبارات اكتشاف المعلمات المخفية على خوادم محلية
+"""
+
+import html
+from urllib.parse import urlparse, parse_qs
+
+from urlget.params import ParamDiscovery
+from tests.conftest import QuietHandler
+
+# أسماء بأطوال مختلفة؛ أطوال الأسماء العشوائية في الاستجابات الأساسية ثابتة
+NAMES = [f"{word}{index}" for index in range(60)
+         for word in ("id", "page_size", "callback", "x", "returnUrl")]
+
+
+class EchoPathHandler(QuietHandler):
+    """صفحة 404 تعرض المسار المطلوب كاملاً ولا تقبل أي معلمة"""
+
+    def do_GET(self):
+        body = (f"<html><body><h1>Not Found</h1><p>The requested URL {html.escape(self.path)} "
+                f"was not found on this server.</p></body></html>")
+        self.reply(404, body, {"Content-Type": "text/html"})
+
+
+class HiddenDebugHandler(EchoPathHandler):
+    """نفس الصفحة، لكن المعلمة debug تضيف معلومات تشخيصية"""
+
+    def do_GET(self):
+        if 'debug' in parse_qs(urlparse(self.path).query):
+            self.reply(200, "<html><body><pre>stack: main() line 42\nuser=admin role=root</pre></body></html>",
+                       {"Content-Type": "text/html"})
+            return
+        super().do_GET()
+
+
+def _discover(base, tmp_path, names, **options):
+    """تشغيل الاكتشاف بقائمة أسماء مؤقتة"""
+    wordlist = tmp_path / "names.txt"
+    wordlist.write_text("\n".join(names) + "\n", encoding='utf-8')
+    return ParamDiscovery(f"{base}/missing/page?lang=en", wordlist=str(wordlist), threads=2, **options).start()
+
+
+def test_echoed_request_url_is_not_a_parameter(http_server, tmp_path):
+    """صفحة تعرض العنوان المطلوب لا تنتج معلمات، ولا تقسم الدفعات"""
+    assert len(NAMES) == 300
+    results = _discover(http_server(EchoPathHandler), tmp_path, NAMES, batch_size=64)
+
+    assert results['candidates'] == 300
+    assert results['parameters'] == []
+    # 3 استجابات أساسية وطلب لكل دفعة
+    assert results['requests'] <= 3 + 5
+
+
+def test_hidden_parameter_is_isolated(http_server, tmp_path):
+    """المعلمة التي تغير الاستجابة تعزل بالتقسيم الثنائي دون بقية أسماء الدفعة"""
+    names = NAMES[:120] + ["debug"] + NAMES[120:]
+    results = _discover(http_server(HiddenDebugHandler), tmp_path, names, batch_size=64)
+
+    assert [parameter['name'] for parameter in results['parameters']] == ["debug"]
+    assert results['requests'] < 40
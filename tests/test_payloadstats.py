@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+اختبارات إحصائيات نجاح الحمولات وترتيبها
+"""
+
+import json
+
+from urlget.payloadstats import PayloadStats, OrderedPayloads
+
+PAYLOADS = ["admin", "' OR 1=1 --", "<script>", "1' AND SLEEP(5)--", "test"]
+
+
+def _run(path, hits, sends=3, **kwargs):
+    """تشغيل يرسل كل حمولة عدة مرات وينجح بعضها مرة واحدة على mysql"""
+    stats = PayloadStats(path, **kwargs)
+    stats.load()
+    for payload in PAYLOADS:
+        for attempt in range(sends):
+            stats.observe(payload, attempt == 0 and payload in hits, ['mysql'])
+    stats.save()
+    return stats
+
+
+def test_only_successful_payloads_are_stored(tmp_path):
+    """الملف يحفظ الحمولات الناجحة فقط، مع عدد الطلبات الكلي"""
+    path = str(tmp_path / "stats.json")
+    _run(path, {"' OR 1=1 --"})
+    _run(path, {"' OR 1=1 --", "1' AND SLEEP(5)--"})
+
+    data = json.loads(open(path, encoding='utf-8').read())
+    assert data['sent'] == 2 * 3 * len(PAYLOADS)
+    assert data['payloads'] == {
+        "' OR 1=1 --": {'sent': 6, 'hits': 2, 'backends': {'mysql': 2}},
+        "1' AND SLEEP(5)--": {'sent': 3, 'hits': 1, 'backends': {'mysql': 1}},
+    }
+
+
+def test_order_puts_successful_payloads_first(tmp_path):
+    """الحمولات الناجحة تقدم حسب معدل نجاحها على الخلفية المطلوبة والبقية بترتيب الملف"""
+    path = str(tmp_path / "stats.json")
+    _run(path, {"' OR 1=1 --"})
+    _run(path, {"' OR 1=1 --", "1' AND SLEEP(5)--"})
+
+    stats = PayloadStats(path)
+    assert stats.load() == 2
+    ordered = stats.order(PAYLOADS, ['mysql'])
+    assert isinstance(ordered, OrderedPayloads)
+    # نجاح واحد من 3 طلبات (منعم 2/5) قبل نجاحين من 6 (منعم 3/8)
+    assert list(ordered) == ["1' AND SLEEP(5)--", "' OR 1=1 --", "admin", "<script>", "test"]
+    assert stats.order(PAYLOADS, ['oracle']) is PAYLOADS
+
+
+def test_table_is_capped(tmp_path):
+    """عند تجاوز الحد تبقى الحمولات الأعلى أولوية"""
+    path = str(tmp_path / "stats.json")
+    stats = PayloadStats(path, max_entries=2)
+    for payload, hits in zip(PAYLOADS, [1, 3, 2, 0, 1]):
+        for attempt in range(4):
+            stats.observe(payload, attempt < hits)
+    stats.save()
+
+    assert set(stats.payloads) == {"' OR 1=1 --", "<script>"}
+    assert set(json.loads(open(path, encoding='utf-8').read())['payloads']) == set(stats.payloads)
+
+
+def test_version_one_files_keep_their_hits(tmp_path):
+    """ملفات الإصدار الأول تقرأ دون مدخلات الحمولات التي لم تنجح"""
+    path = tmp_path / "stats.json"
+    path.write_text(json.dumps({'version': 1, 'payloads': {
+        "admin": {'sent': 9, 'hits': 0, 'backends': {}},
+        "' OR 1=1 --": {'sent': 9, 'hits': 2, 'backends': {'mysql': 2}},
+    }}), encoding='utf-8')
+
+    stats = PayloadStats(str(path))
+    assert stats.load() == 1
+    assert stats.score("' OR 1=1 --") == 3 / 11
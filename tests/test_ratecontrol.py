@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+اختبارات المتحكم التكيفي في المعدل والتزامن
+"""
+
+import time
+import threading
+
+from urlget.ratecontrol import AdaptiveController
+from urlget.transport import HTTPTransport
+from tests.conftest import QuietHandler
+
+
+def test_initial_rate_is_clamped_to_max_rate():
+    """المعدل الأولي لكل مضيف لا يتجاوز max_rate"""
+    controller = AdaptiveController(initial_rate=50.0, max_rate=2.0)
+    assert controller.initial_rate == 2.0
+    assert controller.stats("example.com")['rate'] == 2.0
+
+
+def test_max_rate_holds_from_first_request(http_server):
+    """مع max_rate=2 لا يصل إلى الخادم أكثر من ثلاثة طلبات في الثانية الأولى (0 و 0.5 و 1.0)"""
+    arrivals = []
+    lock = threading.Lock()
+
+    class Handler(QuietHandler):
+        def do_GET(self):
+            with lock:
+                arrivals.append(time.monotonic())
+            self.reply(200, "ok")
+
+    base = http_server(Handler)
+    transport = HTTPTransport()
+    controller = AdaptiveController(initial_concurrency=8, max_concurrency=8, max_rate=2.0)
+
+    def worker():
+        transport.fetch("GET", f"{base}/", controller)
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    transport.close()
+
+    assert len(arrivals) == 6
+    arrivals.sort()
+    first_second = [t for t in arrivals if t - arrivals[0] < 0.95]
+    assert len(first_second) <= 2
+    # التباعد بين الطلبات المتتالية قريب من 1 / max_rate
+    gaps = [b - a for a, b in zip(arrivals, arrivals[1:])]
+    assert min(gaps) > 0.4
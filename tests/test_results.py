@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+اختبارات مخزن النتائج ومصارفه
+"""
+
+import pytest
+
+from urlget.results import FuzzRecord, ResultStore, open_sink
+
+
+def _record(index, vulnerable=False):
+    return FuzzRecord("http://example.com/?id=1", "GET", "id", index, 500 if vulnerable else 200, 0.01 * index,
+                      100 + index, header_id=0, is_vulnerable=vulnerable,
+                      signatures=("mysql-syntax",) if vulnerable else (), anomalies=("status",) if vulnerable else ())
+
+
+def _indexes(path):
+    """فهارس الحمولات في النتائج المحفوظة"""
+    sink = open_sink(path, append=True)
+    indexes = [record['payload_index'] for record in sink.read()]
+    sink.close()
+    return indexes
+
+
+@pytest.mark.parametrize("name", ["out.jsonl", "out.db"])
+def test_new_run_replaces_previous_results(tmp_path, name):
+    """تشغيل جديد دون استئناف يستبدل نتائج التشغيل السابق في JSONL و SQLite، والاستئناف يضيف إليها"""
+    path = str(tmp_path / name)
+    for count in (3, 2):
+        store = ResultStore(open_sink(path))
+        for index in range(count):
+            store.add(_record(index, vulnerable=index == 1))
+        store.close()
+        assert _indexes(path) == list(range(count))
+
+    store = ResultStore(open_sink(path, append=True))
+    store.add(_record(7))
+    records = list(store)
+    store.close()
+    assert [record['payload_index'] for record in records] == [0, 1, 7]
+    assert records[1]['signatures'] == ["mysql-syntax"]
+    assert records[1]['is_vulnerable'] is True
+
+
+def test_store_keeps_only_aggregates_in_memory():
+    """المخزن دون مصرف يحتفظ بالإحصائيات فقط، وحالته تستعاد كما هي"""
+    store = ResultStore()
+    for index in range(4):
+        store.add(_record(index, vulnerable=index == 3))
+    assert list(store) == []
+    summary = store.summary()
+    assert summary['total'] == 4
+    assert summary['vulnerable'] == 1
+    assert summary['status_counts'] == {200: 3, 500: 1}
+
+    restored = ResultStore()
+    restored.restore(store.state())
+    assert restored.summary() == summary
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+اختبارات مطابق التواقيع المجمع والفحص التدريجي
+"""
+
+import pytest
+
+from urlget.signatures import SignatureMatcher
+
+BODY = (b"<html><body>" + b"lorem ipsum " * 200 + b"You have an error in your SQL syntax near ''' at line 1"
+        + b"filler " * 150 + b"jinja2.exceptions.UndefinedError: 'x' is undefined" + b"</body></html>")
+
+
+def _chunks(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def test_matcher_selects_packs_and_reports_offsets():
+    """الحزم المحددة فقط تحمل، والحزم الإضافية تدمج، والتطابقات مرتبة بإزاحاتها"""
+    matcher = SignatureMatcher(packs=['mysql'], extra_packs={'custom': {'jinja-error': r"jinja2\.exceptions\.\w+"}})
+    hits = matcher.scan(BODY)
+    assert [hit.name for hit in hits] == ['mysql-syntax', 'jinja-error']
+    assert BODY[hits[1].start:hits[1].end] == b"jinja2.exceptions.UndefinedError"
+    assert matcher.search(BODY).name == 'mysql-syntax'
+    assert SignatureMatcher(packs=[]).scan(BODY) == []
+    with pytest.raises(ValueError):
+        SignatureMatcher(packs=['no-such-pack'])
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, 500, 4096])
+def test_stream_matches_whole_body_scan(size):
+    """الفحص التدريجي بأي حجم للأجزاء يعطي نفس تطابقات فحص الجسم كاملًا"""
+    matcher = SignatureMatcher(extra_packs={'custom': {'jinja-error': r"jinja2\.exceptions\.\w+"}})
+    scan = matcher.stream([b"near '''", b"not-in-body"], overlap=64)
+    for chunk in _chunks(BODY, size):
+        scan.feed(chunk)
+    scan.finish()
+    assert [(hit.name, hit.start) for hit in scan.hits] == [(hit.name, hit.start) for hit in matcher.scan(BODY)]
+    assert scan.found == {b"near '''"}
+
+
+def test_variable_length_match_across_overlap_is_reported_once():
+    """نمط متغير الطول يطابق داخل التداخل ثم يمتد بعد حد الجزء التالي يبلغ عنه مرة واحدة"""
+    matcher = SignatureMatcher(packs=[], extra_packs={'custom': {'jinja-error': r"jinja2\.exceptions\.\w+"}})
+    scan = matcher.stream(overlap=64)
+    scan.feed(b"x" * 100 + b"jinja2.exceptions.Undef")
+    scan.feed(b"inedError: 'x' is undefined")
+    scan.finish()
+    assert [(hit.name, hit.start) for hit in scan.hits] == [('jinja-error', 100)]
+
+
+def test_non_ascii_encodings_are_decoded_and_flushed():
+    """جسم UTF-16 يحول أثناء الفحص، والبايتات المتبقية في المفكك تفحص عند نهاية الجسم"""
+    matcher = SignatureMatcher()
+    body = "\ufeffYou have an error in your SQL syntax".encode('utf-16-le')
+    scan = matcher.stream([b"\xef\xbf\xbd"])
+    for chunk in _chunks(body + b"\x41", 5):
+        scan.feed(chunk)
+    assert [hit.name for hit in scan.hits] == ['mysql-syntax']
+    # بايت أخير دون زوجه يبقى في المفكك حتى النهاية ثم يستبدل
+    assert not scan.found
+    scan.finish()
+    assert scan.found == {b"\xef\xbf\xbd"}
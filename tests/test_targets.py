@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+اختبارات تشويش عدة أهداف بمحرك واحد
+"""
+
+from urllib.parse import urlparse, parse_qs
+
+import urlget.fuzzer
+from urlget.targets import MultiTargetFuzzer
+from tests.conftest import QuietHandler
+
+
+class ItemHandler(QuietHandler):
+    """صفحة عنصر تعرض خطأ SQL عند وجود علامة اقتباس في المعرف"""
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query).get('id', [''])[0]
+        if "'" in query:
+            self.reply(500, "You have an error in your SQL syntax", {"Content-Type": "text/html"})
+        else:
+            self.reply(200, "<html><body>Item</body></html>", {"Content-Type": "text/html"})
+
+
+def test_targets_share_one_matcher_and_request_cache(http_server, tmp_path, monkeypatch):
+    """المطابق وذاكرة الطلبات ينشآن مرة واحدة لجميع الأهداف ويكتشف كل هدف نقطة ضعفه"""
+    created = {'matcher': 0, 'dedup': 0}
+
+    class CountingMatcher(urlget.fuzzer.SignatureMatcher):
+        def __init__(self, *args, **kwargs):
+            created['matcher'] += 1
+            super().__init__(*args, **kwargs)
+
+    class CountingCache(urlget.fuzzer.RequestCache):
+        def __init__(self, *args, **kwargs):
+            created['dedup'] += 1
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(urlget.fuzzer, "SignatureMatcher", CountingMatcher)
+    monkeypatch.setattr(urlget.fuzzer, "RequestCache", CountingCache)
+
+    targets = [f"{http_server(ItemHandler)}/item?id=1" for _ in range(3)]
+    payloads = tmp_path / "payloads.txt"
+    payloads.write_text("1'\nadmin\n", encoding='utf-8')
+
+    fuzzer = MultiTargetFuzzer(targets, payloads_file=str(payloads), threads=4, timing_samples=0,
+                               dedup_cache=str(tmp_path / "dedup.db"))
+    results = fuzzer.start()
+
+    assert created == {'matcher': 1, 'dedup': 1}
+    assert len({id(target.matcher) for target in fuzzer.fuzzers}) == 1
+    assert len({id(target.dedup) for target in fuzzer.fuzzers}) == 1
+    assert [[(finding['param_name'], finding['payload']) for finding in target['vulnerable_params']]
+            for target in results['targets']] == [[("id", "1'")]] * 3
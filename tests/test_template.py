@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+اختبارات قوالب طلبات HTTP الخام ولصق الحمولات في نقاط الحقن
+"""
+
+import json
+import pickle
+import threading
+from urllib.parse import urlparse, parse_qs
+
+from urlget.fuzzer import HTTPFuzzer
+from urlget.template import RequestTemplate, parse_raw_request
+from tests.conftest import QuietHandler
+
+RAW_FORM = ("POST /login?next=FUZZ HTTP/1.1\r\n"
+            "Host: HOST\r\n"
+            "Content-Type: application/x-www-form-urlencoded\r\n"
+            "Content-Length: 31\r\n"
+            "X-Trace: id-FUZZ\r\n"
+            "\r\n"
+            "user=FUZZ&pass=secret")
+
+
+def test_parse_raw_request_with_crlf():
+    """تحليل ملف CRLF يفصل الرؤوس عن الجسم ويبني العنوان من رأس Host"""
+    request = parse_raw_request(RAW_FORM.replace("HOST", "example.org"), scheme="https")
+
+    assert request['method'] == "POST"
+    assert request['url'] == "https://example.org/login?next=FUZZ"
+    assert request['headers']['X-Trace'] == "id-FUZZ"
+    assert request['body'] == "user=FUZZ&pass=secret"
+
+
+def test_render_encodes_each_injection_context():
+    """كل نقطة حقن ترمز الحمولة حسب سياقها والرؤوس الثابتة تبقى مشتركة"""
+    request = parse_raw_request(RAW_FORM.replace("HOST", "example.org"))
+    template = RequestTemplate(request['method'], request['url'], request['headers'], request['body'])
+
+    assert template.injection_points == 3
+    assert 'Host' not in template.headers and 'Content-Length' not in template.headers
+
+    url, headers, body = template.render("a b&c\r\n")
+    assert url == "http://example.org/login?next=a%20b%26c%0D%0A"
+    assert headers['X-Trace'] == "id-a b&c"
+    assert body == b"user=a+b%26c%0D%0A&pass=secret"
+
+    # القاموس الثابت لا يتغير بين النسخ
+    assert 'X-Trace' not in template._static_headers
+    assert template.render("x")[1] is not template.render("y")[1]
+
+
+def test_render_json_body_with_markers():
+    """داخل سلسلة JSON تهرب الحمولة وخارجها تدرج كما هي"""
+    template = RequestTemplate("post", "http://example.org/api", {"Content-Type": "application/json"},
+                               '{"name": "FUZZ", "id": FUZZ}')
+
+    _, headers, body = template.render('1"}')
+    assert template.method == "POST"
+    assert body == b'{"name": "1\\"}", "id": 1"}}'
+    assert headers == {"Content-Type": "application/json"}
+    assert template.json_body is None
+
+
+def test_json_body_without_markers_uses_leaf_paths():
+    """جسم JSON دون علامات يحول كل قيمة طرفية إلى نقطة حقن مستقلة"""
+    template = RequestTemplate("POST", "http://example.org/api", {"Content-Type": "application/json"},
+                               '{"user": {"name": "bob"}, "tags": ["a", "b"]}')
+
+    assert template.injection_points == 0
+    assert template.json_body is not None
+    assert len(template.json_body.paths) == 3
+
+    url, _, original = template.render("x")
+    assert url == "http://example.org/api"
+    assert json.loads(original) == {"user": {"name": "bob"}, "tags": ["a", "b"]}
+
+
+def test_template_survives_pickle():
+    """القالب ينقل إلى العمليات الفرعية ويعاد تجميعه هناك"""
+    template = RequestTemplate("GET", "http://example.org/FUZZ", {"Cookie": "s=FUZZ"}, marker="FUZZ")
+    copy = pickle.loads(pickle.dumps(template))
+
+    assert copy.to_dict() == template.to_dict()
+    assert copy.render("a/b") == template.render("a/b")
+
+
+class TemplateHandler(QuietHandler):
+    """نموذج دخول يعرض خطأ SQL عندما يحتوي اسم المستخدم على علامة اقتباس"""
+
+    seen = []
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = self.read_body().decode('utf-8')
+        user = parse_qs(body).get('user', [''])[0]
+        with self.lock:
+            self.seen.append((self.path, self.headers.get('X-Trace'), body))
+        if "'" in user:
+            self.reply(500, "You have an error in your SQL syntax near ''", {"Content-Type": "text/html"})
+        else:
+            self.reply(200, "<html><body>Invalid login</body></html>", {"Content-Type": "text/html"})
+
+
+def test_fuzzer_sends_rendered_template(http_server, tmp_path):
+    """المشوش يرسل القالب بعد لصق كل حمولة في جميع نقاط الحقن ويبلغ عن الاستجابة المختلفة"""
+    TemplateHandler.seen = []
+    base = http_server(TemplateHandler)
+    raw = tmp_path / "request.txt"
+    raw.write_text(RAW_FORM.replace("HOST", urlparse(base).netloc), encoding='utf-8')
+    payloads = tmp_path / "payloads.txt"
+    payloads.write_text("admin\n' OR 1=1 --\n", encoding='utf-8')
+
+    template = RequestTemplate.from_file(str(raw))
+    fuzzer = HTTPFuzzer(None, template=template, payloads_file=str(payloads), threads=2,
+                        checkpoint=False, timing_samples=0)
+    results = fuzzer.start()
+
+    sent = {body for _, _, body in TemplateHandler.seen}
+    assert "user=admin&pass=secret" in sent
+    assert "user=%27+OR+1%3D1+--&pass=secret" in sent
+    assert ("/login?next=%27%20OR%201%3D1%20--", "id-' OR 1=1 --", "user=%27+OR+1%3D1+--&pass=secret") \
+        in TemplateHandler.seen
+
+    assert [finding['payload'] for finding in results['vulnerable_params']] == ["' OR 1=1 --"]
+    assert results['vulnerable_params'][0]['param_name'] == "Template:FUZZ"
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+اختبارات الناقل المشترك
+"""
+
+import time
+import asyncio
+import select
+import socket
+import threading
+
+import pytest
+import urllib3.util.connection
+from requests.structures import CaseInsensitiveDict
+
+from urlget.transport import HTTPTransport
+from tests.conftest import QuietHandler
+
+
+class SlowHandler(QuietHandler):
+    """صفحة ثابتة ترد بعد 0.3 ثانية"""
+
+    def do_GET(self):
+        time.sleep(0.3)
+        self.reply(200, "ok")
+
+
+class OkHandler(QuietHandler):
+    """صفحة ثابتة"""
+
+    def do_GET(self):
+        self.reply(200, "ok")
+
+
+def test_dns_cache_is_per_transport(http_server):
+    """كل ناقل يحلل عبر ذاكرته الخاصة بعائلة urllib3 دون تعديل create_connection للعملية"""
+    original = urllib3.util.connection.create_connection
+    base = http_server(OkHandler).replace("127.0.0.1", "localhost")
+    first = HTTPTransport(keep_alive=False)
+    second = HTTPTransport(keep_alive=False)
+    assert urllib3.util.connection.create_connection is original
+
+    for _ in range(2):
+        assert first.fetch("GET", f"{base}/").status_code == 200
+    assert [key[:3] for key in first.dns_cache._entries] == \
+        [("localhost", int(base.rsplit(":", 1)[1]), urllib3.util.connection.allowed_gai_family())]
+    assert not second.dns_cache._entries
+
+    first.close()
+    second.close()
+
+
+class LowercaseHeadersHandler(QuietHandler):
+    """تحويل برؤوس بأحرف صغيرة"""
+
+    def do_GET(self):
+        self.reply(301, "moved", {"location": "/docs/", "content-type": "text/html; charset=windows-1256"})
+
+
+def _check_headers(sample):
+    """الرؤوس من أي مسار تقرأ بأي حالة للأحرف"""
+    assert isinstance(sample.headers, CaseInsensitiveDict)
+    assert sample.headers.get('Location') == "/docs/"
+    assert sample.headers.get('LOCATION') == "/docs/"
+    assert sample.headers.get('Content-Type') == "text/html; charset=windows-1256"
+    assert sample.encoding == "cp1256"
+
+
+def test_headers_are_case_insensitive(http_server):
+    """عينات requests و aiohttp تعيد رؤوسًا لا تميز حالة الأحرف"""
+    base = http_server(LowercaseHeadersHandler)
+    transport = HTTPTransport()
+    _check_headers(transport.fetch("GET", f"{base}/docs", allow_redirects=False))
+
+    async def fetch():
+        async with transport.async_session() as session:
+            return await transport.fetch_async(session, "GET", f"{base}/docs")
+
+    _check_headers(asyncio.run(fetch()))
+    transport.close()
+
+
+def test_elapsed_excludes_host_slot_wait(http_server):
+    """زمن العينة هو زمن الطلب فقط وليس انتظار حد المضيف"""
+    base = http_server(SlowHandler)
+    transport = HTTPTransport(per_host_limit=1)
+    samples = []
+
+    def worker():
+        samples.append(transport.fetch("GET", f"{base}/"))
+
+    start_time = time.monotonic()
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.monotonic() - start_time
+    transport.close()
+
+    # الطلبات تنتظر بعضها (حوالي 0.9 ثانية) لكن زمن كل طلب حوالي 0.3 ثانية
+    assert wall > 0.8
+    assert len(samples) == 3
+    assert all(0.25 < sample.elapsed < 0.6 for sample in samples)
+
+
+@pytest.mark.parametrize("http2", [False, True])
+def test_async_elapsed_excludes_pool_wait(http_server, http2):
+    """زمن عينة fetch_async يبدأ بعد الحصول على اتصال من المجمع وليس قبل الانتظار في طابوره"""
+    if http2:
+        pytest.importorskip("h2")
+    base = http_server(SlowHandler)
+    transport = HTTPTransport(http2=http2)
+
+    async def fetch_all():
+        async with transport.async_session(concurrency=1) as session:
+            return await asyncio.gather(*[transport.fetch_async(session, "GET", f"{base}/") for _ in range(3)])
+
+    start_time = time.monotonic()
+    samples = asyncio.run(fetch_all())
+    wall = time.monotonic() - start_time
+    transport.close()
+
+    assert wall > 0.8
+    assert all(0.25 < sample.elapsed < 0.6 for sample in samples)
+
+
+class H2Server:
+    """خادم HTTP/2 دون TLS (prior knowledge) يعلن حدًا منخفضًا للتدفقات المتزامنة ويرد بعد تأخير"""
+
+    def __init__(self, max_streams, delay):
+        """تهيئة الخادم وبدء الاستماع على منفذ محلي"""
+        self.max_streams = max_streams
+        self.delay = delay
+        self.connections = 0
+        self.requests = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+        self.sock = socket.socket()
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen(8)
+        self.url = f"http://127.0.0.1:{self.sock.getsockname()[1]}"
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        """قبول الاتصالات وخدمة كل منها في موضوع"""
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            with self.lock:
+                self.connections += 1
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        """خدمة اتصال واحد: كل طلب يرد عليه بعد التأخير دون انتظار الطلبات الأخرى"""
+        import h2.config
+        import h2.connection
+        import h2.events
+        import h2.settings
+
+        connection = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+        connection.initiate_connection()
+        connection.update_settings({h2.settings.SettingCodes.MAX_CONCURRENT_STREAMS: self.max_streams})
+        conn.sendall(connection.data_to_send())
+        due = {}
+        with conn:
+            while True:
+                timeout = max(0.0, min(due.values()) - time.monotonic()) if due else 1.0
+                if select.select([conn], [], [], timeout)[0]:
+                    data = conn.recv(65536)
+                    if not data:
+                        return
+                    for event in connection.receive_data(data):
+                        if isinstance(event, h2.events.RequestReceived):
+                            due[event.stream_id] = time.monotonic() + self.delay
+                            with self.lock:
+                                self.requests += 1
+                                self.max_active = max(self.max_active, len(due))
+                now = time.monotonic()
+                for stream_id, deadline in list(due.items()):
+                    if deadline <= now:
+                        connection.send_headers(stream_id, [(":status", "200"), ("content-length", "2"),
+                                                            ("content-type", "text/plain")])
+                        connection.send_data(stream_id, b"ok", end_stream=True)
+                        del due[stream_id]
+                data = connection.data_to_send()
+                if data:
+                    conn.sendall(data)
+
+    def close(self):
+        """إيقاف الاستماع"""
+        self.sock.close()
+
+
+def test_h2_multiplexes_within_max_concurrent_streams():
+    """الطلبات المتزامنة تتعدد على اتصال HTTP/2 واحد دون تجاوز حد التدفقات الذي يعلنه الخادم"""
+    pytest.importorskip("h2")
+    pytest.importorskip("httpx")
+    server = H2Server(max_streams=2, delay=0.2)
+    transport = HTTPTransport(http2=True, http2_prior_knowledge=True)
+    samples = []
+
+    def worker():
+        samples.append(transport.fetch("GET", f"{server.url}/"))
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    transport.close()
+    server.close()
+
+    assert [sample.status_code for sample in samples] == [200] * 6
+    assert all(sample.content == b"ok" for sample in samples)
+    assert all(sample.headers.get('Content-Type') == "text/plain" for sample in samples)
+    assert all(isinstance(sample.headers, CaseInsensitiveDict) for sample in samples)
+    assert server.requests == 6
+    assert server.connections == 1
+    # تدفقان متزامنان بالضبط: تعدد على الاتصال نفسه وضمن الحد المعلن
+    assert server.max_active == 2
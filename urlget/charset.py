@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة تحديد ترميز الاستجابات دون فحص الجسم كاملاً، وترميز الحمولات مسبقًا للبحث بالبايت لأداة urlget
+"""
+
+import re
+import html
+import codecs
+from functools import lru_cache
+from urllib.parse import urlparse, quote, quote_plus, unquote_plus
+
+# الترميز الافتراضي عند غياب أي إشارة
+DEFAULT_ENCODING = 'utf-8'
+
+# عدد البايتات من بداية الجسم التي يبحث فيها عن تصريح الترميز
+SNIFF_BYTES = 1024
+
+# علامات ترتيب البايت؛ UTF-32 أولاً لأن علامتها الصغرى تبدأ بعلامة UTF-16 الصغرى
+_BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# <meta charset="..."> أو <meta http-equiv="Content-Type" content="...; charset=..."> أو تصريح XML
+_DECLARED = re.compile(rb'<meta[^>]*?charset\s*=\s*["\']?\s*([A-Za-z0-9_.:\-]+)'
+                       rb'|<\?xml[^>]*?encoding\s*=\s*["\']([A-Za-z0-9_.:\-]+)', re.IGNORECASE)
+
+# نص ASCII يجب أن يبقى بنفس البايتات في الترميزات المتوافقة مع ASCII
+_ASCII_PROBE = "<a href='x'>=\"1\";</a>"
+
+
+@lru_cache(maxsize=256)
+def normalize(name):
+    """
+    الاسم القياسي لترميز
+
+    المعلمات:
+        name (str): اسم الترميز كما ورد في الرأس أو الجسم
+
+    العائد:
+        str: الاسم القياسي أو None إذا كان غير معروف
+    """
+    try:
+        return codecs.lookup(name.strip().strip('"\'')).name
+    except (LookupError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=256)
+def ascii_compatible(encoding):
+    """هل تمثل محارف ASCII في الترميز بنفس بايتاتها (فتعمل التواقيع والبحث بالبايت مباشرة)"""
+    try:
+        return _ASCII_PROBE.encode(encoding) == _ASCII_PROBE.encode('ascii')
+    except (LookupError, UnicodeError):
+        return False
+
+
+def _content_type(headers):
+    """قيمة رأس Content-Type"""
+    return headers.get('Content-Type', '') if headers else ''
+
+
+def media_type(headers):
+    """نوع المحتوى دون المعلمات، مثل text/html"""
+    return _content_type(headers).split(';', 1)[0].strip().lower()
+
+
+def header_charset(headers):
+    """
+    الترميز المصرح به في رأس Content-Type
+
+    العائد:
+        str: الاسم القياسي أو None
+    """
+    for param in _content_type(headers).split(';')[1:]:
+        key, _, value = param.partition('=')
+        if key.strip().lower() == 'charset' and value.strip():
+            return normalize(value)
+    return None
+
+
+def bom_encoding(data):
+    """الترميز المحدد بعلامة ترتيب البايت في بداية البيانات، أو None"""
+    for bom, encoding in _BOMS:
+        if data.startswith(bom):
+            return encoding
+    return None
+
+
+def sniff_encoding(head):
+    """
+    الترميز المحدد من بداية الجسم: علامة ترتيب البايت أو تصريح meta أو XML
+
+    لا يتم تخمين الترميز من توزيع البايتات؛ يفحص أول SNIFF_BYTES فقط.
+
+    العائد:
+        str: الاسم القياسي أو None
+    """
+    encoding = bom_encoding(head)
+    if encoding is not None:
+        return encoding
+    match = _DECLARED.search(head[:SNIFF_BYTES])
+    if match is None:
+        return None
+    return normalize((match.group(1) or match.group(2)).decode('ascii'))
+
+
+@lru_cache(maxsize=4096)
+def encode_variants(text, encodings):
+    """
+    بايتات النص في كل ترميز محتمل (UTF-8 دائمًا أولاً) دون تكرار
+
+    الترميزات غير المتوافقة مع ASCII مستبعدة لأن أجسامها تحول إلى UTF-8 قبل الفحص.
+
+    المعلمات:
+        text (str): الحمولة
+        encodings (tuple): أسماء الترميزات
+
+    العائد:
+        tuple: سلاسل البايت
+    """
+    variants = [text.encode('utf-8')]
+    for encoding in encodings:
+        if not ascii_compatible(encoding):
+            continue
+        try:
+            data = text.encode(encoding)
+        except UnicodeError:
+            continue
+        if data not in variants:
+            variants.append(data)
+    return tuple(variants)
+
+
+@lru_cache(maxsize=4096)
+def reflection_forms(text, encodings):
+    """
+    بايتات الصيغ التي ينعكس بها النص عادة في الصفحة، الأطول أولاً
+
+    الصيغ: النص كما هو وبعد فك ترميز URL، ومع ترميز HTML (بعدة أشكال للاقتباس) أو ترميز URL،
+    كل منها بكل ترميز محتمل. تحذف من الجسم قبل حساب البصمة حتى لا يعتبر الانعكاس وحده اختلافًا.
+
+    المعلمات:
+        text (str): الحمولة
+        encodings (tuple): أسماء الترميزات
+
+    العائد:
+        tuple: سلاسل البايت
+    """
+    if not text:
+        return ()
+    forms = {text, unquote_plus(text)}
+    for form in list(forms):
+        forms.update((html.escape(form), html.escape(form, quote=False), html.escape(form).replace('&#x27;', '&#39;'),
+                      quote(form, safe=''), quote_plus(form)))
+    variants = {variant for form in forms for variant in encode_variants(form, encodings)}
+    return tuple(sorted(variants, key=len, reverse=True))
+
+
+class EncodingCache:
+    """ترميز الاستجابات لكل مضيف ونوع محتوى؛ يحدد مرة من الرؤوس أو بداية الجسم ثم يعاد استخدامه"""
+
+    def __init__(self, default=DEFAULT_ENCODING):
+        """
+        تهيئة الذاكرة
+
+        المعلمات:
+            default (str): الترميز عند غياب أي إشارة
+        """
+        self.default = default
+        self._encodings = {}
+        self._hosts = {}
+
+    def expected(self, url, headers):
+        """
+        الترميز المتوقع قبل قراءة الجسم: من الرأس أو من استجابة سابقة للمضيف ونوع المحتوى
+
+        العائد:
+            str: الترميز أو None
+        """
+        return header_charset(headers) or self._encodings.get((urlparse(url).netloc, media_type(headers)))
+
+    def resolve(self, url, headers, content):
+        """
+        تحديد ترميز استجابة وحفظه للمضيف ونوع المحتوى
+
+        المعلمات:
+            url (str): عنوان الطلب
+            headers (dict): رؤوس الاستجابة
+            content (bytes): الجسم (يفحص أول SNIFF_BYTES فقط عند الحاجة)
+
+        العائد:
+            str: الترميز
+        """
+        # علامة ترتيب البايت تتقدم على الرأس وتخص هذا الجسم وحده فلا تحفظ
+        encoding = bom_encoding(content)
+        if encoding is not None:
+            return encoding
+
+        host = urlparse(url).netloc
+        key = (host, media_type(headers))
+        encoding = header_charset(headers) or self._encodings.get(key)
+        if encoding is None:
+            encoding = sniff_encoding(content[:SNIFF_BYTES]) or self.default
+
+        if self._encodings.get(key) != encoding:
+            # استبدال القيم كاملة دون قفل؛ أسوأ حالة تحديد الترميز مرة أخرى
+            self._encodings[key] = encoding
+            seen = self._hosts.get(host, ())
+            if encoding not in seen:
+                self._hosts[host] = seen + (encoding,)
+        return encoding
+
+    def likely(self, url):
+        """
+        الترميزات التي ظهرت في استجابات مضيف العنوان (لترميز الحمولات قبل الإرسال)
+
+        العائد:
+            tuple: أسماء الترميزات
+        """
+        return self._hosts.get(urlparse(url).netloc, ())
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة نقاط الحفظ والاستئناف لعمليات التشويش الطويلة في أداة urlget
+"""
+
+import os
+import json
+import zlib
+import base64
+import hashlib
+import threading
+
+_CHECKPOINT_VERSION = 1
+
+
+def run_key(*parts):
+    """
+    بصمة تحدد عملية التشويش حتى لا يتم استئناف نقطة حفظ لعملية مختلفة
+
+    المعلمات:
+        parts: مكونات قابلة للتحويل إلى JSON (العنوان، الطريقة، نقاط الحقن، الحمولات...)
+
+    العائد:
+        str: البصمة بالنظام الست عشري
+    """
+    data = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(data.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class ModeProgress:
+    """تقدم وضع تشويش واحد: مؤشر المهام المكتملة المتتالية وخريطة بتات المهام المكتملة"""
+
+    __slots__ = ('total', 'cursor', 'done', 'bits')
+
+    def __init__(self, total, cursor=0, done=0, bits=None):
+        """تهيئة تقدم الوضع"""
+        self.total = total
+        self.cursor = cursor
+        self.done = done
+        self.bits = bits if bits is not None else bytearray((total + 7) // 8)
+
+    def is_done(self, index):
+        """هل اكتملت المهمة ذات الفهرس المحدد"""
+        return bool(self.bits[index >> 3] & (1 << (index & 7)))
+
+    def mark(self, index):
+        """تعليم مهمة كمكتملة وتقديم المؤشر فوق المهام المكتملة المتتالية"""
+        mask = 1 << (index & 7)
+        if self.bits[index >> 3] & mask:
+            return
+        self.bits[index >> 3] |= mask
+        self.done += 1
+        while self.cursor < self.total and self.is_done(self.cursor):
+            self.cursor += 1
+
+    def to_dict(self):
+        """تحويل التقدم إلى قاموس قابل للحفظ (خريطة البتات مضغوطة)"""
+        return {
+            'total': self.total,
+            'cursor': self.cursor,
+            'done': self.done,
+            'bits': base64.b64encode(zlib.compress(bytes(self.bits))).decode('ascii'),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """إنشاء التقدم من قاموس محفوظ"""
+        bits = bytearray(zlib.decompress(base64.b64decode(data['bits'])))
+        return cls(data['total'], data['cursor'], data['done'], bits)
+
+
+class Checkpoint:
+    """نقطة حفظ تكتب في الخلفية بشكل ذري دون إبطاء العمال"""
+
+    def __init__(self, path, key, modes, interval=5.0):
+        """
+        تهيئة نقطة الحفظ
+
+        المعلمات:
+            path (str): مسار ملف نقطة الحفظ
+            key (str): بصمة العملية (من run_key)
+            modes (list): أزواج (الوضع، عدد المهام) بترتيب التشويش
+            interval (float): الفترة بين عمليات الكتابة بالثواني
+        """
+        self.path = path
+        self.key = key
+        self.interval = interval
+        self.modes = {mode: ModeProgress(total) for mode, total in modes}
+        self.findings = []
+        self.results = None
+
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._stop = threading.Event()
+        self._thread = None
+        self._state_fn = None
+
+    def load(self):
+        """
+        تحميل التقدم المحفوظ إذا كان الملف موجودًا ويخص نفس العملية
+
+        العائد:
+            bool: True إذا تم التحميل
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if data.get('version') != _CHECKPOINT_VERSION or data.get('key') != self.key:
+            return False
+
+        modes = {mode: ModeProgress.from_dict(progress) for mode, progress in data['modes'].items()}
+        if {mode: p.total for mode, p in modes.items()} != {mode: p.total for mode, p in self.modes.items()}:
+            return False
+
+        self.modes = modes
+        self.findings = data.get('findings', [])
+        self.results = data.get('results')
+        return True
+
+    def completed(self):
+        """عدد المهام المكتملة في جميع الأوضاع"""
+        return sum(progress.done for progress in self.modes.values())
+
+    def cursor(self, mode):
+        """فهرس أول مهمة غير مكتملة في الوضع"""
+        return self.modes[mode].cursor
+
+    def is_done(self, mode, index):
+        """هل اكتملت المهمة في الوضع المحدد"""
+        return self.modes[mode].is_done(index)
+
+    def mark_done(self, mode, index, commit=None):
+        """
+        تعليم مهمة كمكتملة (عملية في الذاكرة فقط؛ الكتابة تتم في الخلفية)
+
+        المعلمات:
+            mode (str): الوضع
+            index (int): فهرس المهمة
+            commit (callable): تسجيل نتيجة المهمة تحت نفس القفل، فتحفظ النتيجة والتقدم معًا أو لا يحفظ أي منهما
+        """
+        self.mark_all(((mode, index),), commit)
+
+    def mark_all(self, items, commit=None):
+        """
+        تعليم عدة مهام كمكتملة مع تسجيل نتائجها معًا
+
+        المعلمات:
+            items (iterable): أزواج (الوضع، فهرس المهمة)
+            commit (callable): تسجيل نتائج المهام تحت نفس القفل
+        """
+        with self._lock:
+            if commit is not None:
+                commit()
+            for mode, index in items:
+                self.modes[mode].mark(index)
+            self._dirty = True
+
+    def start(self, state_fn=None):
+        """
+        بدء موضوع الكتابة في الخلفية
+
+        المعلمات:
+            state_fn (callable): دالة تعيد قاموسًا بالنتائج الحالية {'findings': ..., 'results': ...}
+        """
+        self._state_fn = state_fn
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._writer, daemon=True)
+        self._thread.start()
+
+    def _writer(self):
+        """كتابة نقطة الحفظ دوريًا عند وجود تغييرات"""
+        while not self._stop.wait(self.interval):
+            if self._dirty:
+                self.save()
+
+    def save(self):
+        """كتابة نقطة الحفظ بشكل ذري (ملف مؤقت ثم استبدال)"""
+        # التقدم والنتائج يلتقطان تحت نفس القفل الذي تسجل تحته النتائج مع تعليم مهامها
+        with self._lock:
+            self._dirty = False
+            data = {'version': _CHECKPOINT_VERSION, 'key': self.key,
+                    'modes': {mode: progress.to_dict() for mode, progress in self.modes.items()}}
+            if self._state_fn is not None:
+                data.update(self._state_fn())
+
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def close(self, remove=False):
+        """
+        إيقاف موضوع الكتابة وكتابة الحالة الأخيرة
+
+        المعلمات:
+            remove (bool): حذف الملف بدلاً من كتابته (عند اكتمال العملية)
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        if remove:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+        else:
+            self.save()
@@ -2,17 +2,27 @@
 # -*- coding: utf-8 -*-
 
 import argparse
+import json
 import sys
 import os
+from urllib.parse import urlparse
 from colorama import init, Fore, Style
 import pyfiglet
 
 from urlget.crawler import ChromeCrawler
 from urlget.fuzzer import HTTPFuzzer
+from urlget.distributed import Worker
 from urlget.xss import XSSScanner
+from urlget.params import ParamDiscovery
+from urlget.dirs import ContentDiscovery
 from urlget.csrf import CSRFGenerator
 from urlget.dns_hijack import DNSHijacker
 from urlget.updater import check_and_update
+from urlget.template import RequestTemplate
+from urlget.jsonbody import load_json_body
+from urlget.targets import MultiTargetFuzzer, MultiTargetXSS, load_targets
+from urlget.transport import configure_transport
+from urlget.metrics import serve_metrics
 from urlget.utils import banner
 from urlget import __version__
 
@@ -38,6 +48,17 @@ def main():
     parser.add_argument("-o", "--output", help="ملف لحفظ النتائج")
     parser.add_argument("-v", "--verbose", action="store_true", help="عرض معلومات تفصيلية")
     
+    # إعدادات مجمع اتصالات HTTP المشترك
+    parser.add_argument("--pool-connections", type=int, default=10, help="عدد المضيفين المحتفظ بمجمعات اتصالاتهم")
+    parser.add_argument("--pool-size", type=int, default=100, help="الحد الأقصى للاتصالات المفتوحة لكل مضيف")
+    parser.add_argument("--per-host-limit", type=int, default=0, help="الحد الأقصى للطلبات المتزامنة لكل مضيف (0 بلا حد)")
+    parser.add_argument("--dns-cache-ttl", type=int, default=300, help="مدة صلاحية ذاكرة DNS المؤقتة بالثواني (0 لتعطيلها)")
+    parser.add_argument("--no-keep-alive", action="store_true", help="إغلاق الاتصال بعد كل طلب")
+    parser.add_argument("--http2", action="store_true",
+                        help="إرسال طلبات الفحص عبر HTTP/2 بتدفقات متعددة على اتصال واحد (يتطلب httpx[http2])")
+    parser.add_argument("--http2-prior-knowledge", action="store_true",
+                        help="استخدام HTTP/2 دون تفاوض، للخوادم التي تدعم h2c على http://")
+    
     # إنشاء مجموعات الوسائط للأوامر الفرعية
     subparsers = parser.add_subparsers(dest="command", help="الأوامر المتاحة")
     
@@ -55,14 +76,87 @@ def main():
     
     # أمر القوة الغاشمة والتشويش
     fuzz_parser = subparsers.add_parser("fuzz", help="تشويش وقوة غاشمة لطلبات HTTP")
-    fuzz_parser.add_argument("-p", "--payloads", help="ملف يحتوي على الحمولات")
-    fuzz_parser.add_argument("-m", "--method", choices=["GET", "POST", "PUT", "DELETE"], default="GET", help="طريقة HTTP")
+    fuzz_parser.add_argument("-p", "--payloads", "--wordlist", dest="payloads", help="ملف يحتوي على الحمولات")
+    fuzz_parser.add_argument("-m", "--method", choices=["GET", "POST", "PUT", "PATCH", "DELETE"], default="GET", help="طريقة HTTP")
+    fuzz_parser.add_argument("-r", "--request", help="ملف طلب HTTP خام كقالب؛ تستبدل كل علامة FUZZ بالحمولة")
+    fuzz_parser.add_argument("--data", help="جسم الطلب كقالب، مثل username=FUZZ&password=FUZZ")
+    fuzz_parser.add_argument("--marker", default="FUZZ", help="علامة نقطة الحقن في القالب")
+    fuzz_parser.add_argument("--json-body", help="ملف JSON بجسم الطلب؛ كل قيمة على أي عمق نقطة حقن (جسم JSON في --request أو --data دون علامات يعامل بنفس الطريقة)")
+    fuzz_parser.add_argument("--mutate", help="سلاسل تحويلات تولد متغيرات لكل حمولة، مثل raw,url,double-url,html,unicode,upper,url+html")
+    fuzz_parser.add_argument("--targets", help="ملف بقائمة عناوين الأهداف (سطر لكل عنوان)، أو - للإدخال القياسي")
+    fuzz_parser.add_argument("--host-concurrency", type=int, default=0, help="الحد الأقصى للطلبات الجارية لكل مضيف مع --targets (0 لتقسيم العمال بالتساوي)")
     fuzz_parser.add_argument("-t", "--threads", type=int, default=10, help="عدد المواضيع")
+    fuzz_parser.add_argument("--engine", choices=["thread", "async"], default="thread", help="محرك تنفيذ الطلبات")
+    fuzz_parser.add_argument("--concurrency", type=int, default=500, help="عدد الطلبات المتزامنة لمحرك async")
+    fuzz_parser.add_argument("--listen", help="تشغيل منسق يوزع المهام على العمال بدلاً من تنفيذها محليًا (المضيف:المنفذ)")
+    fuzz_parser.add_argument("--lease-size", type=int, default=1000, help="عدد المهام في كل نطاق يؤجر لعامل")
+    fuzz_parser.add_argument("--token", help="رمز مشترك يجب أن يرسله العمال إلى المنسق")
+    fuzz_parser.add_argument("--processes", type=int, default=1, help="عدد العمليات التي يقسم عليها فضاء المهام (لكل عملية محركها الخاص)")
+    fuzz_parser.add_argument("--signatures", help="حزم تواقيع الأخطاء مفصولة بفواصل (mysql,oracle,mssql,postgresql,template,stacktrace,generic)")
+    fuzz_parser.add_argument("--signature-file", help="ملف JSON بحزم تواقيع إضافية")
+    fuzz_parser.add_argument("--adaptive", action="store_true", help="ضبط التزامن والمعدل تلقائيًا حسب استجابة الهدف (AIMD)")
+    fuzz_parser.add_argument("--max-rate", type=float, help="الحد الأقصى لعدد الطلبات في الثانية لكل مضيف مع --adaptive")
+    fuzz_parser.add_argument("--baseline-samples", type=int, default=3, help="عدد الاستجابات الأساسية لكل نقطة نهاية (0 لتعطيل المقارنة)")
+    fuzz_parser.add_argument("--timing-samples", type=int, default=10, help="عدد أزمنة الاستجابة الأساسية لكل نقطة نهاية لكشف التأخير الزمني (0 للتعطيل)")
+    fuzz_parser.add_argument("--timing-alpha", type=float, default=0.01, help="مستوى الدلالة لاختبار التأخير الزمني")
+    fuzz_parser.add_argument("--timing-retests", type=int, default=5, help="الحد الأقصى لإعادة إرسال الطلبات المشتبه بتأخيرها")
+    fuzz_parser.add_argument("--timing-delta", type=float, default=0.5, help="أقل تأخير بالثواني يعتبر حقيقيًا")
+    fuzz_parser.add_argument("--stop-after", type=int, default=0, help="تخطي بقية حمولات نقطة الحقن بعد هذا العدد من نقاط الضعف المؤكدة (0 للتعطيل)")
+    fuzz_parser.add_argument("--payload-stats", help="ملف JSON لإحصائيات نجاح الحمولات بين العمليات؛ تقدم الحمولات الأنجح أولاً")
+    fuzz_parser.add_argument("--max-body", type=int, default=262144, help="الحد الأقصى لبايتات الجسم المحتفظ بها لكل استجابة (0 بلا حد)")
+    fuzz_parser.add_argument("--checkpoint", nargs="?", const="", help="كتابة نقاط حفظ للاستئناف في الملف المحدد (الافتراضي مشتق من الهدف والحمولات)")
+    fuzz_parser.add_argument("--resume", action="store_true", help="استئناف عملية تشويش سابقة من نقطة الحفظ")
+    fuzz_parser.add_argument("--dedup-cache", help="قاعدة SQLite لإعادة استخدام نتائج الطلبات المتطابقة بين العمليات")
+    fuzz_parser.add_argument("--dedup-ttl", type=int, default=86400, help="مدة صلاحية النتائج في --dedup-cache بالثواني")
+    fuzz_parser.add_argument("--metrics", help="عنوان نقطة مقاييس Prometheus المحلية، مثل :9100 أو 127.0.0.1:9100")
+    fuzz_parser.add_argument("--body-mode", choices=["head", "headtail"], default="head", help="head: التوقف عند الحد، headtail: قراءة الجسم كاملًا والاحتفاظ ببدايته ونهايته")
+    
+    # أمر عامل التشويش الموزع
+    worker_parser = subparsers.add_parser("worker", help="عامل تشويش يتصل بمنسق (urlget fuzz --listen)")
+    worker_parser.add_argument("--coordinator", required=True, help="عنوان المنسق (المضيف:المنفذ)")
+    worker_parser.add_argument("--token", help="الرمز المشترك مع المنسق")
+    worker_parser.add_argument("-t", "--threads", type=int, help="عدد المواضيع (الافتراضي إعداد المنسق)")
+    worker_parser.add_argument("--engine", choices=["thread", "async"], help="محرك تنفيذ الطلبات (الافتراضي إعداد المنسق)")
+    worker_parser.add_argument("--concurrency", type=int, help="عدد الطلبات المتزامنة لمحرك async")
+    worker_parser.add_argument("--metrics", help="عنوان نقطة مقاييس Prometheus المحلية، مثل :9100 أو 127.0.0.1:9100")
     
     # أمر اختبار XSS
     xss_parser = subparsers.add_parser("xss", help="اختبار ثغرات XSS")
     xss_parser.add_argument("-p", "--payloads", help="ملف يحتوي على حمولات XSS")
     xss_parser.add_argument("--params", help="المعلمات المستهدفة للاختبار")
+    xss_parser.add_argument("--targets", help="ملف بقائمة عناوين الأهداف (سطر لكل عنوان)، أو - للإدخال القياسي")
+    xss_parser.add_argument("-t", "--threads", type=int, default=10, help="عدد نقاط الحقن المفحوصة بالتوازي مع --targets")
+    xss_parser.add_argument("--host-concurrency", type=int, default=0, help="الحد الأقصى لنقاط الحقن المفحوصة بالتوازي لكل مضيف مع --targets")
+    xss_parser.add_argument("--mutate", help="سلاسل تحويلات تولد متغيرات لكل حمولة، مثل raw,url,html,mixed")
+    xss_parser.add_argument("--adaptive", action="store_true", help="ضبط معدل الطلبات تلقائيًا حسب استجابة الهدف (AIMD)")
+    xss_parser.add_argument("--max-rate", type=float, help="الحد الأقصى لعدد الطلبات في الثانية مع --adaptive")
+    xss_parser.add_argument("--max-body", type=int, default=262144, help="الحد الأقصى لبايتات الجسم المقروءة لكل استجابة (0 بلا حد)")
+    xss_parser.add_argument("--metrics", help="عنوان نقطة مقاييس Prometheus المحلية، مثل :9100 أو 127.0.0.1:9100")
+    
+    # أمر اكتشاف المعلمات المخفية
+    params_parser = subparsers.add_parser("params", help="اكتشاف المعلمات المخفية بدفعات من الأسماء")
+    params_parser.add_argument("-m", "--method", default="GET", help="طريقة HTTP (GET في العنوان، POST في جسم نموذج)")
+    params_parser.add_argument("-w", "--wordlist", help="ملف أسماء المعلمات (الافتراضي القائمة المرفقة)")
+    params_parser.add_argument("-b", "--batch-size", type=int, default=256, help="الحد الأقصى للأسماء في طلب واحد")
+    params_parser.add_argument("--max-url-length", type=int, default=8000, help="الحد الأقصى لطول العنوان مع GET")
+    params_parser.add_argument("-t", "--threads", type=int, default=4, help="عدد الدفعات المفحوصة بالتوازي")
+    params_parser.add_argument("--baseline-samples", type=int, default=3, help="عدد الاستجابات الأساسية بأسماء عشوائية")
+    params_parser.add_argument("--adaptive", action="store_true", help="ضبط معدل الطلبات تلقائيًا حسب استجابة الهدف (AIMD)")
+    params_parser.add_argument("--max-rate", type=float, help="الحد الأقصى لعدد الطلبات في الثانية مع --adaptive")
+    params_parser.add_argument("--max-body", type=int, default=262144, help="الحد الأقصى لبايتات الجسم المقروءة لكل استجابة (0 بلا حد)")
+    params_parser.add_argument("--metrics", help="عنوان نقطة مقاييس Prometheus المحلية، مثل :9100 أو 127.0.0.1:9100")
+    
+    # أمر اكتشاف المحتوى (القوة الغاشمة للمسارات)
+    dirs_parser = subparsers.add_parser("dirs", help="اكتشاف الملفات والمجلدات غير المرتبطة")
+    dirs_parser.add_argument("-w", "--wordlist", help="ملف الأسماء (الافتراضي القائمة المرفقة)")
+    dirs_parser.add_argument("-x", "--extensions", help="امتدادات تجرب مع كل اسم مفصولة بفواصل، مثل php,bak,old")
+    dirs_parser.add_argument("-d", "--depth", type=int, default=2, help="أقصى عمق للمجلدات المكتشفة التي يتم فحصها (0 للمجلد الأول فقط)")
+    dirs_parser.add_argument("-t", "--threads", type=int, default=10, help="عدد المواضيع")
+    dirs_parser.add_argument("--baseline-samples", type=int, default=3, help="عدد المسارات العشوائية لمعايرة كل مجلد ولكل امتداد")
+    dirs_parser.add_argument("--adaptive", action="store_true", help="ضبط معدل الطلبات تلقائيًا حسب استجابة الهدف (AIMD)")
+    dirs_parser.add_argument("--max-rate", type=float, help="الحد الأقصى لعدد الطلبات في الثانية مع --adaptive")
+    dirs_parser.add_argument("--max-body", type=int, default=262144, help="الحد الأقصى لبايتات الجسم المقروءة لكل استجابة (0 بلا حد)")
+    dirs_parser.add_argument("--metrics", help="عنوان نقطة مقاييس Prometheus المحلية، مثل :9100 أو 127.0.0.1:9100")
     
     # أمر إنشاء استغلالات CSRF
     csrf_parser = subparsers.add_parser("csrf", help="إنشاء استغلالات CSRF")
@@ -74,6 +168,7 @@ def main():
     dns_parser.add_argument("-d", "--domain", help="النطاق المستهدف")
     dns_parser.add_argument("-i", "--interface", help="واجهة الشبكة")
     dns_parser.add_argument("--redirect", help="عنوان IP للتحويل")
+    dns_parser.add_argument("--metrics", help="عنوان نقطة مقاييس Prometheus المحلية، مثل :9100 أو 127.0.0.1:9100")
     
     # تحليل الوسائط
     args = parser.parse_args()
@@ -83,6 +178,23 @@ def main():
         parser.print_help()
         sys.exit(1)
     
+    # إعداد الناقل المشترك لجميع الوحدات
+    configure_transport(
+        pool_connections=args.pool_connections,
+        pool_maxsize=args.pool_size,
+        per_host_limit=args.per_host_limit,
+        dns_cache_ttl=args.dns_cache_ttl,
+        keep_alive=not args.no_keep_alive,
+        http2=args.http2,
+        http2_prior_knowledge=args.http2_prior_knowledge
+    )
+    
+    # نقطة المقاييس الاختيارية للأوامر الطويلة
+    if getattr(args, 'metrics', None):
+        metrics_server = serve_metrics(args.metrics)
+        host, port = metrics_server.server_address[:2]
+        print(f"{Fore.CYAN}[*] المقاييس متاحة على http://{host}:{port}/metrics{Style.RESET_ALL}")
+    
     # تنفيذ الأمر المطلوب
     try:
         if args.command == "update":
@@ -115,24 +227,130 @@ def main():
             crawler.start()
             
         elif args.command == "fuzz":
-            fuzzer = HTTPFuzzer(
-                url=args.url,
+            # وضع القوالب: ملف طلب خام، أو جسم أو عنوان يحتوي على علامة الحقن
+            def build_template(url):
+                if args.request:
+                    scheme = urlparse(url).scheme if url else "http"
+                    return RequestTemplate.from_file(args.request, scheme=scheme or "http", marker=args.marker)
+                if args.data or (url and args.marker in url):
+                    headers = {}
+                    if args.data:
+                        is_json = args.data.lstrip().startswith(('{', '['))
+                        headers["Content-Type"] = "application/json" if is_json else "application/x-www-form-urlencoded"
+                    method = "POST" if args.data and args.method == "GET" else args.method
+                    return RequestTemplate(method, url, headers, args.data or "", marker=args.marker)
+                return None
+            
+            fuzz_options = dict(
                 method=args.method,
                 payloads_file=args.payloads,
                 threads=args.threads,
+                engine=args.engine,
+                concurrency=args.concurrency,
+                processes=args.processes,
+                listen=args.listen,
+                lease_size=args.lease_size,
+                token=args.token,
+                mutations=args.mutate,
+                signature_packs=args.signatures.split(',') if args.signatures else None,
+                signature_file=args.signature_file,
+                baseline_samples=args.baseline_samples,
+                timing_samples=args.timing_samples,
+                timing_alpha=args.timing_alpha,
+                timing_retests=args.timing_retests,
+                timing_delta=args.timing_delta,
+                stop_after=args.stop_after,
+                payload_stats=args.payload_stats,
+                json_body=load_json_body(args.json_body) if args.json_body else None,
+                results_file=args.output,
+                adaptive=args.adaptive,
+                max_rate=args.max_rate,
+                max_body=args.max_body,
+                body_mode=args.body_mode,
+                checkpoint=args.checkpoint is not None,
+                checkpoint_file=args.checkpoint or None,
+                resume=args.resume,
+                dedup_cache=args.dedup_cache,
+                dedup_ttl=args.dedup_ttl,
                 verbose=args.verbose
             )
+            
+            if args.targets:
+                # ملف الطلب الخام يحدد مضيفًا واحدًا، والتقسيم والاستئناف مرتبطان بفضاء مهام هدف واحد
+                if args.request or args.listen or args.processes > 1 or args.resume:
+                    raise ValueError("لا يمكن استخدام --targets مع --request أو --listen أو --processes أو --resume")
+                fuzzer = MultiTargetFuzzer(load_targets(args.targets), host_concurrency=args.host_concurrency,
+                                           template_factory=build_template, **fuzz_options)
+            else:
+                fuzzer = HTTPFuzzer(url=args.url, template=build_template(args.url), **fuzz_options)
             fuzzer.start()
             
+        elif args.command == "worker":
+            overrides = {name: getattr(args, name) for name in ("threads", "engine", "concurrency")
+                         if getattr(args, name) is not None}
+            worker = Worker(args.coordinator, token=args.token, overrides=overrides, verbose=args.verbose)
+            worker.run()
+            
         elif args.command == "xss":
-            scanner = XSSScanner(
-                url=args.url,
+            xss_options = dict(
                 payloads_file=args.payloads,
                 params=args.params,
+                adaptive=args.adaptive,
+                max_rate=args.max_rate,
+                max_body=args.max_body,
+                mutations=args.mutate,
                 verbose=args.verbose
             )
+            if args.targets:
+                scanner = MultiTargetXSS(load_targets(args.targets), threads=args.threads,
+                                         host_concurrency=args.host_concurrency, **xss_options)
+            else:
+                scanner = XSSScanner(url=args.url, **xss_options)
             scanner.start()
             
+        elif args.command == "params":
+            if not args.url:
+                raise ValueError("يجب تحديد عنوان الهدف باستخدام --url")
+            discovery = ParamDiscovery(
+                url=args.url,
+                method=args.method,
+                wordlist=args.wordlist,
+                batch_size=args.batch_size,
+                max_url_length=args.max_url_length,
+                threads=args.threads,
+                baseline_samples=args.baseline_samples,
+                adaptive=args.adaptive,
+                max_rate=args.max_rate,
+                max_body=args.max_body,
+                verbose=args.verbose
+            )
+            results = discovery.start()
+            if args.output:
+                with open(args.output, 'w', encoding='utf-8') as f:
+                    json.dump(results, f, ensure_ascii=False, indent=2)
+                print(f"{Fore.GREEN}[+] تم حفظ النتائج في {args.output}{Style.RESET_ALL}")
+            
+        elif args.command == "dirs":
+            if not args.url:
+                raise ValueError("يجب تحديد عنوان الهدف باستخدام --url")
+            discovery = ContentDiscovery(
+                url=args.url,
+                wordlist=args.wordlist,
+                extensions=args.extensions.split(',') if args.extensions else None,
+                max_depth=args.depth,
+                threads=args.threads,
+                baseline_samples=args.baseline_samples,
+                adaptive=args.adaptive,
+                max_rate=args.max_rate,
+                max_body=args.max_body,
+                verbose=args.verbose
+            )
+            results = discovery.start()
+            if args.output:
+                with open(args.output, 'w', encoding='utf-8') as f:
+                    json.dump(results, f, ensure_ascii=False, indent=2)
+                print(f"{Fore.GREEN}[+] تم حفظ النتائج في {args.output}{Style.RESET_ALL}")
+            
         elif args.command == "csrf":
             generator = CSRFGenerator(
                 request_file=args.request,
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة مجموعات الحمولات المعنونة بالذاكرة لأداة urlget
+"""
+
+import os
+import mmap
+import struct
+import hashlib
+import threading
+from array import array
+
+# مجلد قوائم الكلمات المرفقة مع الأداة
+WORDLISTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "wordlists")
+
+# ترويسة ملف الفهرس: التوقيع، الإصدار، إزالة التكرار، حجم الملف، وقت التعديل، عدد الأسطر
+_INDEX_MAGIC = b"UGIX"
+_INDEX_VERSION = 1
+_INDEX_HEADER = struct.Struct("<4sHHQQQ")
+
+
+def bundled_wordlist(name):
+    """
+    الحصول على مسار قائمة كلمات مرفقة مع الأداة
+
+    المعلمات:
+        name (str): اسم الملف داخل مجلد wordlists
+
+    العائد:
+        str: المسار الكامل للملف
+    """
+    return os.path.join(WORDLISTS_DIR, name)
+
+
+class PayloadCorpus:
+    """مجموعة حمولات من ملف نصي يتم تعيينه في الذاكرة مع فهرس لإزاحات الأسطر"""
+
+    def __init__(self, path, dedupe=True, encoding='utf-8'):
+        """
+        تهيئة المجموعة
+
+        المعلمات:
+            path (str): مسار ملف الحمولات (سطر لكل حمولة)
+            dedupe (bool): إزالة الحمولات المكررة
+            encoding (str): ترميز الملف
+        """
+        self.path = os.path.realpath(path)
+        self.dedupe = dedupe
+        self.encoding = encoding
+        self._open()
+
+    def _open(self):
+        """تعيين الملف في الذاكرة وتحميل الفهرس أو بناؤه"""
+        self._file = open(self.path, 'rb')
+        stat = os.fstat(self._file.fileno())
+        self._size = stat.st_size
+        self._mtime = stat.st_mtime_ns
+
+        # لا يمكن تعيين ملف فارغ في الذاكرة
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self._size else b""
+
+        self._index_file = None
+        self._index_map = None
+        self._offsets = self._load_index()
+        if self._offsets is None:
+            self._offsets = self._build_index()
+            self._save_index(self._offsets)
+
+    @property
+    def index_path(self):
+        """مسار ملف الفهرس المخزن بجانب ملف الحمولات"""
+        return f"{self.path}.idx"
+
+    def _load_index(self):
+        """تحميل الفهرس المخزن إذا كان مطابقًا للملف الحالي"""
+        try:
+            index_file = open(self.index_path, 'rb')
+        except OSError:
+            return None
+
+        try:
+            header = index_file.read(_INDEX_HEADER.size)
+            if len(header) != _INDEX_HEADER.size:
+                index_file.close()
+                return None
+
+            magic, version, dedupe, size, mtime, count = _INDEX_HEADER.unpack(header)
+            expected_size = _INDEX_HEADER.size + count * 16
+            if (magic != _INDEX_MAGIC or version != _INDEX_VERSION or bool(dedupe) != self.dedupe
+                    or size != self._size or mtime != self._mtime
+                    or os.fstat(index_file.fileno()).st_size != expected_size):
+                index_file.close()
+                return None
+
+            if count == 0:
+                index_file.close()
+                return array('Q')
+
+            # تعيين الفهرس في الذاكرة أيضًا ليشترك فيه جميع العمليات
+            self._index_file = index_file
+            self._index_map = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+            return memoryview(self._index_map)[_INDEX_HEADER.size:].cast('Q')
+        except (OSError, ValueError, struct.error):
+            index_file.close()
+            return None
+
+    def _build_index(self):
+        """بناء فهرس (بداية، نهاية) لكل سطر غير فارغ بعد إزالة المسافات"""
+        offsets = array('Q')
+        # يتم الاحتفاظ ببصمات من 8 بايت فقط بدلاً من نصوص الحمولات
+        seen = set()
+        data = self._data
+        pos = 0
+
+        while pos < self._size:
+            end = data.find(b"\n", pos)
+            if end == -1:
+                end = self._size
+
+            line = data[pos:end]
+            stripped = line.strip()
+            if stripped:
+                if self.dedupe:
+                    digest = hashlib.blake2b(stripped, digest_size=8).digest()
+                    if digest in seen:
+                        pos = end + 1
+                        continue
+                    seen.add(digest)
+
+                start = pos + len(line) - len(line.lstrip())
+                offsets.append(start)
+                offsets.append(start + len(stripped))
+
+            pos = end + 1
+
+        return offsets
+
+    def _save_index(self, offsets):
+        """حفظ الفهرس بجانب الملف؛ يتم تجاهل الفشل إذا كان المجلد للقراءة فقط"""
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(_INDEX_HEADER.pack(_INDEX_MAGIC, _INDEX_VERSION, int(self.dedupe),
+                                           self._size, self._mtime, len(offsets) // 2))
+                offsets.tofile(f)
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def __len__(self):
+        return len(self._offsets) // 2
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("فهرس الحمولة خارج النطاق")
+
+        start = self._offsets[index * 2]
+        end = self._offsets[index * 2 + 1]
+        return self._data[start:end].decode(self.encoding, errors='replace')
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __getstate__(self):
+        # يتم تمرير المسار فقط؛ تعيد العملية الفرعية تعيين نفس الملفين في الذاكرة
+        return {'path': self.path, 'dedupe': self.dedupe, 'encoding': self.encoding}
+
+    def __setstate__(self, state):
+        self.path = state['path']
+        self.dedupe = state['dedupe']
+        self.encoding = state['encoding']
+        self._open()
+
+    def close(self):
+        """إغلاق التعيينات والملفات المفتوحة"""
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release()
+        if self._index_map is not None:
+            self._index_map.close()
+            self._index_file.close()
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+
+# مجموعات مفتوحة مشتركة بين الوحدات داخل نفس العملية
+_open_corpora = {}
+_open_corpora_lock = threading.Lock()
+
+
+def open_corpus(path, dedupe=True):
+    """
+    فتح مجموعة حمولات مع مشاركة نفس التعيين بين جميع الوحدات
+
+    المعلمات:
+        path (str): مسار ملف الحمولات
+        dedupe (bool): إزالة الحمولات المكررة
+
+    العائد:
+        PayloadCorpus: المجموعة المشتركة
+    """
+    key = (os.path.realpath(path), dedupe)
+    with _open_corpora_lock:
+        corpus = _open_corpora.get(key)
+        if corpus is None or corpus._mtime != os.stat(key[0]).st_mtime_ns:
+            corpus = PayloadCorpus(path, dedupe=dedupe)
+            _open_corpora[key] = corpus
+        return corpus
@@ -9,6 +9,7 @@ import requests
 from urllib.parse import urlparse
 from colorama import Fore, Style
 
+from urlget.template import parse_raw_request
 from urlget.utils import setup_logger
 
 class CSRFGenerator:
@@ -36,40 +37,10 @@ class CSRFGenerator:
             with open(self.request_file, 'r', encoding='utf-8') as f:
                 content = f.read()
             
-            # تحليل الطلب
-            request_lines = content.strip().split('\n')
-            
-            # استخراج طريقة HTTP والمسار والإصدار
-            request_line = request_lines[0]
-            method, path, version = request_line.split(' ')
-            
-            # استخراج الرؤوس
-            headers = {}
-            i = 1
-            while i < len(request_lines) and request_lines[i]:
-                header_line = request_lines[i]
-                key, value = header_line.split(':', 1)
-                headers[key.strip()] = value.strip()
-                i += 1
-            
-            # استخراج الجسم
-            body = ''
-            if i < len(request_lines):
-                body = '\n'.join(request_lines[i+1:])
-            
-            # استخراج المضيف من الرؤوس
-            host = headers.get('Host', '')
-            
-            # إنشاء عنوان URL كامل
-            url = f"http://{host}{path}" if not path.startswith('http') else path
-            
-            # تخزين بيانات الطلب
-            self.request_data = {
-                'method': method,
-                'url': url,
-                'headers': headers,
-                'body': body
-            }
+            # تحليل الطلب وتخزين بياناته
+            self.request_data = parse_raw_request(content)
+            method = self.request_data['method']
+            url = self.request_data['url']
             
             self.logger.info(f"تم تحميل الطلب: {method} {url}")
             return True
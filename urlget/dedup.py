@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة ذاكرة الطلبات المعنونة بالمحتوى لتجنب إرسال الطلبات المتطابقة في أداة urlget
+"""
+
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit, urlunsplit
+
+
+def _canonical_pairs(values):
+    """تحويل قاموس أو قائمة أزواج إلى قائمة أزواج نصية مرتبة"""
+    if not values:
+        return []
+    items = values.items() if isinstance(values, dict) else values
+    pairs = []
+    for name, value in items:
+        if isinstance(value, (list, tuple)):
+            pairs.extend((str(name), str(v)) for v in value)
+        else:
+            pairs.append((str(name), str(value)))
+    return sorted(pairs)
+
+
+def request_key(method, url, params=None, headers=None, body=None):
+    """
+    بصمة قانونية لطلب HTTP
+
+    المعلمات:
+        method (str): طريقة HTTP
+        url (str): عنوان URL (يتم توحيد حالة المخطط والمضيف)
+        params (dict): معلمات الاستعلام
+        headers (dict): الرؤوس (أسماؤها غير حساسة لحالة الأحرف)
+        body (str|bytes|dict): جسم الطلب
+
+    العائد:
+        bytes: بصمة من 16 بايت
+    """
+    parts = urlsplit(url)
+    url = urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", parts.query, ""))
+
+    if isinstance(body, dict):
+        body = _canonical_pairs(body)
+    elif isinstance(body, bytes):
+        body = body.decode('latin-1')
+
+    canonical = json.dumps([
+        method.upper(),
+        url,
+        _canonical_pairs(params),
+        [(name.lower(), value) for name, value in _canonical_pairs(headers)],
+        body,
+    ], ensure_ascii=False, separators=(',', ':'))
+    return hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).digest()
+
+
+# حقول النتيجة المحتفظ بها بالترتيب؛ البصمة الكاملة لا تلزم لإعادة تسجيل النتيجة فلا تخزن
+_VERDICT_FIELDS = ('status_code', 'response_time', 'response_length', 'content_length', 'retained_length',
+                   'truncated', 'header_names', 'is_vulnerable', 'signatures', 'anomalies', 'timing')
+
+
+def compact_verdict(verdict, names=None):
+    """
+    تحويل نتيجة طلب إلى مجموعة مختصرة للاحتفاظ بها في الذاكرة
+
+    المعلمات:
+        verdict (dict): النتيجة من _handle_response
+        names (dict): ذاكرة مشتركة لقوائم أسماء الرؤوس المتكررة (اختياري)
+
+    العائد:
+        tuple: قيم _VERDICT_FIELDS
+    """
+    header_names = tuple(verdict.get('header_names') or ())
+    if names is not None:
+        header_names = names.setdefault(header_names, header_names)
+    signatures = tuple((hit['name'], hit['pack'], hit['start'], hit['end']) for hit in verdict.get('signatures') or ())
+    anomalies = tuple(sys.intern(name) for name in verdict.get('anomalies') or ())
+    return (verdict['status_code'], verdict['response_time'], verdict['response_length'],
+            verdict.get('content_length'), verdict.get('retained_length'), verdict.get('truncated', False),
+            header_names, verdict['is_vulnerable'], signatures, anomalies, verdict.get('timing'))
+
+
+def expand_verdict(entry):
+    """
+    إعادة بناء قاموس النتيجة من مجموعة compact_verdict
+
+    العائد:
+        dict: النتيجة دون البصمة
+    """
+    verdict = dict(zip(_VERDICT_FIELDS, entry))
+    verdict['header_names'] = list(verdict['header_names'])
+    verdict['signatures'] = [{'name': name, 'pack': pack, 'start': start, 'end': end}
+                             for name, pack, start, end in verdict['signatures']]
+    verdict['anomalies'] = list(verdict['anomalies'])
+    return verdict
+
+
+class RequestCache:
+    """ذاكرة نتائج الطلبات: مختصرة في الذاكرة للعملية الحالية، واختياريًا في SQLite بين العمليات"""
+
+    def __init__(self, path=None, ttl=86400, max_entries=20000, batch_size=500):
+        """
+        تهيئة الذاكرة
+
+        المعلمات:
+            path (str): مسار قاعدة SQLite لمشاركة النتائج بين العمليات (None للعملية الحالية فقط)
+            ttl (float): مدة صلاحية النتائج المخزنة على القرص بالثواني
+            max_entries (int): الحد الأقصى للنتائج المختصرة في الذاكرة (الأقدم استخدامًا يحذف أولاً)
+            batch_size (int): عدد النتائج في كل عملية إدراج على القرص
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.batch_size = batch_size
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._header_names = {}
+        self._batch = []
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS responses "
+                               "(key BLOB PRIMARY KEY, created REAL, verdict TEXT)")
+            self._conn.execute("DELETE FROM responses WHERE created < ?", (time.time() - ttl,))
+            self._conn.commit()
+
+    def get(self, key):
+        """
+        البحث عن نتيجة طلب سابق
+
+        المعلمات:
+            key (bytes): بصمة الطلب من request_key
+
+        العائد:
+            dict: النتيجة المخزنة (دون البصمة) أو None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return expand_verdict(entry)
+
+            if self._conn is not None:
+                row = self._conn.execute("SELECT verdict FROM responses WHERE key = ? AND created >= ?",
+                                         (key, time.time() - self.ttl)).fetchone()
+                if row is not None:
+                    entry = compact_verdict(json.loads(row[0]), self._header_names)
+                    self._remember(key, entry)
+                    self.hits += 1
+                    return expand_verdict(entry)
+
+            self.misses += 1
+            return None
+
+    def put(self, key, verdict):
+        """
+        تخزين نتيجة طلب
+
+        المعلمات:
+            key (bytes): بصمة الطلب
+            verdict (dict): نتيجة قابلة للتحويل إلى JSON
+        """
+        with self._lock:
+            entry = compact_verdict(verdict, self._header_names)
+            self._remember(key, entry)
+            if self._conn is not None:
+                self._batch.append((key, time.time(), json.dumps(expand_verdict(entry), ensure_ascii=False)))
+                if len(self._batch) >= self.batch_size:
+                    self._flush()
+
+    def _remember(self, key, entry):
+        """إضافة نتيجة مختصرة إلى ذاكرة LRU"""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _flush(self):
+        """كتابة الدفعة الحالية إلى القرص"""
+        if self._batch:
+            self._conn.executemany("INSERT OR REPLACE INTO responses VALUES (?, ?, ?)", self._batch)
+            self._conn.commit()
+            self._batch = []
+
+    def close(self):
+        """كتابة النتائج المتبقية وإغلاق قاعدة البيانات"""
+        with self._lock:
+            if self._conn is not None:
+                self._flush()
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة اكتشاف المحتوى (القوة الغاشمة للمسارات) مع معايرة صفحات "عدم الوجود" لكل مجلد لأداة urlget
+"""
+
+import heapq
+import random
+import string
+import logging
+import threading
+import requests
+from urllib.parse import quote, urljoin
+from colorama import Fore, Style
+from tqdm import tqdm
+
+from urlget.fuzzer import HTTPFuzzer
+from urlget.fingerprint import BaselineProfile, fingerprint_without
+from urlget.engine import ThreadEngine
+from urlget.corpus import open_corpus, bundled_wordlist
+from urlget.utils import setup_logger
+
+# قائمة الكلمات الافتراضية المرفقة مع الأداة
+DEFAULT_WORDLIST = "wordlist.txt"
+
+# رموز الحالة التي تعني عدم الوجود دائمًا مهما اختلفت البصمة
+MISSING_STATUSES = (404,)
+
+# رموز التحويل التي قد تشير إلى مجلد (تحويل المسار إلى نفسه مع /)
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+
+def _priority(depth, status):
+    """
+    أولوية المجلد في قائمة الانتظار: الأقل عمقًا أولاً، ثم المجلدات المتاحة قبل المحمية والمحولة
+
+    العائد:
+        tuple: مفتاح الترتيب (الأصغر أولاً)
+    """
+    if 200 <= status < 300:
+        rank = 0
+    elif status in (401, 403):
+        rank = 1
+    else:
+        rank = 2
+    return depth, rank
+
+
+class ContentDiscovery:
+    """اكتشاف الملفات والمجلدات غير المرتبطة بتجربة أسماء من قائمة كلمات في كل مجلد"""
+
+    def __init__(self, url, wordlist=None, extensions=None, max_depth=2, threads=10, baseline_samples=3,
+                 adaptive=False, max_rate=None, max_body=262144, verbose=False):
+        """
+        تهيئة المكتشف
+
+        المعلمات:
+            url (str): عنوان المجلد الأول
+            wordlist (str): ملف الأسماء (الافتراضي القائمة المرفقة)
+            extensions (list): امتدادات تجرب مع كل اسم إضافة إلى الاسم نفسه، مثل ["php", "bak"]
+            max_depth (int): أقصى عمق للمجلدات المكتشفة التي يتم فحصها (0 للمجلد الأول فقط)
+            threads (int): عدد المواضيع
+            baseline_samples (int): عدد المسارات العشوائية لمعايرة كل مجلد ولكل امتداد
+            adaptive (bool): ضبط معدل الطلبات تلقائيًا حسب استجابة الهدف
+            max_rate (float): الحد الأقصى لعدد الطلبات في الثانية مع adaptive
+            max_body (int): الحد الأقصى لبايتات الجسم المقروءة لكل استجابة
+            verbose (bool): عرض معلومات تفصيلية
+        """
+        self.wordlist = wordlist or bundled_wordlist(DEFAULT_WORDLIST)
+        self.extensions = [ext.strip().lstrip('.') for ext in (extensions or []) if ext.strip().lstrip('.')]
+        self.suffixes = [""] + [f".{ext}" for ext in self.extensions]
+        self.max_depth = max_depth
+        self.threads = threads
+        self.baseline_samples = max(1, baseline_samples)
+
+        # المشوش يوفر تحليل العنوان والناقل المشترك والتحكم في المعدل والمقاييس ومطابق التواقيع
+        self.fuzzer = HTTPFuzzer(url, threads=threads, baseline_samples=0, timing_samples=0,
+                                 adaptive=adaptive, max_rate=max_rate, max_body=max_body, checkpoint=False,
+                                 verbose=verbose)
+        base_url, _ = self.fuzzer.parse_url()
+        self.url = base_url if base_url.endswith('/') else base_url + '/'
+
+        self.logger = setup_logger("ContentDiscovery", level=logging.DEBUG if verbose else logging.INFO)
+
+        # قائمة المجلدات بانتظار الفحص مرتبة حسب الأولوية، والملفات الأساسية لكل (مجلد، امتداد)
+        self.frontier = []
+        self.visited = set()
+        self.baselines = {}
+        self._sequence = 0
+
+        self.found = []
+        self.scanned = 0
+        self.requests = 0
+        # المهام المرسلة إلى المحرك ولم تكتمل؛ قد تضيف مجلدات جديدة إلى القائمة
+        self.pending = 0
+        self.lock = threading.Lock()
+        self.condition = threading.Condition(self.lock)
+        self.progress_bar = None
+
+    def _push(self, directory, depth, status=200):
+        """إضافة مجلد إلى قائمة الانتظار إن لم يفحص من قبل (تحت القفل)"""
+        if directory in self.visited or depth > self.max_depth:
+            return False
+        self.visited.add(directory)
+        self._sequence += 1
+        heapq.heappush(self.frontier, (_priority(depth, status), self._sequence, directory, depth))
+        self.condition.notify_all()
+        return True
+
+    def _fetch(self, url, path):
+        """
+        طلب مسار مع البحث عن انعكاسه في الجسم
+
+        العائد:
+            ResponseSample: الاستجابة أو None عند الفشل
+        """
+        task = {'url': url, 'method': "GET", 'literals': [path], 'mode': 'dirs'}
+        response = None
+        for attempt in range(self.fuzzer.max_retries + 1):
+            try:
+                response = self.fuzzer._send(task)
+            except requests.exceptions.RequestException as e:
+                self.logger.debug(f"فشل طلب {url}: {str(e)}")
+                return None
+            with self.lock:
+                self.requests += 1
+            if response is None or not self.fuzzer._should_retry(response, attempt):
+                break
+        return response
+
+    def _fingerprint(self, response):
+        """بصمة الاستجابة بعد حذف المسار المنعكس (صفحات الخطأ تعرض المسار المطلوب غالبًا)"""
+        return fingerprint_without(response.status_code, response.headers, response.content,
+                                   response.total_bytes, response.scan.found)
+
+    def calibrate(self, directory):
+        """
+        التقاط استجابات مسارات عشوائية في المجلد لكل امتداد
+
+        الخوادم التي تعيد 200 أو تحويلاً لأي مسار (soft 404) تعرف بهذه البصمات، فلا يعتبر
+        المسار موجودًا إلا إذا اختلفت استجابته عنها.
+
+        المعلمات:
+            directory (str): عنوان المجلد منتهيًا بـ /
+
+        العائد:
+            bool: تمت معايرة امتداد واحد على الأقل
+        """
+        calibrated = False
+        for suffix in self.suffixes:
+            fingerprints = []
+            signatures = set()
+            for _ in range(self.baseline_samples):
+                # أطوال مختلفة حتى يظهر أثر طول المسار في الملف الأساسي
+                name = "".join(random.choice(string.ascii_lowercase + string.digits)
+                               for _ in range(random.randint(8, 16))) + suffix
+                response = self._fetch(directory + name, name)
+                if response is None:
+                    continue
+                fingerprints.append(self._fingerprint(response))
+                signatures.update(hit.name for hit in response.scan.hits)
+            if fingerprints:
+                self.baselines[(directory, suffix)] = BaselineProfile(fingerprints, signatures)
+                calibrated = True
+        return calibrated
+
+    def _candidates(self):
+        """
+        مولد مسارات المجلد: كل كلمة ثم الكلمة مع كل امتداد، بقراءة قائمة الكلمات عند الحاجة فقط
+
+        العائد:
+            generator: أزواج (الامتداد، المسار)
+        """
+        for word in open_corpus(self.wordlist):
+            word = word.strip().lstrip('/')
+            if not word or word.startswith('#'):
+                continue
+            for suffix in self.suffixes:
+                yield suffix, word + suffix
+
+    def _tasks(self):
+        """
+        مولد مهام المحرك من قائمة المجلدات حسب الأولوية
+
+        عند نفاد القائمة ينتظر اكتمال المهام الجارية لأنها قد تكتشف مجلدات جديدة.
+        """
+        total = len(open_corpus(self.wordlist)) * len(self.suffixes)
+        while True:
+            with self.condition:
+                while not self.frontier and self.pending:
+                    self.condition.wait()
+                if not self.frontier:
+                    return
+                _, _, directory, depth = heapq.heappop(self.frontier)
+
+            if not self.calibrate(directory):
+                self.logger.warning(f"فشل في معايرة {directory}، تخطي المجلد")
+                continue
+            self.logger.debug(f"فحص {directory} (العمق {depth})")
+            self.scanned += 1
+            self.progress_bar.total += total
+            self.progress_bar.refresh()
+
+            count = 0
+            for suffix, path in self._candidates():
+                with self.lock:
+                    self.pending += 1
+                count += 1
+                yield directory, depth, suffix, path
+            # الأسطر الفارغة والتعليقات لا تولد مسارات
+            self.progress_bar.total -= total - count
+
+    def _check(self, task):
+        """طلب مسار ومقارنته بالملف الأساسي لمجلده وامتداده"""
+        directory, depth, suffix, path = task
+        url = directory + quote(path, safe="/")
+        response = self._fetch(url, path)
+        if response is None or response.status_code in MISSING_STATUSES:
+            return
+
+        baseline = self.baselines.get((directory, suffix))
+        reasons = baseline.differences(self._fingerprint(response)) if baseline is not None else ['status']
+        reasons.extend(f"signature:{hit.name}" for hit in response.scan.hits
+                       if baseline is not None and hit.name not in baseline.signatures)
+        if not reasons:
+            return
+
+        # المجلد يعرف بتحويل المسار إلى نفسه مع / في نهايته
+        is_directory = False
+        if response.status_code in REDIRECT_STATUSES:
+            location = response.headers.get('Location')
+            is_directory = bool(location) and urljoin(url, location).split('?', 1)[0] == url + '/'
+
+        entry = {
+            'url': url + '/' if is_directory else url,
+            'status_code': response.status_code,
+            'length': response.total_bytes,
+            'directory': is_directory,
+            'depth': depth,
+            'reasons': reasons,
+        }
+        with self.lock:
+            self.found.append(entry)
+            queued = is_directory and self._push(entry['url'], depth + 1, response.status_code)
+        self.fuzzer.findings_metric.inc(mode='dirs')
+
+        with self.fuzzer.print_lock:
+            kind = " [مجلد]" if is_directory else ""
+            self.progress_bar.write(f"{Fore.GREEN}[+] {response.status_code} {response.total_bytes:>8} "
+                                    f"{entry['url']}{kind} ({', '.join(reasons)}){Style.RESET_ALL}")
+            if queued:
+                self.logger.debug(f"إضافة {entry['url']} إلى قائمة المجلدات")
+
+    def _on_complete(self, task):
+        """تحديث التقدم وإيقاظ مولد المهام إذا كان ينتظر"""
+        with self.condition:
+            self.pending -= 1
+            self.progress_bar.update(1)
+            if not self.pending:
+                self.condition.notify_all()
+
+    def start(self):
+        """
+        بدء الاكتشاف
+
+        العائد:
+            dict: المسارات المكتشفة وعدد الطلبات
+        """
+        print(f"{Fore.GREEN}[+] بدء اكتشاف المحتوى في {self.url}...{Style.RESET_ALL}")
+        with self.lock:
+            self._push(self.url, 0)
+
+        self.progress_bar = tqdm(total=0, desc="التقدم", unit="طلب")
+        try:
+            engine = ThreadEngine(threads=self.threads, logger=self.logger)
+            self.fuzzer.metrics.gauge("queue_depth", "المهام بانتظار عامل متفرغ (أو قيد التنفيذ في محرك async)",
+                                      engine.depth)
+            engine.run(self._tasks(), self._check, on_complete=self._on_complete)
+        finally:
+            self.progress_bar.close()
+
+        directories = sum(1 for entry in self.found if entry['directory'])
+        print(f"\n{Fore.GREEN}[+] اكتمل الاكتشاف!{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}[*] تم إرسال {self.requests} طلب في {self.scanned} مجلد{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}[*] المسارات المكتشفة: {len(self.found)} (منها {directories} مجلد){Style.RESET_ALL}")
+        for entry in sorted(self.found, key=lambda entry: entry['url']):
+            print(f"  - {entry['status_code']} {entry['url']}")
+
+        return {
+            'url': self.url,
+            'requests': self.requests,
+            'found': sorted(self.found, key=lambda entry: entry['url']),
+        }
@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة التشويش الموزع: منسق يوزع نطاقات المهام على عمال عبر TCP لأداة urlget
+
+البروتوكول: رسالة JSON في كل سطر، وكل طلب من العامل يقابله رد واحد من المنسق.
+    hello      -> config     (وسائط المشوش والحالة المشتركة)
+    lease      -> lease | wait | finished
+    heartbeat  -> ok | revoked
+    results    -> ok | revoked
+    complete   -> ok | revoked
+"""
+
+import hmac
+import json
+import time
+import socket
+import logging
+import threading
+import socketserver
+from collections import deque
+
+from urlget.checkpoint import Checkpoint
+from urlget.fingerprint import BaselineProfile
+from urlget.sharding import ShardChannel
+from urlget.signatures import SignatureMatcher
+from urlget.template import RequestTemplate
+from urlget.timing import LatencyProfile
+from urlget.mutations import mutate, base_payloads
+from urlget.utils import setup_logger, parse_address
+
+
+def _encode_snapshot(snapshot):
+    """تحويل لقطة MetricsRegistry.snapshot (مفاتيحها صفوف) إلى قوائم قابلة للإرسال بصيغة JSON"""
+    return {kind: [[name, [list(label) for label in labels], value]
+                   for (name, labels), value in snapshot[kind].items()]
+            for kind in ('counters', 'histograms')}
+
+
+def _decode_snapshot(data):
+    """إعادة بناء لقطة المقاييس من نتيجة _encode_snapshot"""
+    return {kind: {(name, tuple(tuple(label) for label in labels)): value
+                   for name, labels, value in data[kind]}
+            for kind in ('counters', 'histograms')}
+
+class Lease:
+    """نطاق مهام مؤجر لعامل حتى انتهاء مهلته"""
+
+    __slots__ = ('lease_id', 'start', 'stop', 'worker', 'deadline')
+
+    def __init__(self, lease_id, start, stop, worker, deadline):
+        """تهيئة الإيجار"""
+        self.lease_id = lease_id
+        self.start = start
+        self.stop = stop
+        self.worker = worker
+        self.deadline = deadline
+
+
+class _CoordinatorHandler(socketserver.StreamRequestHandler):
+    """معالج اتصال عامل واحد"""
+
+    def handle(self):
+        coordinator = self.server.coordinator
+        for line in self.rfile:
+            try:
+                reply = coordinator.handle(json.loads(line))
+            except (ValueError, KeyError) as e:
+                reply = {'type': 'error', 'message': str(e)}
+            self.wfile.write(json.dumps(reply, ensure_ascii=False).encode('utf-8') + b"\n")
+            if reply['type'] == 'error':
+                break
+
+
+class _CoordinatorServer(socketserver.ThreadingTCPServer):
+    """خادم TCP للمنسق"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class Coordinator:
+    """منسق يؤجر نطاقات فهارس المهام للعمال ويعيد توزيع نطاقات العمال المتوقفين ويجمع النتائج"""
+
+    def __init__(self, fuzzer, address, lease_size=1000, lease_timeout=60.0, token=None):
+        """
+        تهيئة المنسق
+
+        المعلمات:
+            fuzzer (HTTPFuzzer): المشوش في العملية الرئيسية (بعد تحميل الحمولات والملفات الأساسية)
+            address (str): عنوان الاستماع بالشكل المضيف:المنفذ
+            lease_size (int): عدد المهام في كل نطاق مؤجر
+            lease_timeout (float): المهلة التي يعتبر بعدها العامل متوقفًا دون نبض أو نتائج
+            token (str): رمز مشترك يجب أن يرسله العامل (اختياري)
+        """
+        self.fuzzer = fuzzer
+        self.address = parse_address(address)
+        self.lease_size = max(1, lease_size)
+        self.lease_timeout = lease_timeout
+        self.token = token
+        self.logger = fuzzer.logger
+
+        self.pending = deque()
+        self.leases = {}
+        self.workers = set()
+        self.progress_bar = None
+        self.tracker = None
+        self.spans = []
+
+        self._next_lease = 0
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    def _config(self):
+        """وسائط المشوش والحالة المشتركة التي يحتاجها العامل"""
+        options = self.fuzzer.shard_options()
+        extra_signatures = None
+        if options['signature_file']:
+            with open(options['signature_file'], 'r', encoding='utf-8') as f:
+                extra_signatures = json.load(f)
+
+        # المسارات المحلية في المنسق لا تعني شيئًا على عقد أخرى
+        options.update(payloads_file=None, signature_file=None, dedup_cache=None)
+        if options['template'] is not None:
+            options['template'] = options['template'].to_dict()
+        return {
+            'type': 'config',
+            'options': options,
+            'extra_signatures': extra_signatures,
+            'lease_timeout': self.lease_timeout,
+            'state': {
+                # الحمولات الأصلية فقط؛ يعيد العامل توليد المتغيرات من إعداد mutations
+                'payloads': list(base_payloads(self.fuzzer.payloads)),
+                'baselines': [[list(key), profile.to_dict()] for key, profile in self.fuzzer.baselines.items()],
+                'latencies': [[list(key), profile.to_dict()] for key, profile in self.fuzzer.latencies.items()],
+                'headers_to_fuzz': self.fuzzer.headers_to_fuzz,
+                'json_data': self.fuzzer.json_data,
+            },
+        }
+
+    def _locate(self, index):
+        """تحويل الفهرس العام إلى (الوضع، فهرس المهمة داخل الوضع)"""
+        for mode, offset, count in self.spans:
+            if offset <= index < offset + count:
+                return mode, index - offset
+        raise IndexError(index)
+
+    def _remaining(self, start, stop):
+        """عدد المهام غير المكتملة في النطاق"""
+        return sum(1 for index in range(start, stop) if not self.tracker.is_done(*self._locate(index)))
+
+    def _skip_list(self, start, stop):
+        """المهام المكتملة مسبقًا في النطاق (عند إعادة تأجير نطاق عامل متوقف أو عند الاستئناف)"""
+        skip = []
+        for index in range(start, stop):
+            mode, task_index = self._locate(index)
+            if self.tracker.is_done(mode, task_index):
+                skip.append([mode, task_index])
+        return skip
+
+    def handle(self, message):
+        """
+        معالجة رسالة من عامل
+
+        المعلمات:
+            message (dict): الرسالة
+
+        العائد:
+            dict: الرد
+        """
+        kind = message['type']
+
+        if kind == 'hello':
+            if self.token and not hmac.compare_digest(str(message.get('token') or '').encode('utf-8'),
+                                                      self.token.encode('utf-8')):
+                return {'type': 'error', 'message': 'رمز غير صالح'}
+            with self._lock:
+                self.workers.add(message['worker'])
+            self.logger.info(f"انضم العامل {message['worker']}")
+            return self._config()
+
+        with self._changed:
+            if kind == 'lease':
+                if self.pending:
+                    start, stop = self.pending.popleft()
+                    self._next_lease += 1
+                    lease = Lease(self._next_lease, start, stop, message['worker'],
+                                  time.monotonic() + self.lease_timeout)
+                    self.leases[lease.lease_id] = lease
+                    return {'type': 'lease', 'lease': lease.lease_id, 'start': start, 'stop': stop,
+                            'skip': self._skip_list(start, stop)}
+                if self.leases:
+                    return {'type': 'wait', 'retry': 1.0}
+                return {'type': 'finished'}
+
+            lease = self.leases.get(message['lease'])
+            if lease is None or lease.worker != message['worker']:
+                # تمت إعادة تأجير النطاق لعامل آخر؛ يتم تجاهل نتائج هذا العامل
+                return {'type': 'revoked'}
+            lease.deadline = time.monotonic() + self.lease_timeout
+
+            if kind == 'results':
+                done = [tuple(item) for item in message['done']]
+                self.fuzzer.merge_shard_batch(message['records'], message['findings'], done, self.progress_bar)
+                self.fuzzer.dedup.hits += message.get('dedup_hits', 0)
+                # لقطة تراكمية من مقاييس العامل تستبدل سابقتها في سجل المنسق
+                self.fuzzer.metrics.merge_remote(('worker', lease.worker), _decode_snapshot(message['metrics']))
+                if self.tracker is not self.fuzzer.checkpoint:
+                    for mode, task_index in done:
+                        self.tracker.mark_done(mode, task_index)
+            elif kind == 'complete':
+                del self.leases[lease.lease_id]
+                self._changed.notify_all()
+
+            return {'type': 'ok'}
+
+    def _reap(self):
+        """إعادة نطاقات الإيجارات المنتهية إلى قائمة الانتظار"""
+        now = time.monotonic()
+        for lease_id, lease in list(self.leases.items()):
+            if lease.deadline < now:
+                del self.leases[lease_id]
+                self.pending.appendleft((lease.start, lease.stop))
+                self.logger.warning(f"انتهت مهلة العامل {lease.worker}؛ إعادة توزيع النطاق "
+                                    f"[{lease.start}, {lease.stop})")
+
+    def run(self, total_tasks, progress_bar):
+        """
+        توزيع المهام وانتظار اكتمالها
+
+        المعلمات:
+            total_tasks (int): عدد المهام الكلي
+            progress_bar (tqdm): مؤشر التقدم الموحد
+        """
+        self.progress_bar = progress_bar
+
+        offset = 0
+        payload_count = len(self.fuzzer.payloads)
+        for mode, targets in self.fuzzer._task_space():
+            self.spans.append((mode, offset, len(targets) * payload_count))
+            offset += len(targets) * payload_count
+
+        # تتبع المهام المكتملة في نقطة الحفظ إن وجدت، وإلا في الذاكرة فقط
+        self.tracker = self.fuzzer.checkpoint
+        if self.tracker is None:
+            self.tracker = Checkpoint(None, None, [(mode, count) for mode, _, count in self.spans])
+
+        for start in range(0, total_tasks, self.lease_size):
+            stop = min(total_tasks, start + self.lease_size)
+            if self._remaining(start, stop):
+                self.pending.append((start, stop))
+
+        server = _CoordinatorServer(self.address, _CoordinatorHandler)
+        server.coordinator = self
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        host, port = server.server_address[:2]
+        self.logger.info(f"المنسق يستمع على {host}:{port} - بانتظار العمال "
+                         f"({len(self.pending)} نطاقات بحجم {self.lease_size})")
+
+        try:
+            with self._changed:
+                while self.pending or self.leases:
+                    self._changed.wait(1.0)
+                    self._reap()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class _RemoteChannel:
+    """قائمة انتظار بديلة لـ ShardChannel ترسل الدفعات إلى المنسق"""
+
+    def __init__(self, worker, fuzzer):
+        """تهيئة القناة"""
+        self.worker = worker
+        self.fuzzer = fuzzer
+        self._sent_hits = 0
+
+    def put(self, message):
+        """
+        إرسال دفعة ('batch', الإيجار، السجلات، نقاط الضعف، المهام المكتملة، لقطة المقاييس)
+        مع عدد نتائج ذاكرة الطلبات المعادة منذ الدفعة السابقة
+        """
+        _, lease_id, records, findings, done, metrics = message
+        hits = self.fuzzer.dedup.hits
+        self.worker.call({'type': 'results', 'lease': lease_id, 'records': records,
+                          'findings': findings, 'done': done, 'metrics': _encode_snapshot(metrics),
+                          'dedup_hits': hits - self._sent_hits})
+        self._sent_hits = hits
+
+
+class Worker:
+    """عامل يطلب نطاقات مهام من المنسق وينفذها بمشوش محلي"""
+
+    def __init__(self, address, token=None, overrides=None, worker_id=None, verbose=False):
+        """
+        تهيئة العامل
+
+        المعلمات:
+            address (str): عنوان المنسق بالشكل المضيف:المنفذ
+            token (str): الرمز المشترك مع المنسق
+            overrides (dict): وسائط محلية تستبدل وسائط المنسق (مثل threads و engine و concurrency)
+            worker_id (str): معرف العامل (الافتراضي اسم المضيف ورقم العملية)
+            verbose (bool): عرض معلومات تفصيلية
+        """
+        self.address = parse_address(address)
+        self.token = token
+        self.overrides = overrides or {}
+        self.worker_id = worker_id or f"{socket.gethostname()}:{id(self):x}"
+        self.logger = setup_logger("Worker", level=logging.DEBUG if verbose else logging.INFO)
+
+        self.lease_timeout = 60.0
+        self.abort = threading.Event()
+        self._socket = None
+        self._file = None
+        self._lock = threading.Lock()
+
+    def call(self, message):
+        """
+        إرسال رسالة إلى المنسق وانتظار الرد
+
+        العائد:
+            dict: الرد
+        """
+        message['worker'] = self.worker_id
+        data = json.dumps(message, ensure_ascii=False).encode('utf-8') + b"\n"
+        with self._lock:
+            self._socket.sendall(data)
+            line = self._file.readline()
+        if not line:
+            raise ConnectionError("أغلق المنسق الاتصال")
+        reply = json.loads(line)
+        if reply['type'] == 'revoked':
+            # تم تأجير النطاق الحالي لعامل آخر؛ التوقف عن سحب مهامه
+            self.abort.set()
+        elif reply['type'] == 'error':
+            raise ConnectionError(reply['message'])
+        return reply
+
+    def _build_fuzzer(self, config):
+        """إنشاء مشوش محلي من إعدادات المنسق"""
+        from urlget.fuzzer import HTTPFuzzer
+
+        options = dict(config['options'], **self.overrides)
+        if options['template'] is not None:
+            options['template'] = RequestTemplate.from_dict(options['template'])
+        fuzzer = HTTPFuzzer(**options)
+
+        state = dict(config['state'])
+        state['payloads'] = mutate(state['payloads'], options['mutations'])
+        state['baselines'] = {tuple(key): BaselineProfile.from_dict(profile)
+                              for key, profile in state['baselines']}
+        state['latencies'] = {tuple(key): LatencyProfile.from_dict(profile)
+                              for key, profile in state['latencies']}
+        state['progress'] = None
+        fuzzer.apply_shard_state(state)
+
+        if config['extra_signatures']:
+            fuzzer.matcher = SignatureMatcher(packs=options['signature_packs'],
+                                              extra_packs=config['extra_signatures'])
+        return fuzzer
+
+    def _heartbeat(self, lease_id, interval, stop):
+        """إرسال نبض دوري أثناء تنفيذ النطاق"""
+        while not stop.wait(interval):
+            self.call({'type': 'heartbeat', 'lease': lease_id})
+
+    def _run_lease(self, fuzzer, channel, lease):
+        """تنفيذ نطاق مؤجر واحد"""
+        lease_id = lease['lease']
+        skip = {tuple(item) for item in lease['skip']}
+        channel.shard_id = lease_id
+        self.abort.clear()
+
+        def tasks():
+            for task in fuzzer.iter_range(lease['start'], lease['stop']):
+                if self.abort.is_set():
+                    return
+                if (task['mode'], task['task_index']) not in skip:
+                    yield task
+
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat,
+                                     args=(lease_id, self.lease_timeout / 3, stop), daemon=True)
+        heartbeat.start()
+        try:
+            fuzzer.run_engine(tasks(), channel.completed, lease['stop'] - lease['start'] - len(skip))
+            channel.close()
+        finally:
+            stop.set()
+            heartbeat.join()
+
+        if not self.abort.is_set():
+            self.call({'type': 'complete', 'lease': lease_id})
+        self.logger.info(f"اكتمل النطاق [{lease['start']}, {lease['stop']})")
+
+    def run(self):
+        """الاتصال بالمنسق وتنفيذ النطاقات حتى اكتمال العملية"""
+        self._socket = socket.create_connection(self.address)
+        self._file = self._socket.makefile('rb')
+        try:
+            config = self.call({'type': 'hello', 'token': self.token})
+            self.lease_timeout = config['lease_timeout']
+            fuzzer = self._build_fuzzer(config)
+            channel = ShardChannel(_RemoteChannel(self, fuzzer), None, fuzzer)
+            fuzzer.results.sink = channel
+            self.logger.info(f"متصل بالمنسق {self.address[0]}:{self.address[1]} باسم {self.worker_id}")
+
+            while True:
+                reply = self.call({'type': 'lease'})
+                if reply['type'] == 'finished':
+                    break
+                if reply['type'] == 'wait':
+                    time.sleep(reply.get('retry', 1.0))
+                    continue
+                self._run_lease(fuzzer, channel, reply)
+
+            fuzzer.dedup.close()
+        finally:
+            self._file.close()
+            self._socket.close()
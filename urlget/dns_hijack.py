@@ -25,6 +25,7 @@ import dns.name
 from dnslib import DNSRecord, DNSHeader, DNSQuestion, RR, QTYPE, A, AAAA, MX, NS, TXT, SOA
 from dnslib.server import DNSServer, DNSHandler, BaseResolver
 
+from urlget.metrics import get_metrics
 from urlget.utils import setup_logger, check_linux, check_root, save_results
 
 class DNSHijacker:
@@ -64,6 +65,11 @@ class DNSHijacker:
             "errors": 0
         }
         
+        # مقاييس الاستعلامات وزمن الخادم الأصلي (تعرض عبر --metrics)
+        metrics = get_metrics()
+        self.query_metric = metrics.counter("dns_queries_total", "استعلامات DNS حسب النوع والنتيجة")
+        self.upstream_latency = metrics.histogram("dns_upstream_duration_seconds", "زمن إعادة توجيه الاستعلامات إلى الخادم الأصلي")
+        
         self.logger.info(f"تم تهيئة DNSHijacker على {self.ip}:{self.port}")
     
     def _get_interface_ip(self, interface):
@@ -166,6 +172,7 @@ class DNSHijacker:
                     self._add_record_to_reply(reply, qname, qtype, value)
                 
                 self.hijacker.stats["spoofed"] += 1
+                self.hijacker.query_metric.inc(qtype=qtype, result="spoofed")
                 self.hijacker.logger.info(f"تم اختطاف: {qname} {qtype}")
                 return reply
             
@@ -177,23 +184,28 @@ class DNSHijacker:
                             self._add_record_to_reply(reply, qname, qtype, value)
                         
                         self.hijacker.stats["spoofed"] += 1
+                        self.hijacker.query_metric.inc(qtype=qtype, result="spoofed")
                         self.hijacker.logger.info(f"تم اختطاف (نطاق فرعي): {qname} {qtype}")
                         return reply
             
             # إعادة توجيه الطلب إلى خادم DNS الأصلي
             try:
+                start_time = time.time()
                 upstream_query = dns.message.make_query(qname, dns.rdatatype.from_text(qtype))
                 upstream_response = dns.query.udp(upstream_query, self.upstream_resolver.nameservers[0], timeout=3)
+                self.hijacker.upstream_latency.observe(time.time() - start_time)
                 
                 # تحويل استجابة dns.message إلى DNSRecord
                 response_bytes = upstream_response.to_wire()
                 dnslib_response = DNSRecord.parse(response_bytes)
                 
                 self.hijacker.stats["forwarded"] += 1
+                self.hijacker.query_metric.inc(qtype=qtype, result="forwarded")
                 self.hijacker.logger.debug(f"تم إعادة توجيه: {qname} {qtype}")
                 return dnslib_response
             except Exception as e:
                 self.hijacker.stats["errors"] += 1
+                self.hijacker.query_metric.inc(qtype=qtype, result="error")
                 self.hijacker.logger.error(f"خطأ في إعادة توجيه طلب DNS: {e}")
                 return reply
         
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+محركات تنفيذ مهام الطلبات لأداة urlget
+"""
+
+import asyncio
+import threading
+from queue import Queue
+
+
+class ResponseSample:
+    """استجابة HTTP مستقلة عن المكتبة المستخدمة لإرسال الطلب"""
+
+    __slots__ = ('status_code', 'headers', 'content', 'encoding', 'total_bytes', 'content_length',
+                 'truncated', 'scan', 'elapsed')
+
+    def __init__(self, status_code, headers, content, encoding=None, total_bytes=None,
+                 truncated=False, scan=None, elapsed=None):
+        """
+        تهيئة عينة الاستجابة
+
+        المعلمات:
+            status_code (int): رمز الحالة
+            headers (CaseInsensitiveDict): رؤوس الاستجابة (البحث فيها لا يميز حالة الأحرف)
+            content (bytes): الجسم المقروء (قد يكون مقتطعًا)
+            encoding (str): ترميز الجسم (من الرأس أو ذاكرة ترميزات الناقل أو بداية الجسم)
+            total_bytes (int): العدد الحقيقي لبايتات الجسم المستلمة
+            truncated (bool): تم اقتطاع الجسم بسبب الحد الأقصى للحجم
+            scan (StreamScan): نتيجة الفحص التدريجي للجسم أثناء القراءة
+            elapsed (float): زمن الطلب على الشبكة بالثواني دون انتظار المتحكم وحد المضيف
+        """
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+        self.total_bytes = len(content) if total_bytes is None else total_bytes
+        self.truncated = truncated
+        self.scan = scan
+        self.elapsed = elapsed
+
+        content_length = headers.get('Content-Length') if headers else None
+        self.content_length = int(content_length) if content_length and content_length.isdigit() else None
+
+    @property
+    def text(self):
+        """نص الاستجابة بعد فك الترميز؛ الفحص يعمل على البايت، ويفك الترميز فقط لعرض نتيجة أو تحليل HTML"""
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+
+class ThreadEngine:
+    """محرك قائم على المواضيع مع قائمة انتظار محدودة الحجم"""
+
+    # علامة إيقاف العمال بعد نفاد المهام
+    _STOP = object()
+
+    def __init__(self, threads=10, queue_size=None, logger=None):
+        """
+        تهيئة المحرك
+
+        المعلمات:
+            threads (int): عدد مواضيع العمال
+            queue_size (int): سعة قائمة الانتظار (الافتراضي أربعة أضعاف عدد العمال)
+            logger (Logger): مسجل الأحداث للإبلاغ عن أخطاء المهام
+        """
+        self.threads = max(1, threads)
+        self.queue_size = queue_size or self.threads * 4
+        self.logger = logger
+        self._queue = None
+
+    def run(self, tasks, handler, on_complete=None):
+        """
+        تنفيذ المهام مع ضغط عكسي على المنتج
+
+        المعلمات:
+            tasks (iterable): المهام المراد تنفيذها، تُسحب عند الحاجة فقط
+            handler (callable): دالة لمعالجة مهمة واحدة
+            on_complete (callable): دالة تستدعى بعد اكتمال كل مهمة
+        """
+        queue = self._queue = Queue(maxsize=self.queue_size)
+
+        def worker():
+            while True:
+                task = queue.get()
+                if task is self._STOP:
+                    break
+                try:
+                    handler(task)
+                except Exception as e:
+                    if self.logger:
+                        self.logger.error(f"خطأ في معالجة المهمة: {str(e)}")
+                finally:
+                    if on_complete:
+                        on_complete(task)
+
+        workers = []
+        for _ in range(self.threads):
+            thread = threading.Thread(target=worker)
+            thread.daemon = True
+            thread.start()
+            workers.append(thread)
+
+        # المنتج يتوقف عند امتلاء قائمة الانتظار حتى يتفرغ أحد العمال
+        try:
+            for task in tasks:
+                queue.put(task)
+        finally:
+            for _ in workers:
+                queue.put(self._STOP)
+
+        for thread in workers:
+            thread.join()
+
+    def depth(self):
+        """عدد المهام في قائمة الانتظار بانتظار عامل متفرغ"""
+        return self._queue.qsize() if self._queue is not None else 0
+
+
+class _AsyncIterator:
+    """مكرر غير متزامن حول مكرر عادي لمشاركته بين الروتينات"""
+
+    def __init__(self, tasks):
+        self._iterator = iter(tasks)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            raise StopAsyncIteration from None
+
+
+class AsyncEngine:
+    """محرك asyncio يبقي آلاف الطلبات قيد التنفيذ على نواة واحدة"""
+
+    def __init__(self, concurrency=500, logger=None):
+        """
+        تهيئة المحرك
+
+        المعلمات:
+            concurrency (int): الحد الأقصى للطلبات المتزامنة
+            logger (Logger): مسجل الأحداث للإبلاغ عن أخطاء المهام
+        """
+        self.concurrency = max(1, concurrency)
+        self.logger = logger
+        self._in_flight = 0
+
+    async def run(self, tasks, handler, on_complete=None):
+        """
+        تنفيذ المهام باستخدام عدد ثابت من الروتينات المساعدة
+
+        المعلمات:
+            tasks (iterable): المهام المراد تنفيذها
+            handler (coroutine function): دالة غير متزامنة لمعالجة مهمة واحدة
+            on_complete (callable): دالة تستدعى بعد اكتمال كل مهمة
+        """
+        # مكرر مشترك بين جميع الروتينات؛ آمن لأن الحلقة تعمل في موضوع واحد
+        # المصادر غير المتزامنة (مثل HostScheduler) قد تنتظر حتى تتوفر مهمة دون إيقاف الحلقة
+        iterator = tasks if hasattr(tasks, '__aiter__') else _AsyncIterator(tasks)
+
+        async def worker():
+            async for task in iterator:
+                self._in_flight += 1
+                try:
+                    await handler(task)
+                except Exception as e:
+                    if self.logger:
+                        self.logger.error(f"خطأ في معالجة المهمة: {str(e)}")
+                finally:
+                    self._in_flight -= 1
+                # المهمة الملغاة عند المقاطعة لا تعتبر مكتملة، لذا لا يتم الوصول إلى هنا
+                if on_complete:
+                    on_complete(task)
+
+        await asyncio.gather(*[worker() for _ in range(self.concurrency)])
+
+    def depth(self):
+        """عدد المهام قيد التنفيذ حاليًا"""
+        return self._in_flight
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة بصمات الاستجابات والكشف التفاضلي عن الشذوذ لأداة urlget
+"""
+
+import zlib
+
+# عرض كل خانة عدّ في حساب simhash (يكفي حتى 65535 رمزًا فريدًا)
+_LANE_BITS = 16
+_LANE_MASK = (1 << _LANE_BITS) - 1
+
+# جدول يوزع بتات البايت على خانات عدّ منفصلة داخل عدد صحيح كبير
+_SPREAD = [sum(((value >> bit) & 1) << (bit * _LANE_BITS) for bit in range(8)) for value in range(256)]
+
+# الحد الأقصى للبايتات المستخدمة في حساب simhash
+SIMHASH_MAX_BYTES = 65536
+
+
+def simhash(body, max_bytes=SIMHASH_MAX_BYTES):
+    """
+    حساب simhash بطول 32 بت لكلمات الجسم
+
+    المعلمات:
+        body (bytes): جسم الاستجابة
+        max_bytes (int): عدد البايتات الأولى المستخدمة في الحساب
+
+    العائد:
+        int: البصمة
+    """
+    hashes = {zlib.crc32(token) for token in body[:max_bytes].split()}
+    if not hashes:
+        return 0
+
+    # جمع جميع البتات دفعة واحدة: كل بت من التجزئة يضاف إلى خانة العدّ الخاصة به
+    total = 0
+    for value in hashes:
+        total += (_SPREAD[value & 0xff]
+                  | _SPREAD[(value >> 8) & 0xff] << (8 * _LANE_BITS)
+                  | _SPREAD[(value >> 16) & 0xff] << (16 * _LANE_BITS)
+                  | _SPREAD[value >> 24] << (24 * _LANE_BITS))
+
+    fingerprint = 0
+    half = len(hashes)
+    for bit in range(32):
+        if ((total >> (bit * _LANE_BITS)) & _LANE_MASK) * 2 > half:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a, b):
+    """عدد البتات المختلفة بين بصمتين"""
+    return bin(a ^ b).count('1')
+
+
+class ResponseFingerprint:
+    """بصمة مختصرة لاستجابة HTTP"""
+
+    __slots__ = ('status', 'length', 'words', 'lines', 'simhash', 'header_hash')
+
+    def __init__(self, status, length, words, lines, simhash, header_hash):
+        """تهيئة البصمة"""
+        self.status = status
+        self.length = length
+        self.words = words
+        self.lines = lines
+        self.simhash = simhash
+        self.header_hash = header_hash
+
+    @classmethod
+    def from_response(cls, status, headers, body, length=None):
+        """
+        حساب بصمة من مكونات الاستجابة
+
+        المعلمات:
+            status (int): رمز الحالة
+            headers (dict): رؤوس الاستجابة
+            body (bytes): جسم الاستجابة (قد يكون مقتطعًا)
+            length (int): الطول الحقيقي للجسم إذا تم اقتطاعه
+
+        العائد:
+            ResponseFingerprint: البصمة
+        """
+        # مجموعة أسماء الرؤوس فقط، لأن قيمًا مثل Date تتغير في كل طلب
+        header_names = ",".join(sorted(name.lower() for name in headers))
+        return cls(
+            status,
+            len(body) if length is None else length,
+            len(body.split()),
+            body.count(b"\n") + 1 if body else 0,
+            simhash(body),
+            zlib.crc32(header_names.encode('latin-1', errors='replace')),
+        )
+
+    def to_dict(self):
+        """تحويل البصمة إلى قاموس"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        """إنشاء بصمة من قاموس to_dict"""
+        return cls(**data)
+
+
+def fingerprint_without(status, headers, body, length, literals):
+    """
+    حساب بصمة بعد حذف سلاسل منعكسة من الجسم
+
+    صفحات الخطأ ونتائج البحث تعرض المسار أو القيمة المرسلة؛ حذفها يجعل الطلبات
+    المختلفة في ذلك فقط متطابقة البصمة.
+
+    المعلمات:
+        status (int): رمز الحالة
+        headers (dict): رؤوس الاستجابة
+        body (bytes): جسم الاستجابة (قد يكون مقتطعًا)
+        length (int): الطول الحقيقي للجسم أو None
+        literals (iterable): سلاسل البايت المراد حذفها
+
+    العائد:
+        ResponseFingerprint: البصمة
+    """
+    removed = 0
+    for literal in literals:
+        count = body.count(literal) if literal else 0
+        if count:
+            body = body.replace(literal, b"")
+            removed += count * len(literal)
+    if length is not None:
+        length -= removed
+    return ResponseFingerprint.from_response(status, headers, body, length)
+
+
+class BaselineProfile:
+    """ملف أساسي لنقطة نهاية مبني من عدة عينات استجابة"""
+
+    def __init__(self, fingerprints, signatures=(), length_tolerance=0.1, simhash_threshold=6):
+        """
+        تهيئة الملف الأساسي
+
+        المعلمات:
+            fingerprints (list): بصمات الاستجابات الأساسية
+            signatures (iterable): أسماء تواقيع الأخطاء الظاهرة في الاستجابات الأساسية
+            length_tolerance (float): نسبة التغير المسموح بها في الطول وعدد الكلمات والأسطر
+            simhash_threshold (int): أقصى مسافة هامينغ تعتبر تشابهًا بعد طرح ضجيج الصفحة
+        """
+        self.fingerprints = list(fingerprints)
+        self.signatures = set(signatures)
+        self.length_tolerance = length_tolerance
+        self.base_threshold = simhash_threshold
+
+        self.statuses = {fp.status for fp in self.fingerprints}
+        self.header_hashes = {fp.header_hash for fp in self.fingerprints}
+        self.simhashes = [fp.simhash for fp in self.fingerprints]
+        self.ranges = {
+            name: (min(getattr(fp, name) for fp in self.fingerprints),
+                   max(getattr(fp, name) for fp in self.fingerprints))
+            for name in ('length', 'words', 'lines')
+        }
+
+        # الصفحات الديناميكية تختلف بين العينات نفسها؛ يضاف هذا الضجيج إلى العتبة
+        noise = max((hamming_distance(a, b) for a in self.simhashes for b in self.simhashes), default=0)
+        self.simhash_threshold = simhash_threshold + noise
+
+    def differences(self, fingerprint):
+        """
+        مقارنة بصمة بالملف الأساسي
+
+        الحمولة المنعكسة يجب حذفها من الجسم قبل حساب البصمة (fingerprint_without).
+
+        المعلمات:
+            fingerprint (ResponseFingerprint): بصمة الاستجابة المراد فحصها
+
+        العائد:
+            list: أسماء الخصائص المختلفة بشكل ملحوظ
+        """
+        reasons = []
+
+        if fingerprint.status not in self.statuses:
+            reasons.append('status')
+
+        for name, (low, high) in self.ranges.items():
+            value = getattr(fingerprint, name)
+            margin = max(int(high * self.length_tolerance), 2)
+            if value < low - margin or value > high + margin:
+                reasons.append(name)
+
+        if min(hamming_distance(fingerprint.simhash, h) for h in self.simhashes) > self.simhash_threshold:
+            reasons.append('simhash')
+
+        if fingerprint.header_hash not in self.header_hashes:
+            reasons.append('headers')
+
+        return reasons
+
+    def to_dict(self):
+        """تحويل الملف الأساسي إلى قاموس قابل للتحويل إلى JSON"""
+        return {
+            'fingerprints': [fp.to_dict() for fp in self.fingerprints],
+            'signatures': sorted(self.signatures),
+            'length_tolerance': self.length_tolerance,
+            'simhash_threshold': self.base_threshold,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """إنشاء ملف أساسي من قاموس to_dict"""
+        return cls([ResponseFingerprint.from_dict(fp) for fp in data['fingerprints']], data['signatures'],
+                   data['length_tolerance'], data['simhash_threshold'])
@@ -3,56 +3,205 @@
 
 import os
 import time
-import json
-import random
+import asyncio
 import logging
+import aiohttp
 import requests
 import threading
-from queue import Queue
-from urllib.parse import urlparse, parse_qs, urlencode
+from urllib.parse import urlparse, parse_qs
 from colorama import Fore, Style
 from tqdm import tqdm
 
+from urlget.signatures import SignatureMatcher
+from urlget.fingerprint import ResponseFingerprint, BaselineProfile, fingerprint_without
+from urlget.timing import LatencyProfile, TimingAnalyzer
+from urlget.results import ResultStore, FuzzRecord, open_sink
+from urlget.ratecontrol import AdaptiveController, THROTTLE_STATUSES
+from urlget.engine import AsyncEngine, ThreadEngine
+from urlget.checkpoint import Checkpoint, run_key
+from urlget.dedup import RequestCache, request_key
+from urlget.distributed import Coordinator
+from urlget.sharding import ShardPool, split_ranges
+from urlget.corpus import open_corpus
+from urlget.mutations import mutate, base_payloads, payload_origin
+from urlget.payloadstats import PayloadStats, ordered_front
+from urlget.jsonbody import JSONBody
+from urlget.charset import encode_variants, reflection_forms
+from urlget.transport import get_transport
+from urlget.metrics import get_metrics, RequestMetrics, estimate_request_bytes
 from urlget.utils import setup_logger
 
+# القيمة المستخدمة في نقاط حقن القالب عند التقاط الاستجابات الأساسية
+TEMPLATE_BASELINE_VALUE = "urlget"
+
 class HTTPFuzzer:
     """فئة للقوة الغاشمة والتشويش لطلبات HTTP"""
     
-    def __init__(self, url, method="GET", payloads_file=None, threads=10, verbose=False):
+    def __init__(self, url, method="GET", payloads_file=None, threads=10, engine="thread", concurrency=500, transport=None,
+                 signature_packs=None, signature_file=None, baseline_samples=3,
+                 results_file=None, adaptive=False, max_rate=None, max_retries=3,
+                 max_body=262144, body_mode="head", checkpoint=False, checkpoint_file=None, resume=False,
+                 dedup_cache=None, dedup_ttl=86400, processes=1, listen=None, lease_size=1000, token=None,
+                 template=None, mutations=None, timing_samples=10, timing_alpha=0.01, timing_retests=5, timing_delta=0.5,
+                 stop_after=0, payload_stats=None, json_body=None, matcher=None, dedup=None, verbose=False):
         """تهيئة المشوش"""
-        self.url = url
-        self.method = method.upper()
+        # في وضع القوالب يحدد القالب العنوان والطريقة ونقاط الحقن
+        self.template = template
+        self.url = url or template.url
+        self.method = (template.method if template is not None else method).upper()
         self.payloads_file = payloads_file
+        # سلاسل تحويلات الترميز المطبقة على كل حمولة (مثل "raw,url,double-url")
+        self.mutations = mutations
         self.threads = threads
+        self.engine = engine
+        self.concurrency = concurrency
+        self.transport = transport or get_transport()
+        self.baseline_samples = baseline_samples
+        self.max_retries = max_retries
         self.verbose = verbose
         
+        # عدد العمليات التي يقسم عليها فضاء المهام (1 للتنفيذ داخل العملية الحالية)
+        self.processes = max(1, processes)
+        
+        # وضع المنسق: توزيع نطاقات المهام على عمال عبر TCP بدلاً من تنفيذها محليًا
+        self.listen = listen
+        self.lease_size = lease_size
+        self.token = token
+        
+        # كشف التأخير الزمني: عدد الأزمنة الأساسية لكل نقطة نهاية (0 للتعطيل) وإعدادات الاختبار الإحصائي
+        self.timing_samples = timing_samples
+        self.timing_alpha = timing_alpha
+        self.timing_retests = timing_retests
+        self.timing_delta = timing_delta
+        self.timing = None
+        if timing_samples > 0:
+            self.timing = TimingAnalyzer(alpha=timing_alpha, max_samples=timing_retests + 1, min_delta=timing_delta)
+        
+        # التوقف المبكر: تخطي بقية حمولات نقطة الحقن بعد هذا العدد من نقاط الضعف المؤكدة (0 للتعطيل)
+        self.stop_after = stop_after
+        self.confirmed = {}
+        
+        # إحصائيات نجاح الحمولات بين العمليات لتقديم الأنجح منها (None للترتيب حسب الملف)
+        self.payload_stats = PayloadStats(payload_stats) if payload_stats else None
+        
+        # إعدادات تحتاجها العمليات الفرعية لإعادة بناء المشوش
+        self.signature_packs = signature_packs
+        self.signature_file = signature_file
+        self.adaptive = adaptive
+        self.max_rate = max_rate
+        self.dedup_cache = dedup_cache
+        self.dedup_ttl = dedup_ttl
+        
+        # الحد الأقصى لبايتات الجسم المقروءة لكل استجابة (0 بلا حد) وطريقة الاقتطاع
+        self.max_body = max_body
+        self.body_mode = body_mode
+        
+        # نقطة الحفظ اختيارية: مسار الملف (الافتراضي مشتق من بصمة العملية) والاستئناف منها
+        self.checkpoint_enabled = checkpoint or bool(checkpoint_file) or resume
+        self.checkpoint_file = checkpoint_file
+        self.resume = resume
+        self.checkpoint = None
+        
+        # ذاكرة نتائج الطلبات المتطابقة داخل العملية، واختياريًا بين العمليات عبر SQLite
+        # (تمرر ذاكرة قائمة لمشاركتها بين مشوشات عدة أهداف)
+        self.dedup = dedup if dedup is not None else RequestCache(dedup_cache, ttl=dedup_ttl)
+        
+        # متحكم AIMD في التزامن والمعدل والمهلة لكل مضيف
+        self.controller = None
+        if adaptive:
+            max_concurrency = concurrency if engine == "async" else threads
+            self.controller = AdaptiveController(
+                initial_concurrency=min(10, max_concurrency),
+                max_concurrency=max_concurrency,
+                max_rate=max_rate
+            )
+        
         # إعداد السجل
         self.logger = setup_logger("HTTPFuzzer", level=logging.DEBUG if verbose else logging.INFO)
         
+        # مقاييس الطلبات والنتائج (تحدث من العمال دون أقفال وتعرض عبر --metrics)
+        self.metrics = get_metrics()
+        self.request_metrics = RequestMetrics("fuzz", self.metrics)
+        self.dedup_hits = self.metrics.counter("dedup_hits_total", "الطلبات التي أعيد استخدام نتيجتها دون إرسال")
+        self.findings_metric = self.metrics.counter("findings_total", "نقاط الضعف المحتملة حسب وضع التشويش")
+        self.early_stopped = self.metrics.counter("early_stopped_tasks_total", "المهام المتخطاة بعد تأكيد نقطة الحقن")
+        
+        # مطابق تواقيع رسائل الخطأ (يتم تجميعه مرة واحدة، أو يمرر مطابق مجمع مسبقًا)
+        if matcher is not None:
+            self.matcher = matcher
+        elif signature_file:
+            self.matcher = SignatureMatcher.from_file(signature_file, packs=signature_packs)
+        else:
+            self.matcher = SignatureMatcher(packs=signature_packs)
+        
         # قوائم لتخزين البيانات
         self.payloads = []
-        self.results = []
         self.vulnerable_params = []
         
-        # قائمة انتظار للمعالجة المتوازية
-        self.queue = Queue()
+        # السجلات الكاملة تتدفق إلى القرص؛ تبقى الإحصائيات ونقاط الضعف فقط في الذاكرة
+        # يتم فتح الملف عند البدء لمعرفة ما إذا كانت العملية مستأنفة
+        self.results_file = results_file
+        self.results = ResultStore()
+        
+        # الملفات الأساسية وتوزيعات أزمنة الاستجابة لكل نقطة نهاية
+        self.baselines = {}
+        self.latencies = {}
+        
+        # قائمة برؤوس HTTP الشائعة للتشويش
+        self.headers_to_fuzz = [
+            "User-Agent", "Referer", "X-Forwarded-For", "Cookie",
+            "Authorization", "X-API-Key", "Content-Type"
+        ]
+        
+        # جسم JSON للتشويش (من ملف أو الافتراضي)؛ كل قيمة طرفية على أي عمق نقطة حقن
+        self.json_data = json_body if json_body is not None else {
+            "username": "user",
+            "password": "pass",
+            "email": "user@example.com",
+            "id": "1"
+        }
         
         # قفل للتزامن
         self.print_lock = threading.Lock()
         self.results_lock = threading.Lock()
+        self.progress_lock = threading.Lock()
+    
+    @property
+    def json_data(self):
+        """مستند JSON المشوش"""
+        return self._json_data
+    
+    @json_data.setter
+    def json_data(self, document):
+        # يسلسل المستند مرة واحدة عند تعيينه، وتبنى أجسام المهام بلصق الحمولة فقط
+        self._json_data = document
+        self.json_body = JSONBody(document)
     
     def load_payloads(self):
         """تحميل الحمولات من ملف أو استخدام الحمولات الافتراضية"""
         if self.payloads_file and os.path.exists(self.payloads_file):
             try:
-                with open(self.payloads_file, 'r', encoding='utf-8') as f:
-                    self.payloads = [line.strip() for line in f if line.strip()]
+                self.payloads = open_corpus(self.payloads_file)
                 self.logger.info(f"تم تحميل {len(self.payloads)} حمولة من الملف")
             except Exception as e:
                 self.logger.error(f"فشل في تحميل الحمولات من الملف: {str(e)}")
                 self._use_default_payloads()
         else:
             self._use_default_payloads()
+        
+        # تقديم الحمولات الأنجح في العمليات السابقة (على الخلفيات المحددة بـ --signatures إن وجدت)
+        if self.payload_stats is not None:
+            known = self.payload_stats.load()
+            self.payloads = self.payload_stats.order(self.payloads, self.signature_packs)
+            front = ordered_front(self.payloads)
+            if front:
+                self.logger.info(f"تقديم {len(front)} حمولة ناجحة سابقًا من إحصائيات {known} حمولة")
+        
+        # مرحلة المتغيرات: تحسب عند بناء كل مهمة، ويبقى عدد المهام معروفًا دون إنشائها
+        if self.mutations:
+            base_count = len(self.payloads)
+            self.payloads = mutate(self.payloads, self.mutations)
+            self.logger.info(f"توليد {len(self.payloads)} متغيرًا من {base_count} حمولة")
     
     def _use_default_payloads(self):
         """استخدام الحمولات الافتراضية"""
@@ -118,113 +267,541 @@ class HTTPFuzzer:
         
         return base_url, params
     
-    def worker(self):
-        """عامل لمعالجة الطلبات من قائمة الانتظار"""
-        while not self.queue.empty():
-            task = self.queue.get()
-            try:
-                self._process_task(task)
-            except Exception as e:
-                with self.print_lock:
-                    self.logger.error(f"خطأ في معالجة المهمة: {str(e)}")
-            finally:
-                self.queue.task_done()
+    def _new_scan(self, task):
+        """إنشاء فاحص تدريجي للتواقيع وانعكاس حمولة المهمة (أو سلاسلها الحرفية) بكل ترميز ظهر في استجابات المضيف"""
+        literals = task.get('literals')
+        if literals is None:
+            payload = task.get('payload', '')
+            literals = (payload,) if payload else ()
+        likely = self.transport.encodings.likely(task['url'])
+        return self.matcher.stream([variant for literal in literals for variant in encode_variants(literal, likely)])
     
-    def _process_task(self, task):
-        """معالجة مهمة واحدة (طلب HTTP)"""
+    def _send(self, task):
+        """إرسال طلب مهمة عبر الناقل المشترك وقراءة الجسم بشكل متدفق حتى الحد الأقصى"""
         url = task['url']
         method = task['method']
         params = task.get('params', {})
         data = task.get('data', {})
         headers = task.get('headers', {})
-        payload = task.get('payload', '')
-        param_name = task.get('param_name', '')
         
         try:
-            start_time = time.time()
-            
-            if method == "GET":
-                response = requests.get(url, params=params, headers=headers, timeout=10, allow_redirects=False)
-            elif method == "POST":
-                response = requests.post(url, params=params, data=data, headers=headers, timeout=10, allow_redirects=False)
-            elif method == "PUT":
-                response = requests.put(url, params=params, data=data, headers=headers, timeout=10, allow_redirects=False)
-            elif method == "DELETE":
-                response = requests.delete(url, params=params, headers=headers, timeout=10, allow_redirects=False)
-            else:
+            if method in ("GET", "DELETE"):
+                data = None
+            elif method not in ("POST", "PUT", "PATCH"):
                 with self.print_lock:
                     self.logger.warning(f"طريقة HTTP غير مدعومة: {method}")
-                return
+                return None
+            
+            sample = self.transport.fetch(method, url, self.controller, self.max_body, self.body_mode,
+                                          self._new_scan(task), params=params, data=data, headers=headers,
+                                          allow_redirects=False)
+        except requests.exceptions.RequestException as e:
+            self.request_metrics.error(e)
+            raise
+        
+        self.request_metrics.record(sample.status_code, sample.elapsed,
+                                    estimate_request_bytes(url, params, headers, data),
+                                    sample.total_bytes or 0, task.get('mode', 'baseline'))
+        return sample
+    
+    def _should_retry(self, response, attempt):
+        """إعادة المحاولة عند طلب الهدف تخفيف الضغط (فقط مع التحكم التكيفي)"""
+        return (self.controller is not None and attempt < self.max_retries
+                and response.status_code in THROTTLE_STATUSES)
+    
+    def _request_key(self, task):
+        """بصمة الطلب الفعلي الذي سترسله المهمة"""
+        method = task['method']
+        body = task.get('data') if method in ("POST", "PUT", "PATCH") else None
+        return request_key(method, task['url'], task.get('params'), task.get('headers'), body)
+    
+    def _replay_cached(self, task, key):
+        """تسجيل نتيجة طلب متطابق سابق بدلاً من إرساله مجددًا"""
+        verdict = self.dedup.get(key)
+        if verdict is None:
+            return False
+        self.dedup_hits.inc()
+        self._record_verdict(task, verdict, cached=True)
+        return True
+    
+    def _remember_verdict(self, key, verdict):
+        """تخزين نتيجة الطلب ما لم يكن الهدف قد طلب تخفيف الضغط"""
+        if verdict['status_code'] not in THROTTLE_STATUSES:
+            self.dedup.put(key, verdict)
+    
+    def _stopped(self, task):
+        """هل تم تأكيد نقطة حقن المهمة بالعدد المطلوب فتتخطى دون إرسال"""
+        if not self.stop_after or self.confirmed.get(task.get('param_name'), 0) < self.stop_after:
+            return False
+        self.early_stopped.inc(mode=task.get('mode', ''))
+        return True
+    
+    def _process_task(self, task):
+        """معالجة مهمة واحدة (طلب HTTP)"""
+        url = task['url']
+        
+        if self._stopped(task):
+            return
+        
+        key = self._request_key(task)
+        if self._replay_cached(task, key):
+            return
+        
+        try:
+            for attempt in range(self.max_retries + 1):
+                response = self._send(task)
+                if response is None:
+                    return
+                
+                if not self._should_retry(response, attempt):
+                    break
             
-            elapsed_time = time.time() - start_time
+            # إعادة الإرسال فقط إذا كان زمن الطلب مشتبهًا به وحتى يحسم الاختبار الإحصائي؛
+            # الأزمنة كلها زمن الشبكة الذي يقيسه الناقل، دون انتظار المتحكم أو حد المضيف
+            timing = self._timing_session(task, response.elapsed)
+            while timing is not None and timing.pending:
+                try:
+                    retest = self._send(task)
+                except requests.exceptions.RequestException:
+                    timing.abort()
+                    break
+                timing.add(retest.elapsed)
             
-            # تحليل الاستجابة
-            result = {
-                'url': url,
-                'method': method,
-                'param_name': param_name,
-                'payload': payload,
-                'status_code': response.status_code,
-                'response_time': elapsed_time,
-                'response_length': len(response.text),
-                'response_headers': dict(response.headers),
-            }
+            self._remember_verdict(key, self._handle_response(task, response, response.elapsed, timing))
+            
+        except requests.exceptions.Timeout:
+            with self.print_lock:
+                self.logger.warning(f"انتهت مهلة الطلب: {url}")
+        except requests.exceptions.RequestException as e:
+            with self.print_lock:
+                self.logger.error(f"خطأ في الطلب: {str(e)}")
+    
+    async def _send_async(self, session, task):
+        """إرسال طلب مهمة عبر الجلسة غير المتزامنة مع المتحكم التكيفي إن وجد"""
+        url = task['url']
+        method = task['method']
+        params = task.get('params', {})
+        data = task.get('data')
+        headers = task.get('headers', {})
+        
+        # لا يتم إرسال جسم مع GET و DELETE كما في محرك المواضيع
+        if method in ("GET", "DELETE"):
+            data = None
+        
+        timeout = None
+        host = urlparse(url).netloc
+        if self.controller is not None:
+            await self.controller.acquire_async(host)
+            timeout = self.controller.timeout(host)
+        
+        try:
+            response = await self.transport.fetch_async(session, method, url, self.max_body, self.body_mode,
+                                                        self._new_scan(task), timeout, params=params, data=data,
+                                                        headers=headers)
+        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+            self.request_metrics.error(e)
+            if self.controller is not None:
+                self.controller.release(host, error=True)
+            raise
+        
+        elapsed = response.elapsed
+        self.request_metrics.record(response.status_code, elapsed, estimate_request_bytes(url, params, headers, data),
+                                    response.total_bytes or 0, task.get('mode', 'baseline'))
+        if self.controller is not None:
+            self.controller.release(host, elapsed, response.status_code, response.headers)
+        return response
+    
+    async def _process_task_async(self, session, task):
+        """معالجة مهمة واحدة (طلب HTTP) ضمن محرك asyncio"""
+        url = task['url']
+        method = task['method']
+        
+        if method not in ("GET", "POST", "PUT", "PATCH", "DELETE"):
+            self.logger.warning(f"طريقة HTTP غير مدعومة: {method}")
+            return
+        
+        if self._stopped(task):
+            return
+        
+        key = self._request_key(task)
+        if self._replay_cached(task, key):
+            return
+        
+        try:
+            for attempt in range(self.max_retries + 1):
+                response = await self._send_async(session, task)
+                if not self._should_retry(response, attempt):
+                    break
+            
+            timing = self._timing_session(task, response.elapsed)
+            while timing is not None and timing.pending:
+                try:
+                    retest = await self._send_async(session, task)
+                except (asyncio.TimeoutError, aiohttp.ClientError):
+                    timing.abort()
+                    break
+                timing.add(retest.elapsed)
             
-            # التحقق من الاستجابة للبحث عن علامات الضعف
-            is_vulnerable = self._check_vulnerability(response, payload)
-            result['is_vulnerable'] = is_vulnerable
+            self._remember_verdict(key, self._handle_response(task, response, response.elapsed, timing))
             
+        except asyncio.TimeoutError:
+            self.logger.warning(f"انتهت مهلة الطلب: {url}")
+        except aiohttp.ClientError as e:
+            self.logger.error(f"خطأ في الطلب: {str(e)}")
+    
+    def _timing_session(self, task, elapsed_time):
+        """فحص أولي لزمن الطلب مقارنة بتوزيع نقطة النهاية؛ يعيد اختبارًا متسلسلًا إذا كان مشتبهًا به"""
+        if self.timing is None:
+            return None
+        profile = self.latencies.get(self._endpoint_key(task))
+        if profile is None:
+            return None
+        return self.timing.begin(profile, elapsed_time)
+    
+    def _handle_response(self, task, response, elapsed_time, timing=None):
+        """
+        تحليل استجابة طلب وتسجيل النتيجة ونقاط الضعف
+        
+        العائد:
+            dict: نتيجة الطلب بصيغة قابلة للتخزين في ذاكرة الطلبات
+        """
+        payload = task.get('payload', '')
+        
+        # التحقق من الاستجابة للبحث عن علامات الضعف (تم الفحص أثناء القراءة إن أمكن)
+        signature_hits = response.scan.hits if response.scan is not None else self.matcher.scan(response.content)
+        is_vulnerable = self._check_vulnerability(response, payload, signature_hits)
+        
+        # مقارنة بصمة الاستجابة بالملف الأساسي لنقطة النهاية لاستبعاد الإيجابيات الكاذبة
+        anomalies = []
+        fingerprint = None
+        baseline = self.baselines.get(self._endpoint_key(task))
+        if baseline is not None:
+            # الحمولة المنعكسة (كما هي أو مرمزة) تحذف قبل المقارنة؛ الانعكاس يفحص بشكل منفصل
+            fingerprint = fingerprint_without(response.status_code, response.headers, response.content,
+                                              response.total_bytes,
+                                              reflection_forms(payload, self.transport.encodings.likely(task['url'])))
+            anomalies = baseline.differences(fingerprint)
             if is_vulnerable:
-                with self.print_lock:
-                    print(f"{Fore.RED}[!] تم العثور على نقطة ضعف محتملة!{Style.RESET_ALL}")
-                    print(f"  URL: {url}")
-                    print(f"  المعلمة: {param_name}")
-                    print(f"  الحمولة: {payload}")
-                    print(f"  رمز الحالة: {response.status_code}")
-                    print(f"  وقت الاستجابة: {elapsed_time:.2f} ثانية")
-                    print(f"  طول الاستجابة: {len(response.text)} بايت")
-                
+                is_vulnerable = self._confirm_with_baseline(response, payload, signature_hits, baseline, anomalies)
+        
+        # تأخير مؤكد إحصائيًا مقارنة بأزمنة نقطة النهاية (حقن أعمى معتمد على الوقت)
+        if timing is not None:
+            self.logger.debug(f"اختبار التأخير لـ {task.get('param_name', '')}: p={timing.p_value:.4f} "
+                              f"بعد {len(timing.samples)} عينات")
+            if timing.confirmed:
+                is_vulnerable = True
+                anomalies.append('timing')
+        
+        verdict = {
+            'status_code': response.status_code,
+            'response_time': elapsed_time,
+            # الطول الحقيقي للجسم حتى لو تم اقتطاع المحتوى المحتفظ به
+            'response_length': response.total_bytes,
+            'content_length': response.content_length,
+            'retained_length': len(response.content),
+            'truncated': response.truncated,
+            'header_names': sorted(name.lower() for name in response.headers),
+            'is_vulnerable': is_vulnerable,
+            'signatures': [
+                {'name': hit.name, 'pack': hit.pack, 'start': hit.start, 'end': hit.end}
+                for hit in signature_hits
+            ],
+            'anomalies': anomalies,
+            'fingerprint': fingerprint.to_dict() if fingerprint is not None else None,
+            'timing': timing.to_dict() if timing is not None and timing.confirmed else None,
+        }
+        self._record_verdict(task, verdict)
+        return verdict
+    
+    def _observe_payload(self, payload_index, vulnerable, backends):
+        """تسجيل نتيجة الحمولة الأصلية في إحصائيات النجاح"""
+        if self.payload_stats is None or payload_index is None:
+            return
+        self.payload_stats.observe(payload_origin(self.payloads, payload_index), vulnerable, backends)
+    
+    def _record_verdict(self, task, verdict, cached=False):
+        """تسجيل نتيجة طلب (جديدة أو من ذاكرة الطلبات) في المخزن وقائمة نقاط الضعف"""
+        url = task['url']
+        payload = task.get('payload', '')
+        param_name = task.get('param_name', '')
+        
+        if verdict['is_vulnerable']:
+            with self.print_lock:
+                print(f"{Fore.RED}[!] تم العثور على نقطة ضعف محتملة!{Style.RESET_ALL}")
+                print(f"  URL: {url}")
+                print(f"  المعلمة: {param_name}")
+                print(f"  الحمولة: {payload}")
+                print(f"  رمز الحالة: {verdict['status_code']}")
+                print(f"  وقت الاستجابة: {verdict['response_time']:.2f} ثانية")
+                print(f"  طول الاستجابة: {verdict['response_length']} بايت")
+                if verdict['truncated']:
+                    print(f"  تم اقتطاع الجسم إلى {verdict['retained_length']} بايت (Content-Length: {verdict['content_length']})")
+                for hit in verdict['signatures']:
+                    print(f"  التوقيع: {hit['name']} ({hit['pack']}) عند البايت {hit['start']}")
+                timing = verdict.get('timing')
+                if timing:
+                    print(f"  تأخير زمني: {len(timing['samples'])} عينات مقابل وسيط أساسي "
+                          f"{timing['baseline_median']:.2f} ثانية (p={timing['p_value']:.4f})")
+                if cached:
+                    print(f"  المصدر: نتيجة طلب متطابق سابق")
+            
+            self.findings_metric.inc(mode=task.get('mode', ''))
+        
+        def commit():
+            if verdict['is_vulnerable']:
                 with self.results_lock:
                     self.vulnerable_params.append({
                         'param_name': param_name,
                         'payload': payload,
-                        'url': url
+                        'url': url,
+                        'status_code': verdict['status_code'],
+                        'response_time': verdict['response_time'],
+                        'response_length': verdict['response_length'],
+                        'content_length': verdict['content_length'],
+                        'truncated': verdict['truncated'],
+                        'signatures': verdict['signatures'],
+                        'timing': verdict.get('timing'),
+                        'cached': cached
                     })
+                    self._confirm(param_name)
             
-            with self.results_lock:
-                self.results.append(result)
-            
-        except requests.exceptions.Timeout:
-            with self.print_lock:
-                self.logger.warning(f"انتهت مهلة الطلب: {url}")
-        except requests.exceptions.RequestException as e:
-            with self.print_lock:
-                self.logger.error(f"خطأ في الطلب: {str(e)}")
+            self.results.add(FuzzRecord(
+                url, task['method'], param_name, task.get('payload_index'), verdict['status_code'],
+                verdict['response_time'], verdict['response_length'], verdict['content_length'],
+                self.results.intern_headers(verdict['header_names']), verdict['is_vulnerable'],
+                [hit['name'] for hit in verdict['signatures']], verdict['anomalies']
+            ))
+        
+        # النتيجة وتعليم المهمة كمكتملة معًا، فلا تحفظ نقطة الحفظ سجلًا لمهمة ستعاد عند الاستئناف
+        if self.checkpoint is not None:
+            self.checkpoint.mark_done(task['mode'], task['task_index'], commit)
+        else:
+            commit()
+        
+        # النتائج المعادة من ذاكرة الطلبات تحتسب في إحصائيات الحمولات كالنتائج الجديدة
+        self._observe_payload(task.get('payload_index'), verdict['is_vulnerable'],
+                              {hit['pack'] for hit in verdict['signatures']})
     
-    def _check_vulnerability(self, response, payload):
+    def _confirm(self, param_name):
+        """زيادة عدد نقاط الضعف المؤكدة لنقطة الحقن (تحت قفل النتائج)"""
+        count = self.confirmed.get(param_name, 0) + 1
+        self.confirmed[param_name] = count
+        if count == self.stop_after:
+            self.logger.info(f"تم تأكيد {param_name} {count} مرات، تخطي بقية حمولاته")
+    
+    def _check_vulnerability(self, response, payload, signature_hits=None):
         """التحقق من الاستجابة للبحث عن علامات الضعف"""
         # التحقق من وجود الحمولة في الاستجابة (انعكاس)
-        if payload in response.text:
+        if self._is_reflected(response, payload):
             return True
         
         # التحقق من رموز الحالة غير العادية
         if response.status_code >= 500:
             return True
         
-        # التحقق من رسائل الخطأ الشائعة
-        error_patterns = [
-            "SQL syntax", "mysql_fetch_array", "mysqli_fetch_array",
-            "ORA-", "Oracle error", "PostgreSQL ERROR",
-            "ODBC SQL Server Driver", "Microsoft SQL Native Client error",
-            "XPATH syntax error", "syntax error", "unclosed quotation mark",
-            "unterminated string", "error in your SQL syntax"
+        # التحقق من رسائل الخطأ الشائعة في تمريرة واحدة على الجسم
+        if signature_hits is None:
+            return self.matcher.search(response.content) is not None
+        return bool(signature_hits)
+    
+    def _confirm_with_baseline(self, response, payload, signature_hits, baseline, anomalies):
+        """تأكيد مؤشرات الضعف بمقارنتها بالاستجابات الأساسية"""
+        # ظهور توقيع خطأ لم يظهر في الاستجابات الأساسية
+        if any(hit.name not in baseline.signatures for hit in signature_hits):
+            return True
+        
+        # انعكاس الحمولة مع محارف HTML دون ترميز
+        if any(c in payload for c in '<>"\'') and self._is_reflected(response, payload):
+            return True
+        
+        # بقية المؤشرات تتطلب اختلافًا ملحوظًا عن الاستجابات الأساسية
+        return bool(anomalies)
+    
+    def _is_reflected(self, response, payload):
+        """التحقق من انعكاس الحمولة في الجسم، بما في ذلك الأجزاء التي لم يتم الاحتفاظ بها"""
+        # الفاحص لا يبحث إلا عن متغيرات ترميز الحمولة
+        if response.scan is not None:
+            return bool(response.scan.found)
+        return any(variant in response.content for variant in encode_variants(payload, (response.encoding,)))
+    
+    def _endpoint_key(self, task):
+        """مفتاح نقطة النهاية التي تنتمي إليها المهمة"""
+        # مهام القالب قد تحمل الحمولة في العنوان نفسه، لذا تحدد نقطة النهاية بالقالب
+        if 'endpoint' in task:
+            return task['endpoint']
+        return (task['method'], task['url'], 'data' in task)
+    
+    def _template_task(self, payload, point=None):
+        """بناء طلب من القالب بلصق الحمولة في نقاط الحقن (أو في قيمة جسم JSON واحدة)"""
+        url, headers, body = self.template.render(payload, point)
+        task = {
+            'url': url,
+            'method': self.template.method,
+            'headers': headers,
+            'endpoint': ('TEMPLATE', self.template.method, self.template.url),
+        }
+        if body is not None:
+            task['data'] = body
+        return task
+    
+    def _baseline_task(self, mode, base_url, params):
+        """إنشاء طلب بالقيم الأصلية لنقطة النهاية الخاصة بوضع التشويش"""
+        if mode == 'template':
+            # لا توجد قيمة أصلية في القالب؛ تستخدم قيمة عادية لا تحمل أي محارف خاصة
+            return self._template_task(TEMPLATE_BASELINE_VALUE)
+        if mode == 'json':
+            return {
+                'url': base_url,
+                'method': "POST",
+                'params': params,
+                'data': self.json_body.data,
+                'headers': {"Content-Type": "application/json"}
+            }
+        return {'url': base_url, 'method': self.method, 'params': params}
+    
+    def capture_baselines(self):
+        """التقاط عدة استجابات أساسية لكل نقطة نهاية قبل بدء التشويش"""
+        self.baselines = {}
+        self.latencies = {}
+        timing_samples = self.timing_samples if self.timing is not None else 0
+        samples = max(self.baseline_samples, timing_samples)
+        if samples <= 0:
+            return
+        
+        base_url, params = self.parse_url()
+        params = self._flat_params(params)
+        
+        for mode, targets in self._task_space():
+            if not targets:
+                continue
+            
+            task = self._baseline_task(mode, base_url, params)
+            key = self._endpoint_key(task)
+            if key in self.baselines:
+                continue
+            
+            fingerprints = []
+            signatures = set()
+            latencies = []
+            for i in range(samples):
+                try:
+                    response = self._send(task)
+                except requests.exceptions.RequestException as e:
+                    self.logger.warning(f"فشل في التقاط الاستجابة الأساسية: {str(e)}")
+                    break
+                if response is None:
+                    break
+                latencies.append(response.elapsed)
+                
+                # العينات الإضافية لتوزيع الأزمنة فقط؛ البصمات من العدد المحدد للمقارنة
+                if i < self.baseline_samples:
+                    fingerprints.append(ResponseFingerprint.from_response(response.status_code, response.headers,
+                                                                          response.content, response.total_bytes))
+                    signatures.update(hit.name for hit in response.scan.hits)
+            
+            if fingerprints:
+                self.baselines[key] = BaselineProfile(fingerprints, signatures)
+                self.logger.debug(f"تم التقاط {len(fingerprints)} استجابة أساسية لـ {task['method']} {base_url}")
+            
+            if timing_samples and len(latencies) >= min(timing_samples, 3):
+                self.latencies[key] = LatencyProfile(latencies)
+    
+    def _flat_params(self, params):
+        """تحويل معلمات parse_qs إلى قاموس بقيمة واحدة لكل معلمة"""
+        return {k: v[0] if isinstance(v, list) and len(v) > 0 else v for k, v in params.items()}
+    
+    def _task_space(self):
+        """
+        فضاء مهام التشويش بالترتيب
+        
+        العائد:
+            list: أزواج (الوضع، نقاط الحقن) حيث تمثل كل نقطة × كل حمولة مهمة واحدة
+        """
+        if self.template is not None:
+            if self.template.json_body is not None:
+                return [('template', self.template.json_body.paths)]
+            return [('template', [self.template.marker])]
+        
+        _, params = self.parse_url()
+        return [
+            ('params', list(params)),
+            ('headers', list(self.headers_to_fuzz)),
+            ('json', self.json_body.paths),
         ]
+    
+    def count_tasks(self):
+        """حساب العدد الكلي للمهام دون إنشائها"""
+        return sum(len(targets) for _, targets in self._task_space()) * len(self.payloads)
+    
+    def _build_task(self, mode, target, payload_index, base_url, params):
+        """إنشاء مهمة واحدة لنقطة حقن وحمولة محددتين"""
+        payload = self.payloads[payload_index]
+        
+        if mode == 'template':
+            if self.template.json_body is not None:
+                task = self._template_task(payload, target)
+                task.update(payload=payload, payload_index=payload_index, param_name=f"JSON:{target}")
+                return task
+            task = self._template_task(payload)
+            task.update(payload=payload, payload_index=payload_index, param_name=f"Template:{target}")
+            return task
+        
+        if mode == 'params':
+            # نسخ المعلمات الأصلية واستبدال قيمة المعلمة بالحمولة
+            new_params = dict(params)
+            new_params[target] = payload
+            return {
+                'url': base_url,
+                'method': self.method,
+                'params': new_params,
+                'payload': payload,
+                'payload_index': payload_index,
+                'param_name': target
+            }
+        
+        if mode == 'headers':
+            return {
+                'url': base_url,
+                'method': self.method,
+                'params': params,
+                'headers': {target: payload},
+                'payload': payload,
+                'payload_index': payload_index,
+                'param_name': f"Header:{target}"
+            }
+        
+        # لصق الحمولة مكان قيمة المسار في الجسم المسلسل مسبقًا
+        return {
+            'url': base_url,
+            'method': "POST",  # استخدام POST لبيانات JSON
+            'params': params,
+            'data': self.json_body.render(target, payload),
+            'headers': {"Content-Type": "application/json"},
+            'payload': payload,
+            'payload_index': payload_index,
+            'param_name': f"JSON:{target}"
+        }
+    
+    def _iter_mode(self, mode, targets, start=0, stop=None):
+        """مولد مهام وضع تشويش واحد دون الاحتفاظ بها في الذاكرة، مع تخطي المهام المكتملة عند الاستئناف"""
+        base_url, params = self.parse_url()
+        params = self._flat_params(params)
         
-        for pattern in error_patterns:
-            if pattern.lower() in response.text.lower():
-                return True
+        # فهرس المهمة داخل الوضع = فهرس نقطة الحقن × عدد الحمولات + فهرس الحمولة
+        payload_count = len(self.payloads)
+        total = len(targets) * payload_count
+        stop = total if stop is None else min(stop, total)
+        if self.checkpoint is not None:
+            start = max(start, self.checkpoint.cursor(mode))
         
-        return False
+        for task_index in range(start, stop):
+            if self.checkpoint is not None and self.checkpoint.is_done(mode, task_index):
+                continue
+            target = targets[task_index // payload_count]
+            task = self._build_task(mode, target, task_index % payload_count, base_url, params)
+            task['mode'] = mode
+            task['task_index'] = task_index
+            yield task
     
     def fuzz_params(self):
         """تشويش معلمات URL"""
@@ -235,95 +812,247 @@ class HTTPFuzzer:
             return
         
         self.logger.info(f"تشويش {len(params)} معلمات في عنوان URL")
-        
-        # إنشاء مهام للتشويش
-        for param_name in params:
-            for payload in self.payloads:
-                # نسخ المعلمات الأصلية
-                new_params = {k: v[0] if isinstance(v, list) and len(v) > 0 else v for k, v in params.items()}
-                
-                # استبدال قيمة المعلمة بالحمولة
-                new_params[param_name] = payload
-                
-                # إنشاء مهمة
-                task = {
-                    'url': base_url,
-                    'method': self.method,
-                    'params': new_params,
-                    'payload': payload,
-                    'param_name': param_name
-                }
-                
-                # إضافة المهمة إلى قائمة الانتظار
-                self.queue.put(task)
+        yield from self._iter_mode('params', list(params))
     
     def fuzz_headers(self):
         """تشويش رؤوس HTTP"""
-        base_url, params = self.parse_url()
+        self.logger.info(f"تشويش {len(self.headers_to_fuzz)} رؤوس HTTP")
+        yield from self._iter_mode('headers', self.headers_to_fuzz)
+    
+    def fuzz_json_body(self):
+        """تشويش جسم JSON"""
+        self.logger.info(f"تشويش {len(self.json_body)} قيم JSON {self.json_body.kind_counts()}")
+        yield from self._iter_mode('json', self.json_body.paths)
+    
+    def fuzz_template(self):
+        """تشويش نقاط الحقن في قالب الطلب"""
+        json_body = self.template.json_body
+        if json_body is not None:
+            self.logger.info(f"تشويش {len(json_body)} قيم JSON {json_body.kind_counts()} في جسم قالب "
+                             f"{self.template.method} {self.template.url}")
+        else:
+            self.logger.info(f"تشويش {self.template.injection_points} نقاط حقن في قالب {self.template.method} {self.template.url}")
+        yield from self._iter_mode('template', self._task_space()[0][1])
+    
+    def iter_tasks(self):
+        """مولد جميع مهام التشويش بالترتيب: المعلمات ثم الرؤوس ثم JSON (أو القالب فقط في وضع القوالب)"""
+        if self.template is not None:
+            yield from self.fuzz_template()
+            return
+        yield from self.fuzz_params()
+        yield from self.fuzz_headers()
+        yield from self.fuzz_json_body()
+    
+    def iter_range(self, start, stop):
+        """
+        مولد المهام ذات الفهارس العامة في النطاق [start, stop)
         
-        # قائمة برؤوس HTTP الشائعة للتشويش
-        headers_to_fuzz = [
-            "User-Agent", "Referer", "X-Forwarded-For", "Cookie",
-            "Authorization", "X-API-Key", "Content-Type"
-        ]
+        الفهرس العام يرقّم المهام بنفس ترتيب iter_tasks، لذا يمكن تقسيم الفضاء
+        على عدة عمليات أو عقد بنطاقات ثابتة دون تبادل المهام نفسها.
+        """
+        offset = 0
+        for mode, targets in self._task_space():
+            count = len(targets) * len(self.payloads)
+            low, high = max(start, offset), min(stop, offset + count)
+            if low < high:
+                yield from self._iter_mode(mode, targets, low - offset, high - offset)
+            offset += count
+    
+    def _on_task_complete(self, progress_bar):
+        """إنشاء دالة لتحديث مؤشر التقدم عند اكتمال كل مهمة"""
+        def on_complete(task):
+            if self.checkpoint is not None:
+                self.checkpoint.mark_done(task['mode'], task['task_index'])
+            with self.progress_lock:
+                progress_bar.update(1)
+        return on_complete
+    
+    def run_engine(self, tasks, on_complete, total_tasks):
+        """
+        تنفيذ المهام بالمحرك المحدد داخل العملية الحالية
         
-        self.logger.info(f"تشويش {len(headers_to_fuzz)} رؤوس HTTP")
+        المعلمات:
+            tasks (iterable): المهام المراد تنفيذها
+            on_complete (callable): دالة تستدعى بعد اكتمال كل مهمة
+            total_tasks (int): عدد المهام (لتحديد عدد المواضيع)
+        """
+        if self.engine == "async":
+            asyncio.run(self._run_async_engine(tasks, on_complete))
+        else:
+            engine = ThreadEngine(threads=min(self.threads, total_tasks), logger=self.logger)
+            self.metrics.gauge("queue_depth", "المهام بانتظار عامل متفرغ (أو قيد التنفيذ في محرك async)", engine.depth)
+            engine.run(tasks, self._process_task, on_complete=on_complete)
+    
+    async def _run_async_engine(self, tasks, on_complete):
+        """إنشاء الجلسة غير المتزامنة وتشغيل المحرك عليها"""
+        engine = AsyncEngine(concurrency=self.concurrency, logger=self.logger)
+        self.metrics.gauge("queue_depth", "المهام بانتظار عامل متفرغ (أو قيد التنفيذ في محرك async)", engine.depth)
         
-        # إنشاء مهام للتشويش
-        for header_name in headers_to_fuzz:
-            for payload in self.payloads:
-                # إنشاء رؤوس مخصصة
-                headers = {header_name: payload}
-                
-                # إنشاء مهمة
-                task = {
-                    'url': base_url,
-                    'method': self.method,
-                    'params': {k: v[0] if isinstance(v, list) and len(v) > 0 else v for k, v in params.items()},
-                    'headers': headers,
-                    'payload': payload,
-                    'param_name': f"Header:{header_name}"
-                }
-                
-                # إضافة المهمة إلى قائمة الانتظار
-                self.queue.put(task)
+        async with self.transport.async_session(self.concurrency) as session:
+            await engine.run(tasks, lambda task: self._process_task_async(session, task), on_complete=on_complete)
     
-    def fuzz_json_body(self):
-        """تشويش جسم JSON"""
-        base_url, params = self.parse_url()
+    def shard_options(self):
+        """
+        وسائط إنشاء نسخة مكافئة من المشوش في عملية أخرى
         
-        # بيانات JSON الافتراضية للتشويش
-        json_data = {
-            "username": "user",
-            "password": "pass",
-            "email": "user@example.com",
-            "id": "1"
+        العائد:
+            dict: وسائط HTTPFuzzer دون الملفات الخاصة بالعملية الرئيسية (النتائج ونقطة الحفظ)
+        """
+        return {
+            'url': self.url,
+            'method': self.method,
+            'payloads_file': self.payloads_file,
+            'mutations': self.mutations,
+            'threads': self.threads,
+            'engine': self.engine,
+            'concurrency': self.concurrency,
+            'signature_packs': self.signature_packs,
+            'signature_file': self.signature_file,
+            'baseline_samples': 0,
+            'adaptive': self.adaptive,
+            'max_rate': self.max_rate,
+            'max_retries': self.max_retries,
+            'max_body': self.max_body,
+            'body_mode': self.body_mode,
+            'checkpoint': False,
+            'dedup_cache': self.dedup_cache,
+            'dedup_ttl': self.dedup_ttl,
+            'template': self.template,
+            'timing_samples': self.timing_samples,
+            'timing_alpha': self.timing_alpha,
+            'timing_retests': self.timing_retests,
+            'timing_delta': self.timing_delta,
+            'stop_after': self.stop_after,
+            'verbose': self.verbose,
         }
+    
+    def shard_state(self):
+        """
+        الحالة المحسوبة في العملية الرئيسية التي تحتاجها العمليات الفرعية
         
-        self.logger.info(f"تشويش {len(json_data)} حقول JSON")
+        العائد:
+            dict: الحمولات، الملفات الأساسية، نقاط الحقن، وتقدم نقطة الحفظ
+        """
+        return {
+            'transport': self.transport.options(),
+            'payloads': self.payloads,
+            'baselines': self.baselines,
+            'latencies': self.latencies,
+            'headers_to_fuzz': self.headers_to_fuzz,
+            'json_data': self.json_data,
+            'progress': self.checkpoint.modes if self.checkpoint is not None else None,
+        }
+    
+    def apply_shard_state(self, state):
+        """تطبيق حالة العملية الرئيسية على مشوش داخل عملية فرعية"""
+        self.payloads = state['payloads']
+        self.baselines = state['baselines']
+        self.latencies = state['latencies']
+        self.headers_to_fuzz = state['headers_to_fuzz']
+        self.json_data = state['json_data']
+        if state['progress'] is not None:
+            # نسخة للقراءة فقط من التقدم لتخطي المهام المكتملة؛ لا تكتب إلى القرص
+            self.checkpoint = Checkpoint(None, None, [])
+            self.checkpoint.modes = state['progress']
+    
+    def merge_shard_batch(self, records, findings, done, progress_bar):
+        """
+        دمج دفعة نتائج من عملية فرعية في المخزن ونقطة الحفظ ومؤشر التقدم
         
-        # إنشاء مهام للتشويش
-        for field_name in json_data:
-            for payload in self.payloads:
-                # نسخ بيانات JSON الأصلية
-                new_json_data = json_data.copy()
-                
-                # استبدال قيمة الحقل بالحمولة
-                new_json_data[field_name] = payload
-                
-                # إنشاء مهمة
-                task = {
-                    'url': base_url,
-                    'method': "POST",  # استخدام POST لبيانات JSON
-                    'params': {k: v[0] if isinstance(v, list) and len(v) > 0 else v for k, v in params.items()},
-                    'data': json.dumps(new_json_data),
-                    'headers': {"Content-Type": "application/json"},
-                    'payload': payload,
-                    'param_name': f"JSON:{field_name}"
-                }
-                
-                # إضافة المهمة إلى قائمة الانتظار
-                self.queue.put(task)
+        المعلمات:
+            records (list): أزواج (قيم FuzzRecord، أسماء الرؤوس)
+            findings (list): نقاط الضعف الجديدة
+            done (list): أزواج (الوضع، فهرس المهمة) للمهام المكتملة
+            progress_bar (tqdm): مؤشر التقدم الموحد
+        """
+        def commit():
+            for values, header_names in records:
+                record = FuzzRecord(*values)
+                record.header_id = self.results.intern_headers(header_names)
+                self.results.add(record)
+            
+            if findings:
+                with self.results_lock:
+                    self.vulnerable_params.extend(findings)
+                    for finding in findings:
+                        self._confirm(finding['param_name'])
+        
+        if self.checkpoint is not None:
+            self.checkpoint.mark_all(done, commit)
+        else:
+            commit()
+        
+        if self.payload_stats is not None:
+            packs = self._signature_packs()
+            for values, _ in records:
+                record = FuzzRecord(*values)
+                self._observe_payload(record.payload_index, record.is_vulnerable,
+                                      {packs[name] for name in record.signatures if name in packs})
+        
+        progress_bar.update(len(done))
+    
+    def _signature_packs(self):
+        """حزمة كل توقيع باسمه (السجلات الواردة من العمليات الأخرى تحمل الأسماء فقط)"""
+        return {name: pack for name, pack, _ in self.matcher.signatures}
+    
+    def _run_processes(self, total_tasks, progress_bar):
+        """تقسيم فضاء المهام على عدة عمليات بنطاقات فهارس ثابتة ودمج نتائجها"""
+        ranges = split_ranges(total_tasks, self.processes)
+        self.logger.info(f"تقسيم {total_tasks} مهمة على {len(ranges)} عمليات")
+        
+        pool = ShardPool(logger=self.logger, metrics=self.metrics)
+        stats = pool.run(self.shard_options(), self.shard_state(), ranges,
+                         lambda records, findings, done: self.merge_shard_batch(records, findings, done, progress_bar))
+        self.dedup.hits += stats.get('dedup_hits', 0)
+    
+    def _run_key(self):
+        """بصمة العملية: الهدف ونقاط الحقن والحمولات"""
+        parts = [self.url, self.method, self._task_space(), self.json_data,
+                 self.payloads_file, len(self.payloads), self.mutations,
+                 self.template.to_dict() if self.template is not None else None]
+        # ترتيب الحمولات حسب الإحصائيات يغير فهارس المهام
+        front = ordered_front(base_payloads(self.payloads))
+        if front:
+            parts.append(front)
+        return run_key(*parts)
+    
+    def _open_checkpoint(self):
+        """
+        إنشاء نقطة الحفظ واستعادة التقدم والنتائج عند الاستئناف
+        
+        العائد:
+            bool: True إذا تم استئناف عملية سابقة
+        """
+        if not self.checkpoint_enabled:
+            return False
+        
+        key = self._run_key()
+        path = self.checkpoint_file or f"urlget-{key[:12]}.ckpt"
+        payload_count = len(self.payloads)
+        self.checkpoint = Checkpoint(path, key, [(mode, len(targets) * payload_count)
+                                                 for mode, targets in self._task_space()])
+        
+        if not self.resume:
+            return False
+        
+        if not self.checkpoint.load():
+            self.logger.warning(f"لا توجد نقطة حفظ مطابقة في {path}، سيتم البدء من جديد")
+            return False
+        
+        self.vulnerable_params = list(self.checkpoint.findings)
+        for finding in self.vulnerable_params:
+            self._confirm(finding['param_name'])
+        if self.checkpoint.results:
+            self.results.restore(self.checkpoint.results)
+        print(f"{Fore.CYAN}[*] استئناف من {path}: {self.checkpoint.completed()} مهمة مكتملة{Style.RESET_ALL}")
+        return True
+    
+    def _checkpoint_state(self):
+        """النتائج الحالية لحفظها مع نقطة الحفظ؛ تكتب السجلات إلى القرص أولاً حتى يطابقها العدد المحفوظ"""
+        self.results.flush()
+        with self.results_lock:
+            findings = list(self.vulnerable_params)
+        return {'findings': findings, 'results': self.results.state()}
     
     def start(self):
         """بدء عملية التشويش"""
@@ -332,44 +1061,69 @@ class HTTPFuzzer:
         # تحميل الحمولات
         self.load_payloads()
         
-        # إنشاء مهام التشويش
-        self.fuzz_params()
-        self.fuzz_headers()
-        self.fuzz_json_body()
+        # استعادة التقدم من نقطة الحفظ ثم فتح ملف النتائج (بالإضافة عند الاستئناف)
+        resumed = self._open_checkpoint()
+        self.results.sink = open_sink(self.results_file, append=resumed)
+        if resumed and self.results.sink is not None:
+            # السجلات المكتوبة بعد آخر نقطة حفظ تعاد كتابتها عند إعادة مهامها
+            self.results.sink.truncate(len(self.results))
         
-        total_tasks = self.queue.qsize()
+        # التقاط الاستجابات الأساسية لكل نقطة نهاية
+        self.capture_baselines()
+        
+        # حساب عدد المهام مسبقًا؛ يتم إنشاء المهام لاحقًا عند الحاجة فقط
+        total_tasks = self.count_tasks()
         print(f"{Fore.CYAN}[*] تم إنشاء {total_tasks} مهمة للتشويش{Style.RESET_ALL}")
         
         if total_tasks == 0:
             print(f"{Fore.YELLOW}[!] لم يتم إنشاء أي مهام للتشويش. تأكد من أن عنوان URL يحتوي على معلمات.{Style.RESET_ALL}")
+            self.results.close()
+            self.dedup.close()
             return
         
         # إنشاء مؤشر التقدم
-        progress_bar = tqdm(total=total_tasks, desc="التقدم", unit="طلب")
-        
-        # إنشاء مواضيع العمال
-        threads = []
-        for _ in range(min(self.threads, total_tasks)):
-            thread = threading.Thread(target=self.worker)
-            thread.daemon = True
-            thread.start()
-            threads.append(thread)
-        
-        # تحديث مؤشر التقدم
-        while not self.queue.empty():
-            completed = total_tasks - self.queue.qsize()
-            progress_bar.n = completed
-            progress_bar.refresh()
-            time.sleep(0.1)
-        
-        # انتظار اكتمال جميع المهام
-        self.queue.join()
-        progress_bar.close()
+        completed = self.checkpoint.completed() if self.checkpoint is not None else 0
+        progress_bar = tqdm(total=total_tasks, initial=completed, desc="التقدم", unit="طلب")
+        self.metrics.gauge("tasks_total", "عدد مهام التشويش", lambda: total_tasks)
+        self.metrics.gauge("tasks_completed", "مهام التشويش المكتملة (بما فيها المستأنفة)", lambda: progress_bar.n)
+        
+        if self.checkpoint is not None:
+            self.checkpoint.start(self._checkpoint_state)
+        
+        finished = False
+        try:
+            if self.listen:
+                Coordinator(self, self.listen, self.lease_size, token=self.token).run(total_tasks, progress_bar)
+            elif self.processes > 1:
+                self._run_processes(total_tasks, progress_bar)
+            else:
+                self.run_engine(self.iter_tasks(), self._on_task_complete(progress_bar), total_tasks - completed)
+            finished = True
+        finally:
+            # عند المقاطعة تكتب الحالة الأخيرة ليتم الاستئناف منها؛ وعند الاكتمال يحذف الملف
+            if self.checkpoint is not None:
+                self.checkpoint.close(remove=finished)
+            progress_bar.close()
+            self.results.close()
+            self.dedup.close()
+        
+        # الإحصائيات تحفظ عند الاكتمال فقط حتى يبقى ترتيب الحمولات ثابتًا بين المقاطعة والاستئناف
+        if self.payload_stats is not None:
+            self.payload_stats.save()
         
         # عرض النتائج
+        summary = self.results.summary()
         print(f"\n{Fore.GREEN}[+] اكتمل التشويش!{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}[*] تم اختبار {len(self.results)} طلبات{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}[*] تم اختبار {len(self.results)} طلبات ({self.dedup.hits} منها من نتائج طلبات متطابقة دون إرسال){Style.RESET_ALL}")
+        print(f"{Fore.CYAN}[*] رموز الحالة: {summary['status_counts']} - متوسط وقت الاستجابة: {summary['avg_time']:.2f} ثانية{Style.RESET_ALL}")
+        quantiles = self.metrics.quantiles("http_request_duration_seconds")
+        if quantiles:
+            print(f"{Fore.CYAN}[*] زمن الاستجابة: p50 {quantiles[0.5]:.3f} - p95 {quantiles[0.95]:.3f} - "
+                  f"p99 {quantiles[0.99]:.3f} ثانية{Style.RESET_ALL}")
         print(f"{Fore.CYAN}[*] تم العثور على {len(self.vulnerable_params)} نقاط ضعف محتملة{Style.RESET_ALL}")
+        skipped = self.metrics.total("early_stopped_tasks_total")
+        if skipped:
+            print(f"{Fore.CYAN}[*] تم تخطي {skipped} مهمة بعد تأكيد نقاط الحقن (--stop-after {self.stop_after}){Style.RESET_ALL}")
         
         if self.vulnerable_params:
             print(f"\n{Fore.YELLOW}[!] نقاط الضعف المحتملة:{Style.RESET_ALL}")
@@ -381,5 +1135,6 @@ class HTTPFuzzer:
         
         return {
             'total_requests': len(self.results),
+            'summary': summary,
             'vulnerable_params': self.vulnerable_params
         }
\ No newline at end of file
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة تشويش أجسام JSON المتداخلة بلصق الحمولة في مواضع القيم المسلسلة مسبقًا لأداة urlget
+"""
+
+import re
+import json
+
+# المفاتيح التي تكتب في المسار بصيغة .key؛ غيرها يكتب بصيغة ["key"] حتى تبقى الأسماء فريدة
+_PLAIN_KEY = re.compile(r'^[A-Za-z_][A-Za-z0-9_\-]*$')
+
+
+def _kind(value):
+    """نوع القيمة في JSON"""
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'boolean'
+    if isinstance(value, (int, float)):
+        return 'number'
+    if isinstance(value, str):
+        return 'string'
+    return 'object' if isinstance(value, dict) else 'array'
+
+
+def _path_name(path):
+    """
+    اسم مقروء لمسار قيمة، مثل user.addresses[0].city
+
+    المعلمات:
+        path (tuple): المفاتيح والفهارس من الجذر
+
+    العائد:
+        str: الاسم ($ للجذر)
+    """
+    parts = []
+    for step in path:
+        if isinstance(step, int):
+            parts.append(f"[{step}]")
+        elif _PLAIN_KEY.match(step):
+            parts.append(f".{step}" if parts else step)
+        else:
+            parts.append(f"[{json.dumps(step)}]")
+    return "".join(parts) or "$"
+
+
+def load_json_body(path):
+    """
+    تحميل جسم JSON من ملف
+
+    المعلمات:
+        path (str): مسار الملف
+
+    العائد:
+        object: المستند
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class JSONBody:
+    """مستند JSON يسلسل مرة واحدة مع موضع كل قيمة طرفية؛ كل نسخة تبنى بلصق الحمولة مكان قيمة واحدة"""
+
+    def __init__(self, document):
+        """
+        تسلسل المستند وجمع نقاط الحقن
+
+        القيم الطرفية هي القيم البسيطة (سلسلة، رقم، منطقية، null) والكائنات والمصفوفات
+        الفارغة، على أي عمق داخل الكائنات والمصفوفات.
+
+        المعلمات:
+            document (object): المستند (قاموس أو قائمة أو قيمة بسيطة)
+        """
+        self.document = document
+        self.paths = []
+        self.kinds = []
+        self._spans = []
+        self._parts = []
+        self._length = 0
+        self._walk(document, ())
+        # ensure_ascii يجعل كل محرف بايتًا واحدًا، فتطابق المواضع المحسوبة على النص مواضع البايت
+        self.data = "".join(self._parts).encode('ascii')
+        self._parts = None
+        self._view = memoryview(self.data)
+        self._index = {name: i for i, name in enumerate(self.paths)}
+
+    def _emit(self, text):
+        """إضافة نص إلى التسلسل"""
+        self._parts.append(text)
+        self._length += len(text)
+
+    def _walk(self, value, path):
+        """تسلسل القيمة بنفس صيغة json.dumps مع تسجيل مواضع القيم الطرفية"""
+        if isinstance(value, dict) and value:
+            self._emit('{')
+            for n, (key, item) in enumerate(value.items()):
+                if n:
+                    self._emit(', ')
+                self._emit(json.dumps(str(key)) + ': ')
+                self._walk(item, path + (str(key),))
+            self._emit('}')
+        elif isinstance(value, list) and value:
+            self._emit('[')
+            for n, item in enumerate(value):
+                if n:
+                    self._emit(', ')
+                self._walk(item, path + (n,))
+            self._emit(']')
+        elif not path and isinstance(value, (dict, list)):
+            # مستند فارغ لا يحتوي على نقاط حقن
+            self._emit(json.dumps(value))
+        else:
+            start = self._length
+            self._emit(json.dumps(value))
+            self._spans.append((start, self._length))
+            self.paths.append(_path_name(path))
+            self.kinds.append(_kind(value))
+
+    def __len__(self):
+        return len(self.paths)
+
+    def kind_counts(self):
+        """
+        عدد نقاط الحقن لكل نوع قيمة
+
+        العائد:
+            dict: {النوع: العدد}
+        """
+        counts = {}
+        for kind in self.kinds:
+            counts[kind] = counts.get(kind, 0) + 1
+        return counts
+
+    def render(self, name, payload):
+        """
+        بناء الجسم مع استبدال قيمة واحدة بالحمولة كسلسلة JSON
+
+        المعلمات:
+            name (str): اسم مسار القيمة من paths
+            payload (str): الحمولة
+
+        العائد:
+            bytes: الجسم
+        """
+        start, end = self._spans[self._index[name]]
+        return b"".join((self._view[:start], json.dumps(payload).encode('ascii'), self._view[end:]))
@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة سجل المقاييس ونقطة عرضها بصيغة Prometheus لأداة urlget
+"""
+
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from urlget.utils import parse_address
+
+# حدود خانات مدرج زمن الاستجابة بالثواني
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# الكميات المحسوبة من المدرجات وتعرض مع كل مدرج
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def _label_key(labels):
+    """تحويل التسميات إلى مفتاح ثابت الترتيب"""
+    return tuple(sorted(labels.items())) if labels else ()
+
+
+def _escape(value):
+    """تهريب قيمة تسمية حسب صيغة Prometheus"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(pairs):
+    """تنسيق التسميات بصيغة Prometheus"""
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def histogram_quantile(buckets, counts, q):
+    """
+    تقدير كمية من خانات مدرج بالاستيفاء الخطي داخل الخانة
+
+    المعلمات:
+        buckets (tuple): حدود الخانات
+        counts (list): عدد القيم في كل خانة (الأخيرة للقيم الأكبر من آخر حد)
+        q (float): الكمية المطلوبة بين 0 و 1
+
+    العائد:
+        float: القيمة المقدرة أو None إذا لم توجد قيم
+    """
+    total = sum(counts)
+    if not total:
+        return None
+
+    rank = q * total
+    seen = 0
+    for i, count in enumerate(counts):
+        if seen + count >= rank and count:
+            if i >= len(buckets):
+                return buckets[-1]
+            low = buckets[i - 1] if i else 0.0
+            return low + (buckets[i] - low) * (rank - seen) / count
+        seen += count
+    return buckets[-1]
+
+
+class _Shard:
+    """قيم المقاييس لموضوع واحد؛ يكتب فيها موضوعها فقط"""
+
+    __slots__ = ('counters', 'histograms')
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+
+
+class Counter:
+    """عداد تراكمي بتسميات اختيارية"""
+
+    def __init__(self, registry, name, help_text):
+        """تهيئة العداد"""
+        self.registry = registry
+        self.name = name
+        self.help = help_text
+
+    def inc(self, value=1, **labels):
+        """زيادة العداد في جزء الموضوع الحالي دون أقفال"""
+        counters = self.registry._shard().counters
+        key = (self.name, _label_key(labels))
+        counters[key] = counters.get(key, 0) + value
+
+
+class Histogram:
+    """مدرج بخانات ثابتة تحسب منه الكميات عند العرض"""
+
+    def __init__(self, registry, name, help_text, buckets=LATENCY_BUCKETS):
+        """تهيئة المدرج"""
+        self.registry = registry
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        """إضافة قيمة في جزء الموضوع الحالي دون أقفال"""
+        histograms = self.registry._shard().histograms
+        key = (self.name, _label_key(labels))
+        values = histograms.get(key)
+        if values is None:
+            # عدد لكل خانة، ثم خانة ما فوق آخر حد، ثم المجموع
+            values = histograms[key] = [0] * (len(self.buckets) + 2)
+        values[bisect_left(self.buckets, value)] += 1
+        values[-1] += value
+
+
+class MetricsRegistry:
+    """سجل مقاييس مقسم حسب الموضوع: كل عامل يكتب في جزئه، وتدمج الأجزاء عند القراءة فقط"""
+
+    def __init__(self, namespace="urlget"):
+        """
+        تهيئة السجل
+
+        المعلمات:
+            namespace (str): بادئة أسماء المقاييس
+        """
+        self.namespace = namespace
+        self._metrics = {}
+        self._gauges = {}
+        self._shards = []
+        self._remote = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _shard(self):
+        """جزء الموضوع الحالي (ينشأ مرة واحدة لكل موضوع)"""
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def counter(self, name, help_text):
+        """تعريف عداد (أو إعادة العداد المعرف بنفس الاسم)"""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = Counter(self, name, help_text)
+            return metric
+
+    def histogram(self, name, help_text, buckets=LATENCY_BUCKETS):
+        """تعريف مدرج (أو إعادة المدرج المعرف بنفس الاسم)"""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = Histogram(self, name, help_text, buckets)
+            return metric
+
+    def gauge(self, name, help_text, func):
+        """
+        تعريف مقياس لحظي تحسب قيمته عند القراءة
+
+        المعلمات:
+            name (str): اسم المقياس
+            help_text (str): الوصف
+            func (callable): دالة تعيد القيمة الحالية (تستبدل الدالة السابقة بنفس الاسم)
+        """
+        with self._lock:
+            self._gauges[name] = (help_text, func)
+
+    def snapshot(self):
+        """
+        دمج أجزاء المواضيع والعمليات الأخرى في قيم تراكمية
+
+        العائد:
+            dict: {'counters': {...}, 'histograms': {...}} بمفاتيح (الاسم، التسميات)
+        """
+        with self._lock:
+            shards = list(self._shards)
+            remote = list(self._remote.values())
+
+        counters = {}
+        histograms = {}
+        sources = [(shard.counters, shard.histograms) for shard in shards]
+        sources.extend((snap['counters'], snap['histograms']) for snap in remote)
+        for shard_counters, shard_histograms in sources:
+            for key, value in list(shard_counters.items()):
+                counters[key] = counters.get(key, 0) + value
+            for key, values in list(shard_histograms.items()):
+                merged = histograms.get(key)
+                if merged is None:
+                    histograms[key] = list(values)
+                else:
+                    for i, value in enumerate(values):
+                        merged[i] += value
+        return {'counters': counters, 'histograms': histograms}
+
+    def merge_remote(self, source, snapshot):
+        """
+        استبدال آخر لقطة من مصدر خارجي (مثل عملية فرعية)
+
+        المعلمات:
+            source: معرف المصدر
+            snapshot (dict): لقطة تراكمية من snapshot في ذلك المصدر
+        """
+        with self._lock:
+            self._remote[source] = snapshot
+
+    def total(self, name, snapshot=None):
+        """مجموع عداد عبر جميع التسميات"""
+        snapshot = snapshot or self.snapshot()
+        return sum(value for (metric, _), value in snapshot['counters'].items() if metric == name)
+
+    def quantiles(self, name, snapshot=None):
+        """
+        كميات مدرج مدمجة عبر جميع التسميات
+
+        العائد:
+            dict: {الكمية: القيمة} أو قاموس فارغ إذا لم توجد قيم
+        """
+        snapshot = snapshot or self.snapshot()
+        metric = self._metrics.get(name)
+        merged = None
+        for (metric_name, _), values in snapshot['histograms'].items():
+            if metric_name != name:
+                continue
+            merged = list(values) if merged is None else [a + b for a, b in zip(merged, values)]
+        if metric is None or merged is None:
+            return {}
+        return {q: histogram_quantile(metric.buckets, merged[:-1], q) for q in QUANTILES}
+
+    def render(self):
+        """
+        عرض المقاييس بصيغة Prometheus النصية
+
+        العائد:
+            str: النص
+        """
+        snapshot = self.snapshot()
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+            gauges = list(self._gauges.items())
+
+        for metric in metrics:
+            full_name = f"{self.namespace}_{metric.name}"
+            lines.append(f"# HELP {full_name} {metric.help}")
+
+            if isinstance(metric, Counter):
+                lines.append(f"# TYPE {full_name} counter")
+                for (name, labels), value in sorted(snapshot['counters'].items()):
+                    if name == metric.name:
+                        lines.append(f"{full_name}{_format_labels(labels)} {value}")
+                continue
+
+            lines.append(f"# TYPE {full_name} histogram")
+            quantile_lines = []
+            for (name, labels), values in sorted(snapshot['histograms'].items()):
+                if name != metric.name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(metric.buckets + ('+Inf',), values[:-1]):
+                    cumulative += count
+                    lines.append(f"{full_name}_bucket{_format_labels(labels + (('le', bound),))} {cumulative}")
+                lines.append(f"{full_name}_sum{_format_labels(labels)} {values[-1]}")
+                lines.append(f"{full_name}_count{_format_labels(labels)} {cumulative}")
+                for q in QUANTILES:
+                    value = histogram_quantile(metric.buckets, values[:-1], q)
+                    if value is not None:
+                        quantile_lines.append(f"{full_name}_quantile{_format_labels(labels + (('quantile', q),))} {value}")
+
+            # p50/p95/p99 مقدرة من الخانات لمن لا يستخدم histogram_quantile في Prometheus
+            if quantile_lines:
+                lines.append(f"# HELP {full_name}_quantile {metric.help} (كميات مقدرة)")
+                lines.append(f"# TYPE {full_name}_quantile gauge")
+                lines.extend(quantile_lines)
+
+        for name, (help_text, func) in gauges:
+            try:
+                value = func()
+            except Exception:
+                continue
+            full_name = f"{self.namespace}_{name}"
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} gauge")
+            lines.append(f"{full_name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """معالج طلبات نقطة المقاييس"""
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = self.server.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # طلبات الجمع الدورية لا تسجل
+        pass
+
+
+class MetricsServer(ThreadingHTTPServer):
+    """خادم HTTP محلي يعرض المقاييس في موضوع خلفي"""
+
+    daemon_threads = True
+
+    def __init__(self, address, registry):
+        """
+        تهيئة الخادم
+
+        المعلمات:
+            address (tuple): (المضيف، المنفذ)
+            registry (MetricsRegistry): سجل المقاييس
+        """
+        super().__init__(address, _MetricsHandler)
+        self.registry = registry
+        self._thread = None
+
+    def start(self):
+        """بدء الخدمة في موضوع خلفي"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """إيقاف الخدمة"""
+        self.shutdown()
+        self.server_close()
+
+
+# السجل المشترك بين جميع وحدات العملية
+_shared_registry = None
+_shared_lock = threading.Lock()
+
+
+def get_metrics():
+    """
+    الحصول على سجل المقاييس المشترك
+
+    العائد:
+        MetricsRegistry: السجل
+    """
+    global _shared_registry
+    with _shared_lock:
+        if _shared_registry is None:
+            _shared_registry = MetricsRegistry()
+        return _shared_registry
+
+
+def serve_metrics(address, registry=None):
+    """
+    تشغيل نقطة المقاييس بصيغة Prometheus
+
+    المعلمات:
+        address (str): "المضيف:المنفذ" أو ":المنفذ" (الافتراضي 127.0.0.1)
+        registry (MetricsRegistry): السجل (الافتراضي السجل المشترك)
+
+    العائد:
+        MetricsServer: الخادم قيد التشغيل
+    """
+    return MetricsServer(parse_address(address), registry or get_metrics()).start()
+
+
+def estimate_request_bytes(url, params=None, headers=None, data=None):
+    """
+    تقدير تقريبي لحجم الطلب المرسل دون إعادة ترميزه
+
+    المعلمات:
+        url (str): العنوان
+        params (dict): معلمات الاستعلام
+        headers (dict): الرؤوس
+        data (str|bytes|dict): الجسم
+
+    العائد:
+        int: عدد البايتات التقريبي
+    """
+    size = len(url)
+    if params:
+        size += sum(len(str(name)) + len(str(value)) + 2 for name, value in params.items())
+    if headers:
+        size += sum(len(name) + len(str(value)) + 4 for name, value in headers.items())
+    if isinstance(data, dict):
+        size += sum(len(str(name)) + len(str(value)) + 2 for name, value in data.items())
+    elif data:
+        size += len(data)
+    return size
+
+
+class RequestMetrics:
+    """مقاييس طلبات HTTP المشتركة بين أوامر الفحص"""
+
+    def __init__(self, command, registry=None):
+        """
+        تهيئة المقاييس
+
+        المعلمات:
+            command (str): اسم الأمر (fuzz أو xss) ويضاف كتسمية لكل مقياس
+            registry (MetricsRegistry): السجل (الافتراضي السجل المشترك)
+        """
+        self.command = command
+        self.registry = registry or get_metrics()
+        self.requests = self.registry.counter("http_requests_total", "عدد طلبات HTTP حسب الأمر والوضع وفئة رمز الحالة")
+        self.latency = self.registry.histogram("http_request_duration_seconds", "زمن طلبات HTTP بالثواني")
+        self.bytes_out = self.registry.counter("http_request_bytes_total", "حجم الطلبات المرسلة التقريبي بالبايت")
+        self.bytes_in = self.registry.counter("http_response_bytes_total", "بايتات أجسام الاستجابات المقروءة")
+        self.errors = self.registry.counter("http_errors_total", "أخطاء الطلبات حسب نوع الاستثناء")
+
+    def record(self, status_code, elapsed, sent, received, mode=""):
+        """تسجيل طلب مكتمل"""
+        self.requests.inc(command=self.command, mode=mode, status=f"{status_code // 100}xx")
+        self.latency.observe(elapsed, command=self.command)
+        self.bytes_out.inc(sent, command=self.command)
+        self.bytes_in.inc(received, command=self.command)
+
+    def error(self, exc):
+        """تسجيل طلب فاشل"""
+        self.errors.inc(command=self.command, type=type(exc).__name__)
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة توليد متغيرات الحمولات بسلاسل تحويلات الترميز لأداة urlget
+"""
+
+from functools import lru_cache
+from urllib.parse import quote
+
+
+def _html_entities(text):
+    """ترميز المحارف غير الأبجدية الرقمية ككيانات HTML رقمية"""
+    return "".join(c if c.isalnum() else f"&#x{ord(c):x};" for c in text)
+
+
+def _unicode_escape(text):
+    """ترميز المحارف غير الأبجدية الرقمية بصيغة \\uXXXX"""
+    return "".join(c if c.isalnum() and c.isascii() else f"\\u{ord(c):04x}" for c in text)
+
+
+def _mixed_case(text):
+    """تبديل حالة الأحرف بالتناوب لتجاوز المرشحات الحساسة لحالة الأحرف"""
+    parts = []
+    upper = False
+    for c in text:
+        if c.isalpha():
+            parts.append(c.upper() if upper else c.lower())
+            upper = not upper
+        else:
+            parts.append(c)
+    return "".join(parts)
+
+
+# التحويلات المتاحة؛ تسلسل بعلامة + مثل url+html
+TRANSFORMS = {
+    'raw': lambda text: text,
+    'url': lambda text: quote(text, safe=''),
+    'double-url': lambda text: quote(quote(text, safe=''), safe=''),
+    'html': _html_entities,
+    'unicode': _unicode_escape,
+    'upper': str.upper,
+    'lower': str.lower,
+    'mixed': _mixed_case,
+}
+
+
+@lru_cache(maxsize=65536)
+def _transform(name, text):
+    """
+    تطبيق تحويل واحد مع حفظ النتيجة
+
+    الحمولة نفسها تحول مرة لكل نقطة حقن، والسلاسل تتشارك خطواتها الأولى
+    (url و url+html)، لذا تعاد معظم النتائج من الذاكرة.
+    """
+    return TRANSFORMS[name](text)
+
+
+def apply_chain(text, chain):
+    """
+    تطبيق سلسلة تحويلات بالترتيب
+
+    المعلمات:
+        text (str): الحمولة
+        chain (tuple): أسماء التحويلات
+
+    العائد:
+        str: المتغير
+    """
+    for name in chain:
+        text = _transform(name, text)
+    return text
+
+
+def parse_mutations(spec):
+    """
+    تحليل وصف السلاسل، مثل "raw,url,double-url,url+html"
+
+    المعلمات:
+        spec (str|list): السلاسل مفصولة بفواصل أو قائمة منها
+
+    العائد:
+        list: السلاسل كمجموعات من أسماء التحويلات
+    """
+    items = spec.split(',') if isinstance(spec, str) else spec
+    chains = []
+    for item in items:
+        chain = tuple(name.strip() for name in item.split('+') if name.strip()) if isinstance(item, str) else tuple(item)
+        if not chain:
+            continue
+        unknown = [name for name in chain if name not in TRANSFORMS]
+        if unknown:
+            raise ValueError(f"تحويل غير معروف: {', '.join(unknown)} (المتاح: {', '.join(TRANSFORMS)})")
+        if chain not in chains:
+            chains.append(chain)
+    return chains
+
+
+class MutatedPayloads:
+    """تسلسل كسول لمتغيرات الحمولات: يحسب كل متغير عند طلبه فقط"""
+
+    def __init__(self, base, chains):
+        """
+        تهيئة التسلسل
+
+        المعلمات:
+            base (sequence): الحمولات الأصلية (قائمة أو PayloadCorpus)
+            chains (list): سلاسل التحويلات من parse_mutations
+        """
+        self.base = base
+        self.chains = [tuple(chain) for chain in chains]
+
+    def __len__(self):
+        # عدد المتغيرات معروف دون إنشائها
+        return len(self.base) * len(self.chains)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("فهرس الحمولة خارج النطاق")
+
+        payload_index, chain_index = divmod(index, len(self.chains))
+        return apply_chain(self.base[payload_index], self.chains[chain_index])
+
+    def __iter__(self):
+        for payload in self.base:
+            for chain in self.chains:
+                yield apply_chain(payload, chain)
+
+    def origin(self, index):
+        """الحمولة الأصلية للمتغير ذي الفهرس المحدد"""
+        return self.base[index // len(self.chains)]
+
+    def chain_name(self, index):
+        """اسم سلسلة التحويلات للمتغير ذي الفهرس المحدد"""
+        return '+'.join(self.chains[index % len(self.chains)])
+
+    def with_origin(self):
+        """مولد أزواج (المتغير، الحمولة الأصلية)"""
+        for payload in self.base:
+            for chain in self.chains:
+                yield apply_chain(payload, chain), payload
+
+
+def mutate(payloads, spec):
+    """
+    إضافة مرحلة التحويلات إلى الحمولات المحملة
+
+    المعلمات:
+        payloads (sequence): الحمولات الأصلية
+        spec (str|list): وصف السلاسل (None أو فارغ دون تحويل)
+
+    العائد:
+        sequence: MutatedPayloads أو الحمولات نفسها
+    """
+    if not spec:
+        return payloads
+    chains = parse_mutations(spec)
+    if chains == [('raw',)]:
+        return payloads
+    return MutatedPayloads(payloads, chains)
+
+
+def base_payloads(payloads):
+    """الحمولات الأصلية قبل التحويلات"""
+    return payloads.base if isinstance(payloads, MutatedPayloads) else payloads
+
+
+def payload_origin(payloads, index):
+    """الحمولة الأصلية للمتغير ذي الفهرس المحدد في أي تسلسل حمولات"""
+    if isinstance(payloads, MutatedPayloads):
+        return payloads.origin(index)
+    return payloads[index]
+
+
+def with_origin(payloads):
+    """مولد أزواج (المتغير، الحمولة الأصلية) لأي تسلسل حمولات"""
+    if isinstance(payloads, MutatedPayloads):
+        return payloads.with_origin()
+    return ((payload, payload) for payload in payloads)
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة اكتشاف المعلمات المخفية بإرسال دفعات كبيرة من الأسماء وتقسيمها ثنائيًا لأداة urlget
+"""
+
+import html
+import random
+import string
+import logging
+import threading
+import requests
+from urllib.parse import quote, urlencode, unquote_plus
+from colorama import Fore, Style
+
+from urlget.fuzzer import HTTPFuzzer
+from urlget.fingerprint import BaselineProfile, fingerprint_without
+from urlget.engine import ThreadEngine
+from urlget.corpus import open_corpus, bundled_wordlist
+from urlget.utils import setup_logger
+
+# قائمة الأسماء الافتراضية المرفقة مع الأداة
+DEFAULT_WORDLIST = "wordlist.txt"
+
+# عدد الخانات الست عشرية لرقم العلامة؛ طول ثابت حتى لا تكون علامة جزءًا من أخرى
+_MARKER_DIGITS = 6
+
+
+def _fingerprint(response, literals):
+    """بصمة الاستجابة بعد حذف الاستعلام والعلامات المنعكسة؛ انعكاس القيم يكشف بالبحث عن العلامات مباشرة"""
+    return fingerprint_without(response.status_code, response.headers, response.content, response.total_bytes,
+                               literals)
+
+
+def _echo_forms(query):
+    """
+    صيغ الاستعلام المرسل كما تعرضه الصفحات عادة (صفحات 404 التي تعرض العنوان المطلوب مثلاً)
+
+    المعلمات:
+        query (str): الاستعلام أو جسم النموذج بترميز URL
+
+    العائد:
+        list: سلاسل البايت، الأطول أولاً
+    """
+    if not query:
+        return []
+    forms = set()
+    for form in (query, unquote_plus(query)):
+        forms.update((form, html.escape(form), html.escape(form, quote=False)))
+    return sorted((form.encode('utf-8') for form in forms), key=len, reverse=True)
+
+
+class ParamDiscovery:
+    """اكتشاف المعلمات التي يقبلها الهدف دون أن تظهر في العنوان أو النماذج"""
+
+    def __init__(self, url, method="GET", wordlist=None, batch_size=256, max_url_length=8000, threads=4,
+                 baseline_samples=3, adaptive=False, max_rate=None, max_body=262144, verbose=False):
+        """
+        تهيئة المكتشف
+
+        المعلمات:
+            url (str): عنوان نقطة النهاية (معلماته الحالية ترسل مع كل طلب ولا تختبر)
+            method (str): GET لإرسال الأسماء في العنوان، أو POST/PUT/PATCH لإرسالها في جسم نموذج
+            wordlist (str): ملف أسماء المعلمات (الافتراضي القائمة المرفقة)
+            batch_size (int): الحد الأقصى للأسماء في طلب واحد
+            max_url_length (int): الحد الأقصى لطول العنوان مع طريقة GET
+            threads (int): عدد الدفعات المفحوصة بالتوازي
+            baseline_samples (int): عدد الاستجابات الأساسية بأسماء عشوائية
+            adaptive (bool): ضبط معدل الطلبات تلقائيًا حسب استجابة الهدف
+            max_rate (float): الحد الأقصى لعدد الطلبات في الثانية مع adaptive
+            max_body (int): الحد الأقصى لبايتات الجسم المقروءة لكل استجابة
+            verbose (bool): عرض معلومات تفصيلية
+        """
+        self.url = url
+        self.method = method.upper()
+        self.wordlist = wordlist or bundled_wordlist(DEFAULT_WORDLIST)
+        self.batch_size = max(1, batch_size)
+        self.max_url_length = max_url_length
+        self.threads = threads
+        self.baseline_samples = max(1, baseline_samples)
+
+        # المشوش يوفر تحليل العنوان والناقل المشترك والتحكم في المعدل والمقاييس ومطابق التواقيع
+        self.fuzzer = HTTPFuzzer(url, method=self.method, threads=threads, baseline_samples=0, timing_samples=0,
+                                 adaptive=adaptive, max_rate=max_rate, max_body=max_body, checkpoint=False,
+                                 verbose=verbose)
+        base_url, params = self.fuzzer.parse_url()
+        self.base_url = base_url
+        self.params = self.fuzzer._flat_params(params)
+
+        self.logger = setup_logger("ParamDiscovery", level=logging.DEBUG if verbose else logging.INFO)
+
+        # بادئة عشوائية لكل عملية؛ كل اسم يرسل بعلامة فريدة لمعرفة أي القيم انعكست
+        self._prefix = "".join(random.choice(string.ascii_lowercase) for _ in range(5))
+        self._next_marker = 0
+
+        self.baseline = None
+        # ملف أساسي باسم عشوائي واحد لتأكيد الأسماء المعزولة (يلتقط عند أول حاجة)
+        self.single_baseline = None
+        self._single_lock = threading.Lock()
+        # الصفحة تعكس قيم أي معلمة (حتى العشوائية)، فالانعكاس لا يميز المعلمات المقبولة
+        self.reflects_all = False
+        self.found = {}
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def _markers(self, count):
+        """حجز علامات فريدة جديدة"""
+        with self.lock:
+            start = self._next_marker
+            self._next_marker += count
+        return [f"{self._prefix}{index:0{_MARKER_DIGITS}x}" for index in range(start, start + count)]
+
+    def _budget(self):
+        """عدد المحارف المتاحة للأسماء الجديدة في العنوان (None دون حد)"""
+        if self.method != "GET":
+            return None
+        used = len(self.base_url) + 1 + sum(len(quote(str(k))) + len(quote(str(v))) + 2 for k, v in self.params.items())
+        return self.max_url_length - used
+
+    def iter_batches(self):
+        """
+        مولد دفعات الأسماء من قائمة الكلمات دون تحميلها كاملة
+
+        العائد:
+            generator: قوائم الأسماء
+        """
+        budget = self._budget()
+        marker_length = len(self._prefix) + _MARKER_DIGITS
+        batch = []
+        used = 0
+        for name in open_corpus(self.wordlist):
+            name = name.strip()
+            if not name or name in self.params or any(c.isspace() for c in name):
+                continue
+            cost = len(quote(name)) + marker_length + 2
+            if batch and (len(batch) >= self.batch_size or (budget is not None and used + cost > budget)):
+                yield batch
+                batch = []
+                used = 0
+            batch.append(name)
+            used += cost
+        if batch:
+            yield batch
+
+    def _probe(self, names):
+        """
+        إرسال طلب بالأسماء المحددة، لكل اسم علامة فريدة كقيمة
+
+        العائد:
+            tuple: (الاستجابة، الأسماء المنعكسة، البايتات المحذوفة قبل حساب البصمة) أو None عند الفشل
+        """
+        markers = self._markers(len(names))
+        values = dict(self.params)
+        extra = dict(zip(names, markers))
+        task = {'url': self.base_url, 'method': self.method, 'literals': markers, 'mode': 'discovery'}
+        if self.method == "GET":
+            task['params'] = dict(values, **extra)
+        else:
+            task['params'] = values
+            task['data'] = extra
+
+        response = None
+        for attempt in range(self.fuzzer.max_retries + 1):
+            try:
+                response = self.fuzzer._send(task)
+            except requests.exceptions.RequestException as e:
+                self.logger.warning(f"فشل طلب دفعة من {len(names)} اسم: {str(e)}")
+                return None
+            with self.lock:
+                self.requests += 1
+            if response is None or not self.fuzzer._should_retry(response, attempt):
+                break
+        if response is None:
+            return None
+
+        by_marker = {marker.encode(): name for name, marker in extra.items()}
+        found = [literal for literal in response.scan.found if literal in by_marker]
+        # الاستعلام المعروض كاملاً يحذف قبل العلامات، فلا يبقى منه إلا ما يغيره الهدف فعلاً
+        echoed = _echo_forms(urlencode(task['params']))
+        if 'data' in task:
+            echoed += _echo_forms(urlencode(task['data']))
+        return response, [by_marker[literal] for literal in found], echoed + found
+
+    def _random_names(self, count):
+        """أسماء عشوائية لا يتوقع أن يقبلها الهدف"""
+        length = len(self._prefix) + 2
+        return ["".join(random.choice(string.ascii_lowercase) for _ in range(length)) for _ in range(count)]
+
+    def _profile(self, count):
+        """
+        التقاط الاستجابات الأساسية بدفعات من الأسماء العشوائية
+
+        المعلمات:
+            count (int): عدد الأسماء في كل دفعة
+
+        العائد:
+            tuple: (BaselineProfile أو None، انعكست قيم الأسماء العشوائية)
+        """
+        fingerprints = []
+        signatures = set()
+        reflects = False
+        for _ in range(self.baseline_samples):
+            result = self._probe(self._random_names(count))
+            if result is None:
+                continue
+            response, reflected, literals = result
+            reflects = reflects or bool(reflected)
+            fingerprints.append(_fingerprint(response, literals))
+            signatures.update(hit.name for hit in response.scan.hits)
+
+        if not fingerprints:
+            return None, reflects
+        return BaselineProfile(fingerprints, signatures), reflects
+
+    def calibrate(self):
+        """
+        التقاط الاستجابات الأساسية بدفعات أسماء عشوائية بنفس حجم دفعات الاختبار
+
+        العائد:
+            bool: تم بناء الملف الأساسي
+        """
+        count = self.batch_size
+        if self.method == "GET":
+            # نفس عدد الأسماء قد لا يتسع في العنوان؛ يقتطع كما تقتطع دفعات الاختبار
+            per_name = len(self._prefix) + 2 + len(self._prefix) + _MARKER_DIGITS + 2
+            count = min(count, max(1, self._budget() // per_name))
+
+        self.baseline, self.reflects_all = self._profile(count)
+        if self.baseline is None:
+            return False
+        if self.reflects_all:
+            self.logger.info("الهدف يعكس قيم أي معلمة؛ يعتمد الاكتشاف على تغير الاستجابة فقط")
+        return True
+
+    def _single(self):
+        """الملف الأساسي باسم عشوائي واحد، أو ملف الدفعات إذا فشل التقاطه"""
+        with self._single_lock:
+            if self.single_baseline is None:
+                self.single_baseline = self._profile(1)[0] or self.baseline
+            return self.single_baseline
+
+    def _changes(self, result, baseline=None):
+        """أسباب اختلاف استجابة الدفعة عن الاستجابات الأساسية"""
+        baseline = baseline or self.baseline
+        response, _, literals = result
+        reasons = baseline.differences(_fingerprint(response, literals))
+        reasons.extend(f"signature:{hit.name}" for hit in response.scan.hits
+                       if hit.name not in baseline.signatures)
+        return reasons
+
+    def _report(self, name, reasons):
+        """تسجيل معلمة مكتشفة وعرضها"""
+        with self.lock:
+            entry = self.found.get(name)
+            new = entry is None
+            if new:
+                entry = self.found[name] = []
+            for reason in reasons:
+                if reason not in entry:
+                    entry.append(reason)
+        if new:
+            self.fuzzer.findings_metric.inc(mode='discovery')
+            with self.fuzzer.print_lock:
+                print(f"{Fore.GREEN}[+] معلمة مخفية: {name} ({', '.join(reasons)}){Style.RESET_ALL}")
+
+    def _search(self, names, result):
+        """
+        تقسيم دفعة تغيرت استجابتها حتى الوصول إلى الأسماء المسؤولة
+
+        المعلمات:
+            names (list): الأسماء المرسلة
+            result (tuple): نتيجة _probe للدفعة نفسها
+        """
+        if not self.reflects_all:
+            for name in result[1]:
+                self._report(name, ['reflected'])
+
+        reasons = self._changes(result)
+        if not reasons:
+            return
+
+        if len(names) == 1:
+            # اسم واحد: إعادة الطلب بعلامة جديدة ومقارنته باستجابات اسم عشوائي واحد
+            # (لا بدفعات كاملة) لاستبعاد تقلب الصفحة واختلافها بحجم الطلب وحده
+            confirm = self._probe(names)
+            if confirm is not None:
+                reasons = self._changes(confirm, self._single())
+                if reasons:
+                    self._report(names[0], reasons)
+            return
+
+        self.logger.debug(f"تغيرت الاستجابة لدفعة من {len(names)} اسم ({', '.join(reasons)})، تقسيمها")
+        middle = len(names) // 2
+        for half in (names[:middle], names[middle:]):
+            half_result = self._probe(half)
+            if half_result is not None:
+                self._search(half, half_result)
+
+    def _check_batch(self, names):
+        """فحص دفعة من قائمة الكلمات"""
+        result = self._probe(names)
+        if result is not None:
+            self._search(names, result)
+
+    def start(self):
+        """
+        بدء الاكتشاف
+
+        العائد:
+            dict: المعلمات المكتشفة وأسبابها وعدد الطلبات
+        """
+        print(f"{Fore.GREEN}[+] بدء اكتشاف المعلمات المخفية لـ {self.method} {self.base_url}...{Style.RESET_ALL}")
+        if not self.calibrate():
+            print(f"{Fore.RED}[!] فشل في التقاط الاستجابات الأساسية{Style.RESET_ALL}")
+            return {'url': self.url, 'method': self.method, 'parameters': [], 'requests': self.requests}
+
+        counter = {'names': 0}
+
+        def batches():
+            for batch in self.iter_batches():
+                counter['names'] += len(batch)
+                yield batch
+
+        ThreadEngine(threads=self.threads, logger=self.logger).run(batches(), self._check_batch)
+
+        print(f"\n{Fore.GREEN}[+] اكتمل الاكتشاف!{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}[*] تم اختبار {counter['names']} اسم في {self.requests} طلب{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}[*] المعلمات المكتشفة: {len(self.found)}{Style.RESET_ALL}")
+        for name, reasons in sorted(self.found.items()):
+            print(f"  - {name}: {', '.join(reasons)}")
+
+        return {
+            'url': self.url,
+            'method': self.method,
+            'candidates': counter['names'],
+            'requests': self.requests,
+            'parameters': [{'name': name, 'reasons': reasons} for name, reasons in sorted(self.found.items())],
+        }
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة إحصائيات نجاح الحمولات بين العمليات وترتيب الحمولات حسبها لأداة urlget
+"""
+
+import os
+import json
+import hashlib
+import threading
+from bisect import bisect_right
+
+# إصدار صيغة ملف الإحصائيات
+STATS_VERSION = 2
+
+
+class OrderedPayloads:
+    """تسلسل كسول يقدم الحمولات الأنجح في العمليات السابقة ثم يكمل البقية بترتيب الملف"""
+
+    def __init__(self, base, front):
+        """
+        تهيئة التسلسل
+
+        المعلمات:
+            base (sequence): الحمولات بترتيب الملف (قائمة أو PayloadCorpus)
+            front (list): فهارس الحمولات المقدمة بالترتيب المطلوب
+        """
+        self.base = base
+        self.front = list(front)
+        # الفهارس المقدمة مرتبة لحساب موقع بقية الحمولات دون إنشاء قائمة بها
+        self._moved = sorted(self.front)
+
+    def __len__(self):
+        return len(self.base)
+
+    def _rest_index(self, k):
+        """فهرس الملف للحمولة رقم k بين الحمولات غير المقدمة"""
+        # أصغر فهرس j يكون عدد الحمولات غير المقدمة حتى j (شاملاً) مساويًا k + 1
+        low, high = k, k + len(self._moved)
+        while low < high:
+            mid = (low + high) // 2
+            if mid + 1 - bisect_right(self._moved, mid) < k + 1:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("فهرس الحمولة خارج النطاق")
+
+        if index < len(self.front):
+            return self.base[self.front[index]]
+        return self.base[self._rest_index(index - len(self.front))]
+
+    def __iter__(self):
+        for index in self.front:
+            yield self.base[index]
+        moved = set(self.front)
+        for index, payload in enumerate(self.base):
+            if index not in moved:
+                yield payload
+
+
+class PayloadStats:
+    """
+    إحصائيات نجاح الحمولات، إجمالاً ولكل خلفية مكتشفة (حزمة التواقيع)
+
+    يحفظ الملف مدخلاً كاملاً للحمولات التي نجحت فقط، مع عدد الطلبات الكلي؛
+    عدد إرسال بقية الحمولات لا يغير ترتيبها فلا يحتفظ به إلا خلال العملية وبمفتاح مختصر.
+    """
+
+    def __init__(self, path, max_entries=10000):
+        """
+        تهيئة الإحصائيات
+
+        المعلمات:
+            path (str): مسار ملف JSON الذي تتراكم فيه الإحصائيات بين العمليات
+            max_entries (int): الحد الأقصى للحمولات الناجحة المحفوظة (تبقى الأعلى أولوية)
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.payloads = {}
+        self.sent = 0
+        # الزيادات منذ آخر حفظ؛ تدمج مع الملف عند الحفظ حتى لا تضيع نتائج عملية متزامنة أخرى
+        self._hits = {}
+        self._sent = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(payload):
+        """مفتاح مختصر لعداد إرسال الحمولة"""
+        return hashlib.blake2b(payload.encode('utf-8', 'surrogatepass'), digest_size=8).digest()
+
+    def _read(self):
+        """
+        قراءة الملف إن وجد
+
+        العائد:
+            tuple: (عدد الطلبات الكلي، مدخلات الحمولات الناجحة)
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return 0, {}
+        if data.get('version') not in (1, STATS_VERSION):
+            return 0, {}
+        # ملفات الإصدار الأول تحفظ جميع الحمولات؛ تبقى الناجحة منها فقط
+        payloads = {payload: entry for payload, entry in data.get('payloads', {}).items() if entry['hits']}
+        return data.get('sent', 0), payloads
+
+    def load(self):
+        """
+        تحميل الإحصائيات المحفوظة
+
+        العائد:
+            int: عدد الحمولات ذات الإحصائيات
+        """
+        with self._lock:
+            self.sent, self.payloads = self._read()
+            return len(self.payloads)
+
+    def observe(self, payload, vulnerable, backends=()):
+        """
+        تسجيل نتيجة إرسال حمولة
+
+        المعلمات:
+            payload (str): الحمولة الأصلية (قبل تحويلات الترميز)
+            vulnerable (bool): أدت الحمولة إلى نقطة ضعف مؤكدة
+            backends (iterable): حزم التواقيع التي ظهرت في الاستجابة (مثل mysql)
+        """
+        key = self._key(payload)
+        with self._lock:
+            self._sent[key] = self._sent.get(key, 0) + 1
+            if vulnerable:
+                entry = self._hits.get(payload)
+                if entry is None:
+                    entry = self._hits[payload] = {'hits': 0, 'backends': {}}
+                entry['hits'] += 1
+                for backend in backends:
+                    entry['backends'][backend] = entry['backends'].get(backend, 0) + 1
+
+    @staticmethod
+    def _score(entry, backends=None):
+        """معدل النجاح المنعم لمدخل حمولة"""
+        hits = sum(entry['backends'].get(backend, 0) for backend in backends) if backends else entry['hits']
+        if not hits:
+            return 0.0
+        return (hits + 1) / (entry['sent'] + 2)
+
+    def score(self, payload, backends=None):
+        """
+        أولوية الحمولة: معدل النجاح المنعم، ونجاحها على الخلفيات المحددة فقط إن وجدت
+
+        العائد:
+            float: الأولوية (0 للحمولات التي لم تنجح من قبل)
+        """
+        entry = self.payloads.get(payload)
+        if entry is None:
+            return 0.0
+        return self._score(entry, backends)
+
+    def order(self, payloads, backends=None):
+        """
+        تقديم الحمولات التي نجحت من قبل حسب أولويتها
+
+        المعلمات:
+            payloads (sequence): الحمولات بترتيب الملف
+            backends (list): الخلفيات المستهدفة (مثل حزم --signatures) أو None لجميعها
+
+        العائد:
+            sequence: OrderedPayloads أو الحمولات نفسها إذا لم تنجح أي منها من قبل
+        """
+        if not self.payloads:
+            return payloads
+
+        scored = []
+        for index, payload in enumerate(payloads):
+            score = self.score(payload, backends)
+            if score:
+                scored.append((-score, index))
+        if not scored:
+            return payloads
+
+        scored.sort()
+        return OrderedPayloads(payloads, [index for _, index in scored])
+
+    def save(self):
+        """دمج الزيادات مع الملف الحالي وكتابته بشكل ذري"""
+        with self._lock:
+            if not self._sent:
+                return
+            sent, merged = self._read()
+            sent += sum(self._sent.values())
+            for payload, delta in self._hits.items():
+                entry = merged.setdefault(payload, {'sent': 0, 'hits': 0, 'backends': {}})
+                entry['hits'] += delta['hits']
+                for backend, count in delta['backends'].items():
+                    entry['backends'][backend] = entry['backends'].get(backend, 0) + count
+            for payload, entry in merged.items():
+                entry['sent'] += self._sent.get(self._key(payload), 0)
+
+            if len(merged) > self.max_entries:
+                ranked = sorted(merged.items(), key=lambda item: self._score(item[1]), reverse=True)
+                merged = dict(ranked[:self.max_entries])
+
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': STATS_VERSION, 'sent': sent, 'payloads': merged}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self.sent = sent
+            self.payloads = merged
+            self._hits = {}
+            self._sent = {}
+
+
+def ordered_front(payloads):
+    """فهارس الحمولات المقدمة إن كانت مرتبة حسب الإحصائيات (لبصمة العملية)"""
+    return payloads.front if isinstance(payloads, OrderedPayloads) else None
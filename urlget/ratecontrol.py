@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة التحكم التكيفي في التزامن ومعدل الطلبات لأداة urlget
+"""
+
+import time
+import asyncio
+import threading
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+# رموز الحالة التي تدل على أن الهدف يطلب تخفيف الضغط
+THROTTLE_STATUSES = (429, 503)
+
+
+def parse_retry_after(value):
+    """
+    تحويل قيمة رأس Retry-After إلى عدد ثوانٍ
+
+    المعلمات:
+        value (str): عدد ثوانٍ أو تاريخ HTTP
+
+    العائد:
+        float: مدة الانتظار بالثواني أو None إذا كانت القيمة غير صالحة
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+class HostState:
+    """حالة التحكم الخاصة بمضيف واحد"""
+
+    __slots__ = ('limit', 'rate', 'in_flight', 'next_send', 'blocked_until', 'srtt', 'rttvar',
+                 'min_rtt', 'latencies', 'successes', 'last_decrease', 'p50', 'p95')
+
+    def __init__(self, limit, rate, window):
+        """تهيئة حالة المضيف"""
+        self.limit = float(limit)
+        self.rate = rate
+        self.in_flight = 0
+        self.next_send = 0.0
+        self.blocked_until = 0.0
+        self.srtt = None
+        self.rttvar = None
+        self.min_rtt = None
+        self.latencies = deque(maxlen=window)
+        self.successes = 0
+        self.last_decrease = 0.0
+        self.p50 = None
+        self.p95 = None
+
+
+class AdaptiveController:
+    """متحكم AIMD: زيادة جمعية عند استقرار الهدف وتخفيض ضربي عند الاختناق"""
+
+    def __init__(self, initial_concurrency=10, min_concurrency=1, max_concurrency=500,
+                 initial_rate=50.0, min_rate=1.0, max_rate=None, increase=1.0, decrease=0.5,
+                 latency_factor=3.0, initial_timeout=10.0, min_timeout=1.0, max_timeout=30.0,
+                 window=100):
+        """
+        تهيئة المتحكم
+
+        المعلمات:
+            initial_concurrency (int): التزامن الأولي لكل مضيف
+            min_concurrency (int): أدنى تزامن مسموح به
+            max_concurrency (int): أقصى تزامن مسموح به
+            initial_rate (float): معدل الطلبات الأولي في الثانية لكل مضيف
+            min_rate (float): أدنى معدل مسموح به
+            max_rate (float): أقصى معدل مسموح به (None بلا حد)
+            increase (float): مقدار الزيادة الجمعية بعد كل نافذة ناجحة
+            decrease (float): معامل التخفيض الضربي عند الاختناق
+            latency_factor (float): نسبة p95 إلى أدنى زمن ذهاب وإياب تعتبر اختناقًا
+            initial_timeout (float): المهلة قبل توفر قياسات زمن الذهاب والإياب
+            min_timeout (float): أدنى مهلة محسوبة
+            max_timeout (float): أقصى مهلة محسوبة
+            window (int): عدد قياسات زمن الاستجابة المحتفظ بها لحساب النسب المئوية
+        """
+        self.initial_concurrency = initial_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        # المعدل الأقصى يسري من أول طلب وليس فقط بعد أول زيادة
+        self.initial_rate = min(initial_rate, max_rate) if max_rate else initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.initial_timeout = initial_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.window = window
+
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _state(self, host):
+        """الحصول على حالة المضيف وإنشاؤها عند الحاجة"""
+        state = self._hosts.get(host)
+        if state is None:
+            rate = min(self.initial_rate, self.max_rate) if self.max_rate else self.initial_rate
+            state = HostState(self.initial_concurrency, rate, self.window)
+            self._hosts[host] = state
+        return state
+
+    def try_acquire(self, host):
+        """
+        محاولة حجز مكان لطلب جديد إلى المضيف
+
+        المعلمات:
+            host (str): اسم المضيف
+
+        العائد:
+            float: صفر إذا تم الحجز، وإلا عدد الثواني المقترح للانتظار قبل المحاولة مجددًا
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._state(host)
+
+            if state.blocked_until > now:
+                return state.blocked_until - now
+
+            if state.in_flight >= int(state.limit):
+                # انتظار قصير يتناسب مع زمن الاستجابة المعتاد
+                return min(state.srtt or 0.05, 0.05)
+
+            if state.rate and state.next_send > now:
+                return state.next_send - now
+
+            state.in_flight += 1
+            if state.rate:
+                state.next_send = max(now, state.next_send) + 1.0 / state.rate
+            return 0.0
+
+    def acquire(self, host):
+        """حجز مكان لطلب مع الانتظار عند الحاجة (للمواضيع)"""
+        while True:
+            delay = self.try_acquire(host)
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    async def acquire_async(self, host):
+        """حجز مكان لطلب مع الانتظار عند الحاجة (لمحرك asyncio)"""
+        while True:
+            delay = self.try_acquire(host)
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+
+    def timeout(self, host):
+        """
+        المهلة المناسبة للمضيف محسوبة من زمن الذهاب والإياب المقاس (RFC 6298)
+
+        المعلمات:
+            host (str): اسم المضيف
+
+        العائد:
+            float: المهلة بالثواني
+        """
+        with self._lock:
+            state = self._state(host)
+            if state.srtt is None:
+                return self.initial_timeout
+            return min(self.max_timeout, max(self.min_timeout, state.srtt + 4 * state.rttvar))
+
+    def release(self, host, latency=None, status_code=None, headers=None, error=False):
+        """
+        تحرير مكان الطلب وتحديث الحالة من نتيجته
+
+        المعلمات:
+            host (str): اسم المضيف
+            latency (float): زمن الاستجابة بالثواني
+            status_code (int): رمز حالة الاستجابة
+            headers (dict): رؤوس الاستجابة (لقراءة Retry-After)
+            error (bool): فشل الطلب بسبب مهلة أو خطأ اتصال
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._state(host)
+            state.in_flight = max(0, state.in_flight - 1)
+
+            throttled = error or status_code in THROTTLE_STATUSES
+
+            if latency is not None and not error:
+                self._update_rtt(state, latency)
+
+            if status_code in THROTTLE_STATUSES and headers:
+                retry_after = parse_retry_after(headers.get('Retry-After'))
+                if retry_after:
+                    state.blocked_until = max(state.blocked_until, now + min(retry_after, self.max_timeout * 10))
+
+            congested = (state.p95 is not None and state.min_rtt
+                         and state.p95 > self.latency_factor * state.min_rtt)
+
+            if throttled or congested:
+                self._decrease(state, now)
+            else:
+                self._maybe_increase(state)
+
+    def _update_rtt(self, state, latency):
+        """تحديث تقديرات زمن الذهاب والإياب والنسب المئوية"""
+        if state.srtt is None:
+            state.srtt = latency
+            state.rttvar = latency / 2
+        else:
+            state.rttvar = 0.75 * state.rttvar + 0.25 * abs(state.srtt - latency)
+            state.srtt = 0.875 * state.srtt + 0.125 * latency
+
+        state.latencies.append(latency)
+
+        # إعادة حساب النسب المئوية كل عُشر نافذة لتقليل كلفة الفرز
+        if len(state.latencies) % max(1, self.window // 10) == 0:
+            ordered = sorted(state.latencies)
+            state.p50 = ordered[len(ordered) // 2]
+            state.p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+            if state.min_rtt is None or state.p50 < state.min_rtt:
+                state.min_rtt = state.p50
+
+    def _decrease(self, state, now):
+        """تخفيض ضربي، مرة واحدة على الأكثر لكل زمن ذهاب وإياب"""
+        if now - state.last_decrease < (state.srtt or 0):
+            return
+        state.last_decrease = now
+        state.successes = 0
+        state.limit = max(self.min_concurrency, state.limit * self.decrease)
+        if state.rate:
+            state.rate = max(self.min_rate, state.rate * self.decrease)
+
+    def _maybe_increase(self, state):
+        """زيادة جمعية بعد اكتمال نافذة كاملة من الطلبات الناجحة"""
+        state.successes += 1
+        if state.successes < int(state.limit):
+            return
+        state.successes = 0
+        state.limit = min(self.max_concurrency, state.limit + self.increase)
+        if state.rate:
+            rate = state.rate + self.increase * (state.rate / state.limit)
+            state.rate = min(self.max_rate, rate) if self.max_rate else rate
+
+    def stats(self, host):
+        """
+        حالة المتحكم لمضيف معين
+
+        العائد:
+            dict: التزامن والمعدل الحاليان ومقاييس زمن الاستجابة
+        """
+        with self._lock:
+            state = self._state(host)
+            return {
+                'concurrency': int(state.limit),
+                'rate': state.rate,
+                'in_flight': state.in_flight,
+                'srtt': state.srtt,
+                'p50': state.p50,
+                'p95': state.p95,
+            }
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة تخزين نتائج الطلبات بشكل مختصر ومتدفق إلى القرص لأداة urlget
+"""
+
+import json
+import sqlite3
+import threading
+
+
+class FuzzRecord:
+    """سجل مختصر لنتيجة طلب واحد"""
+
+    __slots__ = ('url', 'method', 'param_name', 'payload_index', 'status_code', 'response_time',
+                 'response_length', 'content_length', 'header_id', 'is_vulnerable', 'signatures', 'anomalies')
+
+    def __init__(self, url, method, param_name, payload_index, status_code, response_time,
+                 response_length, content_length=None, header_id=None, is_vulnerable=False, signatures=(), anomalies=()):
+        """تهيئة السجل"""
+        self.url = url
+        self.method = method
+        self.param_name = param_name
+        self.payload_index = payload_index
+        self.status_code = status_code
+        self.response_time = response_time
+        self.response_length = response_length
+        self.content_length = content_length
+        self.header_id = header_id
+        self.is_vulnerable = is_vulnerable
+        self.signatures = signatures
+        self.anomalies = anomalies
+
+    def to_dict(self):
+        """تحويل السجل إلى قاموس"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class JSONLSink:
+    """مصرف يكتب سجلًا JSON في كل سطر"""
+
+    def __init__(self, path, append=False):
+        """
+        تهيئة المصرف
+
+        المعلمات:
+            path (str): مسار ملف JSONL
+            append (bool): الإضافة إلى الملف الموجود بدلاً من استبداله (عند الاستئناف)
+        """
+        self.path = path
+        self._file = open(path, 'a' if append else 'w', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        """كتابة سجل واحد"""
+        line = json.dumps(record.to_dict(), ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def flush(self):
+        """كتابة السجلات المخزنة مؤقتًا إلى القرص"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+
+    def truncate(self, count):
+        """
+        الاحتفاظ بأول count سجل فقط (عند الاستئناف تحذف السجلات المكتوبة بعد آخر نقطة حفظ)
+
+        المعلمات:
+            count (int): عدد السجلات المحفوظة في نقطة الحفظ
+        """
+        with self._lock:
+            self._file.flush()
+            with open(self.path, 'rb') as f:
+                for _ in range(count):
+                    if not f.readline():
+                        break
+                position = f.tell()
+            self._file.truncate(position)
+
+    def read(self):
+        """قراءة السجلات المكتوبة كقواميس"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                yield json.loads(line)
+
+    def close(self):
+        """إغلاق الملف"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+class SQLiteSink:
+    """مصرف يكتب السجلات في جدول SQLite على دفعات"""
+
+    COLUMNS = FuzzRecord.__slots__
+
+    def __init__(self, path, append=False, batch_size=500):
+        """
+        تهيئة المصرف
+
+        المعلمات:
+            path (str): مسار قاعدة البيانات
+            append (bool): الإضافة إلى جدول النتائج الموجود بدلاً من استبداله (عند الاستئناف)
+            batch_size (int): عدد السجلات في كل عملية إدراج
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self._batch = []
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # تشغيل جديد يستبدل نتائج التشغيل السابق كما في JSONL؛ الجداول الأخرى في القاعدة لا تمس
+        if not append:
+            self._conn.execute("DROP TABLE IF EXISTS results")
+        self._conn.execute(f"CREATE TABLE IF NOT EXISTS results ({', '.join(self.COLUMNS)})")
+        self._conn.commit()
+
+    def _row(self, record):
+        """تحويل السجل إلى صف في الجدول"""
+        row = record.to_dict()
+        row['signatures'] = ",".join(row['signatures'])
+        row['anomalies'] = ",".join(row['anomalies'])
+        row['is_vulnerable'] = int(row['is_vulnerable'])
+        return tuple(row[name] for name in self.COLUMNS)
+
+    def _flush(self):
+        """إدراج الدفعة الحالية"""
+        if self._batch:
+            placeholders = ", ".join("?" for _ in self.COLUMNS)
+            self._conn.executemany(f"INSERT INTO results VALUES ({placeholders})", self._batch)
+            self._conn.commit()
+            self._batch = []
+
+    def write(self, record):
+        """كتابة سجل واحد"""
+        row = self._row(record)
+        with self._lock:
+            self._batch.append(row)
+            if len(self._batch) >= self.batch_size:
+                self._flush()
+
+    def flush(self):
+        """إدراج الدفعة الحالية"""
+        with self._lock:
+            self._flush()
+
+    def truncate(self, count):
+        """
+        الاحتفاظ بأول count سجل فقط (عند الاستئناف تحذف السجلات المكتوبة بعد آخر نقطة حفظ)
+
+        المعلمات:
+            count (int): عدد السجلات المحفوظة في نقطة الحفظ
+        """
+        with self._lock:
+            self._flush()
+            self._conn.execute("DELETE FROM results WHERE rowid NOT IN "
+                               "(SELECT rowid FROM results ORDER BY rowid LIMIT ?)", (count,))
+            self._conn.commit()
+
+    def read(self):
+        """قراءة السجلات المكتوبة كقواميس"""
+        with self._lock:
+            if self._conn is None:
+                conn = sqlite3.connect(self.path)
+                rows = conn.execute(f"SELECT {', '.join(self.COLUMNS)} FROM results").fetchall()
+                conn.close()
+            else:
+                self._flush()
+                rows = self._conn.execute(f"SELECT {', '.join(self.COLUMNS)} FROM results").fetchall()
+        for row in rows:
+            record = dict(zip(self.COLUMNS, row))
+            record['signatures'] = [s for s in record['signatures'].split(",") if s]
+            record['anomalies'] = [a for a in record['anomalies'].split(",") if a]
+            record['is_vulnerable'] = bool(record['is_vulnerable'])
+            yield record
+
+    def close(self):
+        """كتابة الدفعة المتبقية وإغلاق الاتصال"""
+        with self._lock:
+            if self._conn is not None:
+                self._flush()
+                self._conn.close()
+                self._conn = None
+
+
+def open_sink(path, append=False):
+    """
+    إنشاء مصرف مناسب حسب امتداد الملف
+
+    المعلمات:
+        path (str): مسار الملف (.db أو .sqlite لقاعدة SQLite، وغير ذلك JSONL)
+        append (bool): الإضافة إلى النتائج الموجودة بدلاً من استبدالها (عند الاستئناف)
+
+    العائد:
+        مصرف النتائج أو None إذا لم يتم تحديد مسار
+    """
+    if not path:
+        return None
+    if path.endswith(('.db', '.sqlite', '.sqlite3')):
+        return SQLiteSink(path, append=append)
+    return JSONLSink(path, append=append)
+
+
+class ResultStore:
+    """مخزن نتائج يحتفظ بالإحصائيات فقط في الذاكرة ويرسل السجلات إلى مصرف على القرص"""
+
+    def __init__(self, sink=None):
+        """
+        تهيئة المخزن
+
+        المعلمات:
+            sink: مصرف السجلات (JSONLSink أو SQLiteSink) أو None للاكتفاء بالإحصائيات
+        """
+        self.sink = sink
+        self._lock = threading.Lock()
+
+        # جدول بصمات الرؤوس: كل مجموعة أسماء رؤوس مختلفة تخزن مرة واحدة
+        self.header_ids = {}
+        self.header_names = []
+
+        # الإحصائيات المجمعة
+        self.total = 0
+        self.vulnerable = 0
+        self.status_counts = {}
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.total_bytes = 0
+
+    def intern_headers(self, headers):
+        """
+        الحصول على معرف ثابت لمجموعة أسماء الرؤوس
+
+        المعلمات:
+            headers (dict): رؤوس الاستجابة
+
+        العائد:
+            int: معرف البصمة في جدول الرؤوس
+        """
+        names = tuple(sorted(name.lower() for name in headers))
+        with self._lock:
+            header_id = self.header_ids.get(names)
+            if header_id is None:
+                header_id = len(self.header_names)
+                self.header_ids[names] = header_id
+                self.header_names.append(names)
+            return header_id
+
+    def add(self, record):
+        """
+        إضافة سجل: تحديث الإحصائيات ثم إرساله إلى المصرف
+
+        المعلمات:
+            record (FuzzRecord): سجل النتيجة
+        """
+        with self._lock:
+            self.total += 1
+            self.vulnerable += int(record.is_vulnerable)
+            self.status_counts[record.status_code] = self.status_counts.get(record.status_code, 0) + 1
+            self.total_time += record.response_time
+            self.max_time = max(self.max_time, record.response_time)
+            self.total_bytes += record.response_length
+
+        if self.sink is not None:
+            self.sink.write(record)
+
+    def flush(self):
+        """كتابة السجلات المخزنة مؤقتًا في المصرف إلى القرص"""
+        if self.sink is not None:
+            self.sink.flush()
+
+    def __len__(self):
+        return self.total
+
+    def __iter__(self):
+        # السجلات الكاملة موجودة على القرص فقط
+        if self.sink is None:
+            return iter(())
+        return self.sink.read()
+
+    def summary(self):
+        """
+        ملخص الإحصائيات المجمعة
+
+        العائد:
+            dict: عدد الطلبات، رموز الحالة، متوسط وأقصى وقت الاستجابة، إجمالي البايتات،
+                  وجدول مجموعات أسماء الرؤوس التي تشير إليها header_id
+        """
+        with self._lock:
+            return {
+                'total': self.total,
+                'vulnerable': self.vulnerable,
+                'status_counts': dict(self.status_counts),
+                'avg_time': self.total_time / self.total if self.total else 0.0,
+                'max_time': self.max_time,
+                'total_bytes': self.total_bytes,
+                'header_sets': [list(names) for names in self.header_names],
+            }
+
+    def state(self):
+        """
+        حالة الإحصائيات المجمعة لحفظها في نقطة حفظ
+
+        العائد:
+            dict: الإحصائيات وجدول مجموعات الرؤوس
+        """
+        with self._lock:
+            return {
+                'total': self.total,
+                'vulnerable': self.vulnerable,
+                'status_counts': {str(code): count for code, count in self.status_counts.items()},
+                'total_time': self.total_time,
+                'max_time': self.max_time,
+                'total_bytes': self.total_bytes,
+                'header_names': [list(names) for names in self.header_names],
+            }
+
+    def restore(self, state):
+        """
+        استعادة الإحصائيات المجمعة من نقطة حفظ
+
+        المعلمات:
+            state (dict): الحالة التي أعادتها state()
+        """
+        with self._lock:
+            self.total = state['total']
+            self.vulnerable = state['vulnerable']
+            self.status_counts = {int(code): count for code, count in state['status_counts'].items()}
+            self.total_time = state['total_time']
+            self.max_time = state['max_time']
+            self.total_bytes = state['total_bytes']
+            self.header_names = [tuple(names) for names in state['header_names']]
+            self.header_ids = {names: i for i, names in enumerate(self.header_names)}
+
+    def close(self):
+        """إغلاق المصرف"""
+        if self.sink is not None:
+            self.sink.close()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة تقسيم مهام التشويش على عدة عمليات لأداة urlget
+"""
+
+import time
+import queue
+import signal
+import threading
+import multiprocessing
+
+
+def split_ranges(total, parts):
+    """
+    تقسيم فضاء المهام إلى نطاقات فهارس متتالية ثابتة
+
+    المعلمات:
+        total (int): عدد المهام
+        parts (int): عدد الأجزاء
+
+    العائد:
+        list: أزواج (البداية، النهاية) غير فارغة
+    """
+    parts = max(1, min(parts, total))
+    size, extra = divmod(total, parts)
+    ranges = []
+    start = 0
+    for i in range(parts):
+        stop = start + size + (1 if i < extra else 0)
+        if stop > start:
+            ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+class ShardChannel:
+    """قناة العملية الفرعية: تجمع السجلات ونقاط الضعف والمهام المكتملة وترسلها على دفعات"""
+
+    def __init__(self, channel, shard_id, fuzzer, batch_size=256, interval=0.2):
+        """
+        تهيئة القناة
+
+        المعلمات:
+            channel (Queue): قائمة انتظار متعددة العمليات إلى العملية الرئيسية
+            shard_id (int): رقم الجزء
+            fuzzer (HTTPFuzzer): المشوش داخل العملية الفرعية
+            batch_size (int): عدد المهام المكتملة في كل دفعة
+            interval (float): أقصى مدة بين دفعتين بالثواني
+        """
+        self.channel = channel
+        self.shard_id = shard_id
+        self.fuzzer = fuzzer
+        self.batch_size = batch_size
+        self.interval = interval
+
+        self._records = []
+        self._done = []
+        self._sent_findings = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        """استقبال سجل من ResultStore (تعمل القناة كمصرف للسجلات)"""
+        values = tuple(getattr(record, name) for name in record.__slots__)
+        header_names = self.fuzzer.results.header_names[record.header_id]
+        with self._lock:
+            self._records.append((values, header_names))
+
+    def completed(self, task):
+        """تسجيل اكتمال مهمة وإرسال الدفعة عند امتلائها أو مرور الفترة المحددة"""
+        with self._lock:
+            self._done.append((task['mode'], task['task_index']))
+            if len(self._done) >= self.batch_size or time.monotonic() - self._last_flush >= self.interval:
+                self._flush()
+
+    def _flush(self):
+        """إرسال الدفعة الحالية"""
+        with self.fuzzer.results_lock:
+            findings = self.fuzzer.vulnerable_params[self._sent_findings:]
+            self._sent_findings += len(findings)
+
+        if self._records or self._done or findings:
+            # لقطة تراكمية من مقاييس العملية الفرعية تستبدل سابقتها في العملية الرئيسية
+            self.channel.put(('batch', self.shard_id, self._records, findings, self._done,
+                              self.fuzzer.metrics.snapshot()))
+            self._records = []
+            self._done = []
+        self._last_flush = time.monotonic()
+
+    def read(self):
+        """السجلات الكاملة تحفظ في العملية الرئيسية فقط"""
+        return iter(())
+
+    def close(self):
+        """إرسال ما تبقى"""
+        with self._lock:
+            self._flush()
+
+
+def run_shard(shard_id, options, state, start, stop, channel):
+    """
+    نقطة دخول العملية الفرعية: تنفيذ نطاق من المهام بمحرك الإدخال والإخراج المحدد
+
+    المعلمات:
+        shard_id (int): رقم الجزء
+        options (dict): وسائط HTTPFuzzer
+        state (dict): حالة العملية الرئيسية من HTTPFuzzer.shard_state
+        start (int): أول فهرس عام
+        stop (int): نهاية النطاق (غير مشمولة)
+        channel (Queue): قائمة الانتظار إلى العملية الرئيسية
+    """
+    # العملية الرئيسية هي من يقرر الإيقاف عند المقاطعة
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    from urlget.fuzzer import HTTPFuzzer
+    from urlget.transport import configure_transport
+
+    try:
+        configure_transport(**state['transport'])
+        fuzzer = HTTPFuzzer(**options)
+        fuzzer.apply_shard_state(state)
+
+        shard_channel = ShardChannel(channel, shard_id, fuzzer)
+        fuzzer.results.sink = shard_channel
+        fuzzer.run_engine(fuzzer.iter_range(start, stop), shard_channel.completed, stop - start)
+        shard_channel.close()
+        fuzzer.dedup.close()
+        channel.put(('done', shard_id, {'dedup_hits': fuzzer.dedup.hits}))
+    except Exception as e:
+        channel.put(('error', shard_id, str(e)))
+
+
+class ShardPool:
+    """تشغيل أجزاء فضاء المهام في عمليات منفصلة ودمج رسائلها في العملية الرئيسية"""
+
+    def __init__(self, logger=None, metrics=None):
+        """
+        تهيئة المجمع
+
+        المعلمات:
+            logger (Logger): مسجل الأحداث
+            metrics (MetricsRegistry): سجل مقاييس العملية الرئيسية لدمج مقاييس العمليات الفرعية
+        """
+        self.logger = logger
+        self.metrics = metrics
+        # spawn بدلاً من fork حتى لا ترث العمليات الفرعية مقابس الناقل المشترك ومواضيعه
+        self._context = multiprocessing.get_context('spawn')
+
+    def run(self, options, state, ranges, on_batch):
+        """
+        تشغيل الأجزاء وانتظار اكتمالها
+
+        المعلمات:
+            options (dict): وسائط HTTPFuzzer
+            state (dict): حالة العملية الرئيسية
+            ranges (list): نطاقات الفهارس لكل عملية
+            on_batch (callable): دالة تستدعى بـ (السجلات، نقاط الضعف، المهام المكتملة) لكل دفعة
+
+        العائد:
+            dict: إحصائيات مجمعة من العمليات الفرعية
+        """
+        channel = self._context.Queue()
+        processes = {}
+        for shard_id, (start, stop) in enumerate(ranges):
+            process = self._context.Process(target=run_shard,
+                                            args=(shard_id, options, state, start, stop, channel),
+                                            daemon=True)
+            process.start()
+            processes[shard_id] = process
+
+        stats = {}
+        running = set(processes)
+        try:
+            while running:
+                try:
+                    message = channel.get(timeout=0.5)
+                except queue.Empty:
+                    # عملية انتهت دون إرسال رسالة الاكتمال (مثل انهيار المفسر)
+                    for shard_id in list(running):
+                        if not processes[shard_id].is_alive():
+                            running.discard(shard_id)
+                            if self.logger:
+                                self.logger.error(f"توقفت العملية {shard_id} بشكل غير متوقع "
+                                                  f"(رمز الخروج {processes[shard_id].exitcode})")
+                    continue
+
+                kind, shard_id = message[0], message[1]
+                if kind == 'batch':
+                    on_batch(message[2], message[3], message[4])
+                    if self.metrics is not None:
+                        self.metrics.merge_remote(('shard', shard_id), message[5])
+                elif kind == 'done':
+                    running.discard(shard_id)
+                    for name, value in message[2].items():
+                        stats[name] = stats.get(name, 0) + value
+                elif kind == 'error':
+                    running.discard(shard_id)
+                    if self.logger:
+                        self.logger.error(f"فشلت العملية {shard_id}: {message[2]}")
+        finally:
+            for process in processes.values():
+                if process.is_alive():
+                    process.terminate()
+                process.join()
+
+        return stats
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة مطابقة تواقيع رسائل الخطأ في الاستجابات لأداة urlget
+"""
+
+import re
+import json
+import codecs
+from collections import namedtuple
+
+from urlget.charset import ascii_compatible, bom_encoding
+
+# نتيجة مطابقة واحدة: اسم التوقيع، الحزمة، وإزاحة البداية والنهاية بالبايت
+SignatureHit = namedtuple('SignatureHit', 'name pack start end')
+
+# حزم التواقيع المدمجة مجمعة حسب الواجهة الخلفية
+# الترتيب مهم: عند تطابق عدة تواقيع في نفس الموضع يفوز الأسبق، لذا تأتي الحزمة العامة أخيرًا
+SIGNATURE_PACKS = {
+    'mysql': {
+        'mysql-syntax': r"error in your SQL syntax",
+        'mysql-fetch-array': r"mysqli?_fetch_array",
+        'mysql-warning': r"Warning.{0,40}\bmysqli?_",
+        'mysql-server-version': r"check the manual that corresponds to your (?:MySQL|MariaDB) server version",
+    },
+    'oracle': {
+        'oracle-ora-code': r"\bORA-\d{5}",
+        'oracle-error': r"Oracle error",
+        'oracle-driver': r"oracle\.jdbc\.driver",
+    },
+    'mssql': {
+        'mssql-odbc': r"ODBC SQL Server Driver",
+        'mssql-native-client': r"Microsoft SQL Native Client error",
+        'mssql-oledb': r"Microsoft OLE DB Provider for SQL Server",
+        'mssql-unclosed-quotation': r"unclosed quotation mark",
+        'mssql-sqlexception': r"System\.Data\.SqlClient\.SqlException",
+    },
+    'postgresql': {
+        'postgresql-error': r"PostgreSQL ERROR",
+        'postgresql-query': r"pg_(?:query|exec)\(\)",
+        'postgresql-syntax': r"syntax error at or near",
+        'postgresql-psql': r"org\.postgresql\.util\.PSQLException",
+    },
+    'template': {
+        'jinja2': r"jinja2\.exceptions\.\w+",
+        'twig': r"Twig[_\\]Error",
+        'freemarker': r"freemarker\.core\.\w+Exception",
+        'velocity': r"org\.apache\.velocity\.exception",
+        'smarty': r"Smarty(?:Compiler)?Exception",
+        'erb': r"\(erb\):\d+",
+    },
+    'stacktrace': {
+        'python-traceback': r"Traceback \(most recent call last\)",
+        'java-stacktrace': r"\bat [\w$.]+\([\w$]+\.java:\d+\)",
+        'dotnet-exception': r"\bSystem\.\w+Exception\b",
+        'php-error': r"<b>(?:Fatal error|Parse error|Warning)</b>:",
+        'node-stacktrace': r"\bat [\w.<>]+ \(/[^)]+\.js:\d+:\d+\)",
+        'ruby-backtrace': r"\.rb:\d+:in `",
+    },
+    'generic': {
+        'sql-syntax': r"SQL syntax",
+        'xpath-syntax': r"XPATH syntax error",
+        'syntax-error': r"syntax error",
+        'unterminated-string': r"unterminated string",
+    },
+}
+
+
+class SignatureMatcher:
+    """مطابق يجمع جميع التواقيع في تعبير منتظم واحد ويفحص الجسم في تمريرة واحدة"""
+
+    def __init__(self, packs=None, extra_packs=None):
+        """
+        تهيئة المطابق
+
+        المعلمات:
+            packs (list): أسماء الحزم المدمجة المراد تحميلها (الافتراضي: جميعها)
+            extra_packs (dict): حزم إضافية بالشكل {الحزمة: {الاسم: النمط}}
+        """
+        selected = dict(SIGNATURE_PACKS)
+        if packs is not None:
+            unknown = [pack for pack in packs if pack not in SIGNATURE_PACKS]
+            if unknown:
+                raise ValueError(f"حزم تواقيع غير معروفة: {', '.join(unknown)}")
+            selected = {pack: SIGNATURE_PACKS[pack] for pack in packs}
+
+        if extra_packs:
+            for pack, signatures in extra_packs.items():
+                selected.setdefault(pack, {})
+                selected[pack] = dict(selected[pack], **signatures)
+
+        self.signatures = [(name, pack, pattern)
+                           for pack, signatures in selected.items()
+                           for name, pattern in signatures.items()]
+        self._regex = self._compile()
+
+    def _compile(self):
+        """تجميع التواقيع في تعبير منتظم واحد بمجموعة مسماة لكل توقيع"""
+        if not self.signatures:
+            return None
+
+        alternatives = [f"(?P<s{i}>{pattern})" for i, (_, _, pattern) in enumerate(self.signatures)]
+        return re.compile("|".join(alternatives).encode('utf-8'), re.IGNORECASE)
+
+    @classmethod
+    def from_file(cls, path, packs=None):
+        """
+        إنشاء مطابق مع حزم إضافية من ملف JSON
+
+        المعلمات:
+            path (str): مسار ملف JSON بالشكل {الحزمة: {الاسم: النمط}}
+            packs (list): أسماء الحزم المدمجة المراد تحميلها
+
+        العائد:
+            SignatureMatcher: المطابق الجديد
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            extra_packs = json.load(f)
+        return cls(packs=packs, extra_packs=extra_packs)
+
+    def _hit(self, match, offset=0):
+        """تحويل نتيجة التعبير المنتظم إلى SignatureHit"""
+        name, pack, _ = self.signatures[int(match.lastgroup[1:])]
+        return SignatureHit(name, pack, offset + match.start(), offset + match.end())
+
+    def search(self, data):
+        """
+        البحث عن أول توقيع في البيانات
+
+        المعلمات:
+            data (bytes): جسم الاستجابة
+
+        العائد:
+            SignatureHit: أول تطابق أو None
+        """
+        if self._regex is None:
+            return None
+        match = self._regex.search(data)
+        return self._hit(match) if match else None
+
+    def scan(self, data):
+        """
+        فحص البيانات وإرجاع جميع التواقيع المطابقة مع إزاحاتها
+
+        المعلمات:
+            data (bytes): جسم الاستجابة
+
+        العائد:
+            list: قائمة SignatureHit مرتبة حسب الإزاحة
+        """
+        if self._regex is None:
+            return []
+        return [self._hit(match) for match in self._regex.finditer(data)]
+
+    def stream(self, literals=(), overlap=512):
+        """
+        إنشاء فاحص تدريجي يعمل على أجزاء الجسم أثناء وصولها
+
+        المعلمات:
+            literals (iterable): سلاسل بايت إضافية للبحث عنها (مثل الحمولة المنعكسة)
+            overlap (int): عدد البايتات المحتفظ بها من الجزء السابق لالتقاط التطابقات العابرة للحدود
+
+        العائد:
+            StreamScan: الفاحص التدريجي
+        """
+        return StreamScan(self, literals, overlap)
+
+
+class StreamScan:
+    """فحص تدريجي للتواقيع والسلاسل الحرفية عبر أجزاء متتالية من الجسم"""
+
+    def __init__(self, matcher, literals=(), overlap=512):
+        """
+        تهيئة الفاحص
+
+        المعلمات:
+            matcher (SignatureMatcher): المطابق المجمع
+            literals (iterable): سلاسل بايت للبحث عنها
+            overlap (int): حجم التداخل بين الأجزاء
+        """
+        self.matcher = matcher
+        self.literals = [literal for literal in literals if literal]
+        self.overlap = max([overlap] + [len(literal) - 1 for literal in self.literals])
+        self.hits = []
+        self.found = set()
+        # (الاسم، إزاحة البداية) للتطابقات المبلغ عنها التي قد تتكرر في التداخل
+        self._reported = set()
+        self._tail = b""
+        self._offset = 0
+        self.encoding = None
+        self._started = False
+        self._decoder = None
+
+    def start(self, encoding=None):
+        """
+        تحديد الترميز المتوقع للجسم قبل أول جزء (علامة ترتيب البايت في الجسم تتقدم عليه)
+
+        التواقيع والسلاسل الحرفية مكتوبة بترميز متوافق مع ASCII؛ الأجسام بترميز غير متوافق
+        (مثل UTF-16) تحول إلى UTF-8 أثناء الفحص، وتصبح الإزاحات في النص المحول.
+
+        المعلمات:
+            encoding (str): الترميز من الرؤوس أو من استجابات سابقة، أو None
+        """
+        self.encoding = encoding
+
+    def _begin(self, chunk):
+        """اختيار طريقة الفحص عند أول جزء"""
+        self._started = True
+        encoding = bom_encoding(chunk) or self.encoding
+        if encoding is not None and not ascii_compatible(encoding):
+            self._decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+
+    def feed(self, chunk):
+        """
+        فحص جزء جديد من الجسم
+
+        المعلمات:
+            chunk (bytes): الجزء الجديد
+        """
+        if not self._started:
+            self._begin(chunk)
+        if self._decoder is not None:
+            chunk = self._decoder.decode(chunk).encode('utf-8')
+        self._scan(chunk)
+
+    def finish(self):
+        """نهاية الجسم: فحص البايتات المتبقية في مفكك الترميز التدريجي"""
+        if self._decoder is not None:
+            rest = self._decoder.decode(b"", final=True).encode('utf-8')
+            self._decoder = None
+            if rest:
+                self._scan(rest)
+
+    def _scan(self, chunk):
+        """فحص جزء بترميز متوافق مع ASCII مع التداخل من الجزء السابق"""
+        buffer = self._tail + chunk
+        boundary = len(self._tail)
+
+        if self.matcher._regex is not None:
+            for match in self.matcher._regex.finditer(buffer):
+                # التطابقات المحصورة في التداخل تم الإبلاغ عنها في الجزء السابق، والنمط متغير الطول
+                # قد يطابق من نفس البداية ويمتد بعد الحد، فيميز التطابق باسمه وإزاحة بدايته
+                if match.end() > boundary:
+                    hit = self.matcher._hit(match, self._offset)
+                    key = (hit.name, hit.start)
+                    if key not in self._reported:
+                        self._reported.add(key)
+                        self.hits.append(hit)
+
+        for literal in self.literals:
+            if literal not in self.found and literal in buffer:
+                self.found.add(literal)
+
+        self._tail = buffer[-self.overlap:] if self.overlap else b""
+        self._offset += len(buffer) - len(self._tail)
+        # لا يبدأ تطابق لاحق قبل بداية التداخل
+        self._reported = {key for key in self._reported if key[1] >= self._offset}
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة فحص عدة أهداف عبر محرك واحد مع جدولة عادلة بين المضيفين لأداة urlget
+"""
+
+import sys
+import asyncio
+import logging
+import threading
+from collections import deque
+from urllib.parse import urlparse
+
+from colorama import Fore, Style
+from tqdm import tqdm
+
+from urlget.engine import ThreadEngine, AsyncEngine
+from urlget.fuzzer import HTTPFuzzer
+from urlget.results import ResultStore, open_sink
+from urlget.xss import XSSScanner
+from urlget.utils import setup_logger
+
+# علامة نفاد جميع مصادر المهام
+_DONE = object()
+
+
+def load_targets(source):
+    """
+    قراءة قائمة الأهداف من ملف أو من الإدخال القياسي
+
+    المعلمات:
+        source (str): مسار الملف، أو "-" للإدخال القياسي
+
+    العائد:
+        list: العناوين بترتيبها دون تكرار أو أسطر فارغة أو تعليقات
+    """
+    if source == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(source, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+
+    targets = []
+    seen = set()
+    for line in lines:
+        url = line.strip()
+        if not url or url.startswith('#') or url in seen:
+            continue
+        seen.add(url)
+        targets.append(url)
+    return targets
+
+
+def _owned(owner, items):
+    """إرفاق الكائن المالك (مشوش أو ماسح الهدف) بكل مهمة"""
+    for item in items:
+        yield owner, item
+
+
+def host_limit(limit, workers, hosts):
+    """
+    حد التزامن لكل مضيف
+
+    دون حد صريح تقسم العمال بالتساوي على المضيفين، حتى لا يحجز مضيف بطيء
+    جميع العمال بمهامه التي تكتمل ببطء.
+    """
+    if limit > 0:
+        return limit
+    return max(1, -(-workers // max(1, hosts)))
+
+
+class HostScheduler:
+    """مصدر مهام يوزعها بالتناوب بين المضيفين مع حد أقصى للمهام الجارية لكل مضيف"""
+
+    def __init__(self, limit=0):
+        """
+        تهيئة الجدولة
+
+        المعلمات:
+            limit (int): الحد الأقصى للمهام الجارية (أو المنتظرة في قائمة المحرك) لكل مضيف (0 بلا حد)
+        """
+        self.limit = limit
+        self._order = deque()
+        self._streams = {}
+        self._in_flight = {}
+        self._cond = threading.Condition()
+        self._wakeup = None
+
+    def add(self, host, items):
+        """
+        إضافة مصدر مهام لمضيف؛ مصادر المضيف الواحد تتناوب فيما بينها
+
+        المعلمات:
+            host (str): المضيف
+            items (iterable): المهام، تسحب عند الحاجة فقط
+        """
+        with self._cond:
+            if host not in self._streams:
+                self._streams[host] = deque()
+                self._in_flight[host] = 0
+                self._order.append(host)
+            self._streams[host].append(iter(items))
+
+    def _pick(self):
+        """
+        اختيار المهمة التالية من أول مضيف لم يبلغ حده
+
+        العائد:
+            (المضيف، المهمة)، أو None إذا بلغت جميع المضيفين حدودها، أو _DONE عند نفاد المهام
+        """
+        for _ in range(len(self._order)):
+            host = self._order[0]
+            self._order.rotate(-1)
+            if self.limit and self._in_flight[host] >= self.limit:
+                continue
+
+            streams = self._streams[host]
+            while streams:
+                stream = streams[0]
+                streams.rotate(-1)
+                try:
+                    item = next(stream)
+                except StopIteration:
+                    # المصدر المنتهي أصبح في آخر القائمة بعد التدوير
+                    streams.pop()
+                    continue
+                self._in_flight[host] += 1
+                return host, item
+
+            # لم يبق للمضيف مصادر؛ أصبح في آخر الترتيب بعد التدوير
+            self._order.pop()
+            del self._streams[host]
+
+        return None if self._order else _DONE
+
+    def __iter__(self):
+        """مكرر للمحرك المعتمد على المواضيع؛ ينتظر عند بلوغ جميع المضيفين حدودها"""
+        while True:
+            with self._cond:
+                entry = self._pick()
+                while entry is None:
+                    self._cond.wait()
+                    entry = self._pick()
+            if entry is _DONE:
+                return
+            yield entry
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        """المهمة التالية لمحرك asyncio؛ تنتظر دون إيقاف الحلقة"""
+        while True:
+            with self._cond:
+                entry = self._pick()
+            if entry is _DONE:
+                raise StopAsyncIteration
+            if entry is not None:
+                return entry
+            if self._wakeup is None:
+                self._wakeup = asyncio.Event()
+            self._wakeup.clear()
+            await self._wakeup.wait()
+
+    def release(self, host):
+        """تحرير مكان مهمة مكتملة للمضيف"""
+        with self._cond:
+            self._in_flight[host] -= 1
+            self._cond.notify_all()
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+
+class MultiTargetFuzzer:
+    """تشويش قائمة أهداف بمحرك واحد: لكل هدف مشوش خاص يتشارك الحمولات والتواقيع والناقل"""
+
+    def __init__(self, targets, host_concurrency=0, template_factory=None, results_file=None, **options):
+        """
+        تهيئة المشوش
+
+        المعلمات:
+            targets (list): عناوين الأهداف
+            host_concurrency (int): الحد الأقصى للطلبات الجارية لكل مضيف (0 لتقسيم العمال بالتساوي)
+            template_factory (callable): دالة تعيد قالب الطلب لعنوان هدف، أو None
+            results_file (str): ملف السجلات المشترك لجميع الأهداف
+            options: وسائط HTTPFuzzer المشتركة
+        """
+        self.targets = targets
+        self.host_concurrency = host_concurrency
+        self.template_factory = template_factory
+        self.results_file = results_file
+        # نقاط الحفظ والعمليات والمنسق تعتمد على فضاء مهام هدف واحد
+        self.options = dict(options, checkpoint=False, resume=False, processes=1, listen=None)
+        self.engine = self.options.get('engine', 'thread')
+        self.threads = self.options.get('threads', 10)
+        self.concurrency = self.options.get('concurrency', 500)
+
+        self.logger = setup_logger("MultiTargetFuzzer", level=logging.DEBUG if options.get('verbose') else logging.INFO)
+        self.fuzzers = []
+        self.completed = {}
+        self.progress_lock = threading.Lock()
+
+    def _build(self):
+        """إنشاء مشوش لكل هدف ومشاركة الحالة الثقيلة بينها"""
+        results = ResultStore(open_sink(self.results_file))
+        shared = None
+        for url in self.targets:
+            template = self.template_factory(url) if self.template_factory else None
+            if shared is None:
+                fuzzer = HTTPFuzzer(url, template=template, **self.options)
+                fuzzer.load_payloads()
+                shared = fuzzer
+            else:
+                # التواقيع وذاكرة الطلبات تنشأ مرة واحدة وتمرر لمشوش كل هدف، والحمولات تحمل مرة واحدة
+                fuzzer = HTTPFuzzer(url, template=template, matcher=shared.matcher, dedup=shared.dedup,
+                                    **self.options)
+                fuzzer.payloads = shared.payloads
+                fuzzer.payload_stats = shared.payload_stats
+                fuzzer.print_lock = shared.print_lock
+            fuzzer.results = results
+            fuzzer.host = urlparse(fuzzer.url).netloc
+            self.fuzzers.append(fuzzer)
+            self.completed[fuzzer] = 0
+        return results, shared
+
+    def _workers(self):
+        """عدد العمال في المحرك المحدد"""
+        return self.concurrency if self.engine == "async" else self.threads
+
+    def _schedule(self, items_for, limit):
+        """إنشاء جدولة بمصدر مهام لكل هدف"""
+        scheduler = HostScheduler(limit)
+        for fuzzer in self.fuzzers:
+            scheduler.add(fuzzer.host, _owned(fuzzer, items_for(fuzzer)))
+        return scheduler
+
+    def start(self):
+        """بدء تشويش جميع الأهداف"""
+        print(f"{Fore.GREEN}[+] بدء التشويش لـ {len(self.targets)} هدف...{Style.RESET_ALL}")
+        results, shared = self._build()
+        if shared is None:
+            print(f"{Fore.YELLOW}[!] قائمة الأهداف فارغة{Style.RESET_ALL}")
+            results.close()
+            return {'targets': []}
+
+        hosts = len({fuzzer.host for fuzzer in self.fuzzers})
+        limit = host_limit(self.host_concurrency, self._workers(), hosts)
+        self.logger.info(f"{len(self.fuzzers)} هدف على {hosts} مضيف، بحد {limit} طلب متزامن لكل مضيف")
+
+        try:
+            # الاستجابات الأساسية لكل هدف متسلسلة، والأهداف تلتقط بالتوازي بنفس الحد لكل مضيف
+            scheduler = self._schedule(lambda fuzzer: [None], limit)
+            ThreadEngine(threads=min(self.threads, len(self.fuzzers)), logger=self.logger).run(
+                scheduler, lambda entry: entry[1][0].capture_baselines(),
+                on_complete=lambda entry: scheduler.release(entry[0]))
+
+            total_tasks = sum(fuzzer.count_tasks() for fuzzer in self.fuzzers)
+            print(f"{Fore.CYAN}[*] تم إنشاء {total_tasks} مهمة للتشويش{Style.RESET_ALL}")
+            if total_tasks:
+                progress_bar = tqdm(total=total_tasks, desc="التقدم", unit="طلب")
+                shared.metrics.gauge("tasks_total", "عدد مهام التشويش", lambda: total_tasks)
+                shared.metrics.gauge("tasks_completed", "مهام التشويش المكتملة (بما فيها المستأنفة)",
+                                     lambda: progress_bar.n)
+                try:
+                    self._run(self._schedule(lambda fuzzer: fuzzer.iter_tasks(), limit), progress_bar)
+                finally:
+                    progress_bar.close()
+                if shared.payload_stats is not None:
+                    shared.payload_stats.save()
+        finally:
+            results.close()
+            shared.dedup.close()
+
+        return self.report(results)
+
+    def _run(self, scheduler, progress_bar):
+        """تنفيذ مهام جميع الأهداف بمحرك واحد"""
+        def on_complete(entry):
+            host, (fuzzer, task) = entry
+            scheduler.release(host)
+            with self.progress_lock:
+                self.completed[fuzzer] += 1
+                progress_bar.update(1)
+
+        if self.engine == "async":
+            asyncio.run(self._run_async(scheduler, on_complete))
+        else:
+            engine = ThreadEngine(threads=self.threads, logger=self.logger)
+            self.fuzzers[0].metrics.gauge("queue_depth", "المهام بانتظار عامل متفرغ (أو قيد التنفيذ في محرك async)",
+                                          engine.depth)
+            engine.run(scheduler, lambda entry: entry[1][0]._process_task(entry[1][1]), on_complete=on_complete)
+
+    async def _run_async(self, scheduler, on_complete):
+        """تشغيل محرك asyncio بجلسة واحدة مشتركة بين الأهداف"""
+        engine = AsyncEngine(concurrency=self.concurrency, logger=self.logger)
+        fuzzer = self.fuzzers[0]
+        fuzzer.metrics.gauge("queue_depth", "المهام بانتظار عامل متفرغ (أو قيد التنفيذ في محرك async)", engine.depth)
+
+        async with fuzzer.transport.async_session(self.concurrency) as session:
+            await engine.run(scheduler, lambda entry: entry[1][0]._process_task_async(session, entry[1][1]),
+                             on_complete=on_complete)
+
+    def report(self, results):
+        """
+        عرض النتائج لكل هدف
+
+        العائد:
+            dict: ملخص كل هدف ونقاط ضعفه والملخص العام
+        """
+        summary = results.summary()
+        vulnerable = [fuzzer for fuzzer in self.fuzzers if fuzzer.vulnerable_params]
+
+        print(f"\n{Fore.GREEN}[+] اكتمل التشويش!{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}[*] تم اختبار {len(results)} طلبات على {len(self.fuzzers)} هدف - "
+              f"رموز الحالة: {summary['status_counts']}{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}[*] أهداف بها نقاط ضعف محتملة: {len(vulnerable)}{Style.RESET_ALL}")
+
+        for fuzzer in vulnerable:
+            print(f"\n{Fore.YELLOW}[!] {fuzzer.url} ({len(fuzzer.vulnerable_params)} نقطة ضعف محتملة "
+                  f"من {self.completed[fuzzer]} مهمة){Style.RESET_ALL}")
+            for vuln in fuzzer.vulnerable_params:
+                print(f"  - المعلمة: {vuln['param_name']}")
+                print(f"    الحمولة: {vuln['payload']}")
+
+        return {
+            'total_requests': len(results),
+            'summary': summary,
+            'targets': [{
+                'url': fuzzer.url,
+                'tasks': self.completed[fuzzer],
+                'vulnerable_params': fuzzer.vulnerable_params,
+            } for fuzzer in self.fuzzers],
+        }
+
+
+class MultiTargetXSS:
+    """فحص XSS لقائمة أهداف؛ كل نقطة حقن (معلمة أو نماذج صفحة) مهمة في محرك واحد"""
+
+    def __init__(self, targets, threads=10, host_concurrency=0, **options):
+        """
+        تهيئة الماسح
+
+        المعلمات:
+            targets (list): عناوين الأهداف
+            threads (int): عدد المواضيع
+            host_concurrency (int): الحد الأقصى لنقاط الحقن المفحوصة بالتوازي لكل مضيف (0 لتقسيم المواضيع بالتساوي)
+            options: وسائط XSSScanner المشتركة
+        """
+        self.targets = targets
+        self.threads = threads
+        self.host_concurrency = host_concurrency
+        self.options = options
+        self.logger = setup_logger("MultiTargetXSS", level=logging.DEBUG if options.get('verbose') else logging.INFO)
+        self.scanners = []
+        self.lock = threading.Lock()
+
+    def _units(self, scanner):
+        """
+        نقاط الحقن لهدف واحد
+
+        كل معلمة تفحص بالتسلسل حتى أول انعكاس كما في فحص هدف واحد؛
+        النماذج تتطلب جلب الصفحة أولاً فتفحص كوحدة واحدة.
+        """
+        base_url, params = scanner.parse_url()
+        for param_name in scanner.target_params(params):
+            yield lambda name=param_name: [scanner.scan_param(base_url, params, name)]
+        yield scanner.scan_forms
+
+    def _run_unit(self, entry):
+        """تنفيذ نقطة حقن وتسجيل الثغرات في ماسح الهدف"""
+        scanner, unit = entry[1]
+        found = [vuln for vuln in unit() if vuln]
+        if found:
+            with self.lock:
+                scanner.vulnerable_params.extend(found)
+
+    def start(self):
+        """بدء فحص جميع الأهداف"""
+        print(f"{Fore.GREEN}[+] بدء فحص ثغرات XSS لـ {len(self.targets)} هدف...{Style.RESET_ALL}")
+
+        payloads = None
+        for url in self.targets:
+            scanner = XSSScanner(url, **self.options)
+            if payloads is None:
+                scanner.load_payloads()
+                payloads = scanner.payloads
+                print_lock = scanner.print_lock
+            scanner.payloads = payloads
+            scanner.print_lock = print_lock
+            scanner.host = urlparse(url).netloc
+            self.scanners.append(scanner)
+
+        hosts = len({scanner.host for scanner in self.scanners})
+        limit = host_limit(self.host_concurrency, self.threads, hosts)
+        scheduler = HostScheduler(limit)
+        for scanner in self.scanners:
+            scheduler.add(scanner.host, _owned(scanner, self._units(scanner)))
+
+        ThreadEngine(threads=self.threads, logger=self.logger).run(
+            scheduler, self._run_unit, on_complete=lambda entry: scheduler.release(entry[0]))
+
+        vulnerable = [scanner for scanner in self.scanners if scanner.vulnerable_params]
+        print(f"\n{Fore.GREEN}[+] اكتمل فحص XSS!{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}[*] أهداف بها ثغرات XSS محتملة: {len(vulnerable)} من {len(self.scanners)}{Style.RESET_ALL}")
+
+        for scanner in vulnerable:
+            print(f"\n{Fore.YELLOW}[!] {scanner.url}{Style.RESET_ALL}")
+            for vuln in scanner.vulnerable_params:
+                if 'param_name' in vuln:
+                    print(f"  - المعلمة: {vuln['param_name']}")
+                else:
+                    print(f"  - النموذج: {vuln['form_action']} ({vuln['form_method']}) الحقل: {vuln['input_name']}")
+                print(f"    الحمولة: {vuln['payload']}")
+
+        return {
+            'targets': [{'url': scanner.url, 'vulnerabilities': scanner.vulnerable_params}
+                        for scanner in self.scanners],
+        }
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة قوالب طلبات HTTP الخام مع نقاط حقن مجمعة مسبقًا لأداة urlget
+"""
+
+import json
+from urllib.parse import quote, quote_plus
+
+from urlget.jsonbody import JSONBody
+
+# علامة نقطة الحقن الافتراضية داخل القالب
+DEFAULT_MARKER = "FUZZ"
+
+# رؤوس يحسبها عميل HTTP بنفسه ولا يجب نسخها من الملف الخام
+_COMPUTED_HEADERS = ('host', 'content-length')
+
+
+def parse_raw_request(content, scheme="http"):
+    """
+    تحليل طلب HTTP خام (سطر الطلب، الرؤوس، سطر فارغ، الجسم)
+
+    المعلمات:
+        content (str): نص الطلب
+        scheme (str): المخطط المستخدم لبناء العنوان من رأس Host
+
+    العائد:
+        dict: الطريقة والعنوان والرؤوس والجسم
+    """
+    # توحيد نهايات الأسطر حتى يتم التعرف على السطر الفاصل في ملفات CRLF
+    request_lines = content.replace('\r\n', '\n').strip().split('\n')
+
+    # استخراج طريقة HTTP والمسار والإصدار
+    method, path, _ = request_lines[0].split(' ', 2)
+
+    # استخراج الرؤوس
+    headers = {}
+    i = 1
+    while i < len(request_lines) and request_lines[i]:
+        key, value = request_lines[i].split(':', 1)
+        headers[key.strip()] = value.strip()
+        i += 1
+
+    # استخراج الجسم
+    body = '\n'.join(request_lines[i + 1:]) if i < len(request_lines) else ''
+
+    # إنشاء عنوان URL كامل من رأس Host
+    host = headers.get('Host', '')
+    url = f"{scheme}://{host}{path}" if not path.startswith('http') else path
+
+    return {'method': method, 'url': url, 'headers': headers, 'body': body}
+
+
+def _encode_raw(payload):
+    """إدراج الحمولة كما هي"""
+    return payload.encode('utf-8')
+
+
+def _encode_url(payload):
+    """ترميز الحمولة لمسار أو استعلام URL"""
+    return quote(payload, safe='').encode('ascii')
+
+
+def _encode_form(payload):
+    """ترميز الحمولة لجسم application/x-www-form-urlencoded"""
+    return quote_plus(payload).encode('ascii')
+
+
+def _encode_json_string(payload):
+    """ترميز الحمولة داخل سلسلة JSON بين علامتي اقتباس"""
+    return json.dumps(payload)[1:-1].encode('utf-8')
+
+
+def _encode_header(payload):
+    """إدراج الحمولة في قيمة رأس دون محارف نهاية السطر"""
+    return payload.replace('\r', '').replace('\n', '').encode('utf-8')
+
+
+class _Section:
+    """جزء من الطلب مقسم إلى مقاطع بايت ثابتة بينها نقاط حقن"""
+
+    __slots__ = ('segments', 'encoders')
+
+    def __init__(self, data, marker, encoder_for):
+        """
+        تقسيم الجزء عند العلامات
+
+        المعلمات:
+            data (bytes): محتوى الجزء
+            marker (bytes): علامة نقطة الحقن
+            encoder_for (callable): دالة تعيد دالة الترميز المناسبة لنقطة حقن من (المقطع السابق، اللاحق)
+        """
+        self.segments = data.split(marker)
+        self.encoders = [encoder_for(self.segments[i], self.segments[i + 1])
+                         for i in range(len(self.segments) - 1)]
+
+    @property
+    def static(self):
+        """الجزء لا يحتوي على نقاط حقن"""
+        return not self.encoders
+
+    def render(self, payload, encoded):
+        """
+        بناء الجزء بلصق الحمولة المرمزة بين المقاطع
+
+        المعلمات:
+            payload (str): الحمولة
+            encoded (dict): ذاكرة الترميزات المحسوبة لهذه الحمولة (ترميز واحد لكل سياق)
+        """
+        if not self.encoders:
+            return self.segments[0]
+
+        parts = [self.segments[0]]
+        for encoder, segment in zip(self.encoders, self.segments[1:]):
+            value = encoded.get(encoder)
+            if value is None:
+                value = encoded[encoder] = encoder(payload)
+            parts.append(value)
+            parts.append(segment)
+        return b"".join(parts)
+
+
+class RequestTemplate:
+    """قالب طلب يجمع مرة واحدة إلى مقاطع بايت وتبنى كل نسخة منه بلصق الحمولة بينها"""
+
+    def __init__(self, method, url, headers=None, body="", marker=DEFAULT_MARKER):
+        """
+        تهيئة القالب
+
+        المعلمات:
+            method (str): طريقة HTTP
+            url (str): العنوان مع علامات الحقن
+            headers (dict): الرؤوس مع علامات الحقن في القيم
+            body (str): الجسم مع علامات الحقن
+            marker (str): علامة نقطة الحقن
+        """
+        self.method = method.upper()
+        self.url = url
+        self.headers = {name: value for name, value in (headers or {}).items()
+                        if name.lower() not in _COMPUTED_HEADERS}
+        self.body = body
+        self.marker = marker
+
+        marker_bytes = marker.encode('utf-8')
+        content_type = next((value for name, value in self.headers.items()
+                             if name.lower() == 'content-type'), '').lower()
+
+        self._url = _Section(url.encode('utf-8'), marker_bytes, lambda before, after: _encode_url)
+        self._body = _Section(body.encode('utf-8'), marker_bytes, self._body_encoder(content_type))
+
+        # الرؤوس الثابتة تشارك بين جميع النسخ دون نسخ القاموس
+        self._static_headers = {}
+        self._headers = []
+        for name, value in self.headers.items():
+            section = _Section(value.encode('utf-8'), marker_bytes, lambda before, after: _encode_header)
+            if section.static:
+                self._static_headers[name] = value
+            else:
+                self._headers.append((name, section))
+
+        self.injection_points = (len(self._url.encoders) + len(self._body.encoders)
+                                 + sum(len(section.encoders) for _, section in self._headers))
+
+        # جسم JSON دون علامات: كل قيمة طرفية فيه نقطة حقن مستقلة
+        self.json_body = None
+        if not self.injection_points and 'json' in content_type and body.strip():
+            try:
+                self.json_body = JSONBody(json.loads(body))
+            except ValueError:
+                pass
+
+    @staticmethod
+    def _body_encoder(content_type):
+        """اختيار دالة ترميز الحمولة في الجسم حسب نوع المحتوى"""
+        if 'application/x-www-form-urlencoded' in content_type:
+            return lambda before, after: _encode_form
+        if 'json' in content_type:
+            # داخل سلسلة JSON تهرب الحمولة، وخارجها (مثل "id": FUZZ) تدرج كما هي
+            return lambda before, after: (_encode_json_string if before.endswith(b'"') and after.startswith(b'"')
+                                          else _encode_raw)
+        return lambda before, after: _encode_raw
+
+    @classmethod
+    def from_file(cls, path, scheme="http", marker=DEFAULT_MARKER):
+        """
+        إنشاء قالب من ملف طلب HTTP خام
+
+        المعلمات:
+            path (str): مسار الملف
+            scheme (str): مخطط العنوان (http أو https)
+            marker (str): علامة نقطة الحقن
+
+        العائد:
+            RequestTemplate: القالب
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            request = parse_raw_request(f.read(), scheme)
+        return cls(request['method'], request['url'], request['headers'], request['body'], marker)
+
+    def render(self, payload, point=None):
+        """
+        بناء نسخة من الطلب بحمولة معينة
+
+        المعلمات:
+            payload (str): الحمولة
+            point (str): مسار قيمة جسم JSON المستبدلة (مع json_body فقط)، أو None للجسم الأصلي
+
+        العائد:
+            tuple: (العنوان، الرؤوس، الجسم بالبايت أو None)
+        """
+        if self.json_body is not None:
+            body = self.json_body.render(point, payload) if point is not None else self.json_body.data
+            return self.url, self._static_headers, body
+
+        encoded = {}
+        url = self._url.render(payload, encoded).decode('utf-8')
+
+        headers = self._static_headers
+        if self._headers:
+            headers = dict(self._static_headers)
+            for name, section in self._headers:
+                headers[name] = section.render(payload, encoded).decode('utf-8')
+
+        body = self._body.render(payload, encoded) if self.body else None
+        return url, headers, body
+
+    def to_dict(self):
+        """تحويل القالب إلى قاموس قابل للتحويل إلى JSON"""
+        return {'method': self.method, 'url': self.url, 'headers': self.headers,
+                'body': self.body, 'marker': self.marker}
+
+    @classmethod
+    def from_dict(cls, data):
+        """إنشاء قالب من قاموس to_dict"""
+        return cls(**data)
+
+    def __getstate__(self):
+        # دوال الترميز المجهولة لا تنقل؛ تعيد العملية الفرعية تجميع القالب
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        self.__init__(**state)
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة التحليل الإحصائي لأزمنة الاستجابة لكشف الثغرات العمياء المعتمدة على التأخير في أداة urlget
+"""
+
+import math
+import threading
+from collections import deque
+from functools import lru_cache
+
+# معامل تحويل الانحراف المطلق عن الوسيط إلى ما يكافئ الانحراف المعياري للتوزيع الطبيعي
+_MAD_SCALE = 1.4826
+
+
+def _median(values):
+    """وسيط قائمة مرتبة"""
+    n = len(values)
+    mid = n // 2
+    return values[mid] if n % 2 else (values[mid - 1] + values[mid]) / 2
+
+
+@lru_cache(maxsize=256)
+def _u_tail(n, m):
+    """
+    عدد الترتيبات التي تعطي إحصائية U أكبر من أو تساوي كل قيمة (التوزيع الدقيق دون تكرار)
+
+    توزيع U هو معاملات ذات الحدين الغاوسية [n+m, m]، ويحسب كحاصل ضرب
+    (1 - q^(n+i)) / (1 - q^i) لكل i من 1 إلى m بعمليات على مصفوفة واحدة.
+
+    العائد:
+        tuple: (ذيل تراكمي لكل قيمة U، العدد الكلي للترتيبات)
+    """
+    size = n * m + m + 1
+    counts = [1] + [0] * (size - 1)
+    for i in range(1, m + 1):
+        step = n + i
+        for k in range(size - 1, step - 1, -1):
+            counts[k] -= counts[k - step]
+        for k in range(i, size):
+            counts[k] += counts[k - i]
+
+    tail = [0] * (n * m + 2)
+    for u in range(n * m, -1, -1):
+        tail[u] = tail[u + 1] + counts[u]
+    return tuple(tail), tail[0]
+
+
+def mann_whitney_p(baseline, samples):
+    """
+    القيمة الاحتمالية لاختبار مان-ويتني أحادي الجانب: هل العينات أبطأ من الأساس؟
+
+    يستخدم التوزيع الدقيق عند عدم وجود قيم متساوية بين المجموعتين،
+    والتقريب الطبيعي مع تصحيح التساوي فيما عدا ذلك.
+
+    المعلمات:
+        baseline (list): أزمنة الاستجابات الأساسية
+        samples (list): أزمنة الطلب المشتبه به
+
+    العائد:
+        float: القيمة الاحتمالية
+    """
+    n, m = len(baseline), len(samples)
+    if not n or not m:
+        return 1.0
+
+    greater = ties = 0
+    for s in samples:
+        for b in baseline:
+            if s > b:
+                greater += 1
+            elif s == b:
+                ties += 1
+
+    if not ties:
+        tail, total = _u_tail(n, m)
+        return tail[greater] / total
+
+    # التقريب الطبيعي مع تصحيح الاستمرارية والتساوي
+    u = greater + ties / 2
+    pooled = {}
+    for value in list(baseline) + list(samples):
+        pooled[value] = pooled.get(value, 0) + 1
+    N = n + m
+    tie_term = sum(t ** 3 - t for t in pooled.values()) / (N * (N - 1))
+    variance = n * m / 12 * (N + 1 - tie_term)
+    if variance <= 0:
+        return 1.0
+    z = (u - 0.5 - n * m / 2) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+class LatencyProfile:
+    """توزيع أزمنة الاستجابة الأساسية لنقطة نهاية، يتجدد بأزمنة الطلبات العادية أثناء التشويش"""
+
+    def __init__(self, samples, window=64, refresh=16):
+        """
+        تهيئة التوزيع
+
+        المعلمات:
+            samples (list): أزمنة الاستجابات الأساسية بالثواني
+            window (int): عدد الأزمنة الأحدث المحتفظ بها
+            refresh (int): عدد الأزمنة الجديدة قبل إعادة حساب الإحصائيات
+        """
+        self.window = window
+        self.refresh = refresh
+        self._samples = deque(samples, maxlen=window)
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._update()
+
+    def _update(self):
+        """إعادة حساب الوسيط والتشتت من النافذة الحالية"""
+        self.sorted = sorted(self._samples)
+        self.median = _median(self.sorted)
+        self.scale = _MAD_SCALE * _median(sorted(abs(value - self.median) for value in self.sorted))
+        self._pending = 0
+
+    def observe(self, elapsed):
+        """إضافة زمن طلب عادي إلى النافذة (تتكيف مع تغير الحمل على الهدف)"""
+        with self._lock:
+            self._samples.append(elapsed)
+            self._pending += 1
+            if self._pending >= self.refresh:
+                self._update()
+
+    def to_dict(self):
+        """تحويل التوزيع إلى قاموس قابل للتحويل إلى JSON"""
+        return {'samples': list(self._samples), 'window': self.window, 'refresh': self.refresh}
+
+    @classmethod
+    def from_dict(cls, data):
+        """إنشاء توزيع من قاموس to_dict"""
+        return cls(**data)
+
+    def __getstate__(self):
+        # القفل لا ينقل بين العمليات
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+
+class TimingSession:
+    """اختبار متسلسل لطلب مشتبه به: إعادة الإرسال فقط حتى يحسم الاختبار الإحصائي"""
+
+    def __init__(self, analyzer, baseline, median, elapsed):
+        """
+        تهيئة الاختبار
+
+        المعلمات:
+            analyzer (TimingAnalyzer): إعدادات الاختبار
+            baseline (list): لقطة مرتبة من الأزمنة الأساسية
+            median (float): وسيط الأزمنة الأساسية
+            elapsed (float): زمن الطلب الأول
+        """
+        self.analyzer = analyzer
+        self.baseline = baseline
+        self.baseline_median = median
+        self.samples = [elapsed]
+        self.p_value = 1.0
+        self.confirmed = False
+        self.pending = True
+        self._decide()
+
+    def add(self, elapsed):
+        """إضافة زمن إعادة إرسال وتحديث القرار"""
+        self.samples.append(elapsed)
+        self._decide()
+
+    def abort(self):
+        """إيقاف الاختبار دون تأكيد (مثل فشل إعادة الإرسال)"""
+        self.pending = False
+
+    def _decide(self):
+        """تأكيد أو رفض أو طلب عينة أخرى"""
+        analyzer = self.analyzer
+        self.p_value = mann_whitney_p(self.baseline, self.samples)
+        effect = _median(sorted(self.samples)) - self.baseline_median
+
+        if (len(self.samples) >= analyzer.min_samples and self.p_value <= analyzer.alpha
+                and effect >= analyzer.min_delta):
+            self.confirmed = True
+            self.pending = False
+            return
+
+        remaining = analyzer.max_samples - len(self.samples)
+        if remaining <= 0:
+            self.pending = False
+            return
+
+        # لا فائدة من عينات إضافية إذا لم يكن التأكيد ممكنًا حتى لو كانت جميعها أبطأ من كل الأساس
+        best = mann_whitney_p(self.baseline, self.samples + [math.inf] * remaining)
+        if best > analyzer.alpha:
+            self.pending = False
+
+    def to_dict(self):
+        """ملخص الاختبار لتخزينه مع نتيجة الطلب"""
+        return {
+            'p_value': self.p_value,
+            'samples': self.samples,
+            'baseline_median': self.baseline_median,
+            'confirmed': self.confirmed,
+        }
+
+
+class TimingAnalyzer:
+    """كشف التأخير المتعمد في الاستجابة بمقارنة توزيعات الأزمنة بدلاً من عتبة ثابتة"""
+
+    def __init__(self, alpha=0.01, min_samples=3, max_samples=6, min_delta=0.5, spread=3.0):
+        """
+        تهيئة المحلل
+
+        المعلمات:
+            alpha (float): مستوى الدلالة لاختبار مان-ويتني
+            min_samples (int): أقل عدد من العينات قبل التأكيد (تأخير عابر واحد في الشبكة لا يكفي)
+            max_samples (int): الحد الأقصى لعينات الطلب المشتبه به (الطلب الأول وإعادات الإرسال)
+            min_delta (float): أقل فرق بين الوسيطين بالثواني يعتبر تأخيرًا حقيقيًا
+            spread (float): عدد وحدات التشتت فوق الوسيط التي تجعل الطلب مشتبهًا به
+        """
+        self.alpha = alpha
+        self.max_samples = max(1, max_samples)
+        self.min_samples = min(min_samples, self.max_samples)
+        self.min_delta = min_delta
+        self.spread = spread
+
+    def begin(self, profile, elapsed):
+        """
+        فحص أولي لزمن الطلب دون أي طلبات إضافية
+
+        المعلمات:
+            profile (LatencyProfile): توزيع نقطة النهاية
+            elapsed (float): زمن الطلب
+
+        العائد:
+            TimingSession: اختبار متسلسل إذا كان الطلب مشتبهًا به، أو None
+        """
+        with profile._lock:
+            baseline, median, scale = profile.sorted, profile.median, profile.scale
+
+        if elapsed - median < max(self.min_delta, self.spread * scale):
+            profile.observe(elapsed)
+            return None
+        return TimingSession(self, baseline, median, elapsed)
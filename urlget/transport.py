@@ -0,0 +1,647 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة النقل المشترك لطلبات HTTP في أداة urlget
+"""
+
+import time
+import socket
+import asyncio
+import threading
+import http.cookiejar
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+from urlget.engine import ResponseSample
+from urlget.charset import EncodingCache
+
+
+def _import_httpx():
+    """استيراد httpx عند طلب HTTP/2 فقط، فهو اعتماد اختياري"""
+    try:
+        import h2  # noqa: F401  httpx يحتاج حزمة h2 لدعم HTTP/2
+        import httpx
+    except ImportError:
+        raise ImportError("يتطلب HTTP/2 حزمة httpx مع دعم h2. استخدم pip install 'httpx[http2]'") from None
+    return httpx
+
+
+# أحداث تتبع httpcore التي تعني أن الطلب حصل على اتصال من المجمع
+_H2_ACQUIRED_EVENTS = ('connect_tcp.started', 'send_request_headers.started')
+
+
+def _queue_trace():
+    """
+    تتبع aiohttp يعيد بدء ساعة الطلب عند خروجه من طابور الموصل
+
+    العائد:
+        aiohttp.TraceConfig: إعداد التتبع لجلسة async_session
+    """
+    async def on_queued_end(session, context, params):
+        clock = context.trace_request_ctx
+        if clock is not None:
+            clock['start'] = time.monotonic()
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_connection_queued_end.append(on_queued_end)
+    return trace_config
+
+
+class DNSCache:
+    """ذاكرة تخزين مؤقت لنتائج تحليل أسماء المضيفين"""
+
+    def __init__(self, ttl=300):
+        """
+        تهيئة ذاكرة DNS المؤقتة
+
+        المعلمات:
+            ttl (int): مدة صلاحية السجل بالثواني
+        """
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def getaddrinfo(self, host, port, family=0, type=socket.SOCK_STREAM):
+        """تحليل المضيف مع إعادة استخدام النتيجة حتى انتهاء صلاحيتها"""
+        key = (host, port, family, type)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                return entry[1]
+
+        addresses = socket.getaddrinfo(host, port, family, type)
+
+        with self._lock:
+            self._entries[key] = (now + self.ttl, addresses)
+
+        return addresses
+
+    def clear(self):
+        """مسح جميع السجلات المخزنة"""
+        with self._lock:
+            self._entries.clear()
+
+
+def _cached_connection(base, cache):
+    """
+    صنف اتصال urllib3 يحلل اسم المضيف عبر ذاكرة DNS مع احترام عائلة العناوين التي يسمح بها urllib3
+
+    المعلمات:
+        base (type): صنف الاتصال الأصلي (HTTPConnection أو HTTPSConnection)
+        cache (DNSCache): ذاكرة الناقل
+
+    العائد:
+        type: الصنف الفرعي
+    """
+
+    class CachedDNSConnection(base):
+        def _new_conn(self):
+            host = self._dns_host
+            try:
+                addresses = cache.getaddrinfo(host, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+            except OSError:
+                # يترك لـ urllib3 تحويل خطأ التحليل إلى استثنائه المعتاد
+                return super()._new_conn()
+
+            # الاتصال بكل عنوان محلول بالترتيب؛ شهادة TLS و SNI تبقى لاسم المضيف الأصلي
+            error = None
+            try:
+                for _, _, _, _, sockaddr in addresses:
+                    self._dns_host = sockaddr[0]
+                    try:
+                        return super()._new_conn()
+                    except (NewConnectionError, ConnectTimeoutError) as e:
+                        error = e
+            finally:
+                self._dns_host = host
+            if error is None:
+                return super()._new_conn()
+            raise error
+
+    return CachedDNSConnection
+
+
+class CachedDNSAdapter(HTTPAdapter):
+    """محول requests تستخدم مجمعاته ذاكرة DNS الخاصة بالناقل دون تعديل urllib3 على مستوى العملية"""
+
+    __attrs__ = HTTPAdapter.__attrs__ + ['dns_cache']
+
+    def __init__(self, dns_cache, **kwargs):
+        """
+        تهيئة المحول
+
+        المعلمات:
+            dns_cache (DNSCache): ذاكرة DNS للاتصالات الجديدة
+            kwargs: وسائط HTTPAdapter
+        """
+        self.dns_cache = dns_cache
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': type('CachedDNSHTTPConnectionPool', (HTTPConnectionPool,),
+                         {'ConnectionCls': _cached_connection(HTTPConnection, self.dns_cache)}),
+            'https': type('CachedDNSHTTPSConnectionPool', (HTTPSConnectionPool,),
+                          {'ConnectionCls': _cached_connection(HTTPSConnection, self.dns_cache)}),
+        }
+
+
+class BodyCollector:
+    """تجميع جسم استجابة متدفق مع حد أقصى للحجم المحتفظ به"""
+
+    def __init__(self, max_bytes=0, mode='head', on_chunk=None):
+        """
+        تهيئة المجمع
+
+        المعلمات:
+            max_bytes (int): الحد الأقصى للبايتات المحتفظ بها (0 بلا حد)
+            mode (str): 'head' للتوقف بعد الحد، أو 'headtail' لقراءة الجسم كاملًا
+                        والاحتفاظ بالنصف الأول من الحد من البداية والنصف الآخر من النهاية
+            on_chunk (callable): دالة تستدعى مع كل جزء مستلم (للفحص التدريجي)
+        """
+        self.max_bytes = max_bytes
+        self.mode = mode
+        self.on_chunk = on_chunk
+        self.total_bytes = 0
+        self.truncated = False
+        self._head = bytearray()
+        self._tail = bytearray()
+
+    def feed(self, chunk):
+        """
+        إضافة جزء مستلم
+
+        العائد:
+            bool: False إذا يجب التوقف عن القراءة
+        """
+        self.total_bytes += len(chunk)
+        if self.on_chunk:
+            self.on_chunk(chunk)
+
+        if not self.max_bytes:
+            self._head += chunk
+            return True
+
+        if self.mode == 'headtail':
+            head_size = self.max_bytes // 2
+            room = head_size - len(self._head)
+            if room > 0:
+                self._head += chunk[:room]
+                chunk = chunk[room:]
+            if chunk:
+                self.truncated = True
+                self._tail += chunk
+                tail_size = self.max_bytes - head_size
+                if len(self._tail) > tail_size:
+                    del self._tail[:len(self._tail) - tail_size]
+            return True
+
+        room = self.max_bytes - len(self._head)
+        self._head += chunk[:room]
+        if len(chunk) > room:
+            self.truncated = True
+            return False
+        return True
+
+    def body(self):
+        """الجسم المحتفظ به"""
+        return bytes(self._head + self._tail)
+
+
+class HTTPTransport:
+    """ناقل HTTP مشترك مع مجمعات اتصالات لكل مضيف"""
+
+    def __init__(self, pool_connections=10, pool_maxsize=100, per_host_limit=0,
+                 dns_cache_ttl=300, keep_alive=True, timeout=10, verify=True,
+                 http2=False, http2_prior_knowledge=False):
+        """
+        تهيئة الناقل
+
+        المعلمات:
+            pool_connections (int): عدد مجمعات الاتصالات (مضيفين) المحتفظ بها
+            pool_maxsize (int): الحد الأقصى للاتصالات المفتوحة في كل مجمع
+            per_host_limit (int): الحد الأقصى للطلبات المتزامنة لكل مضيف (0 بلا حد)
+            dns_cache_ttl (int): مدة صلاحية ذاكرة DNS بالثواني (0 لتعطيلها)
+            keep_alive (bool): إبقاء الاتصالات مفتوحة بين الطلبات
+            timeout (float): المهلة الافتراضية للطلبات بالثواني
+            verify (bool): التحقق من شهادات TLS
+            http2 (bool): إرسال طلبات الفحص عبر HTTP/2 (تفاوض ALPN مع https) باستخدام httpx
+            http2_prior_knowledge (bool): استخدام HTTP/2 مباشرة دون تفاوض (h2c مع http)
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.per_host_limit = per_host_limit
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.verify = verify
+        self.http2 = http2 or http2_prior_knowledge
+        self.http2_prior_knowledge = http2_prior_knowledge
+
+        self.dns_cache = DNSCache(dns_cache_ttl) if dns_cache_ttl > 0 else None
+
+        self.session = requests.Session()
+        self.session.verify = verify
+        # عدم مشاركة ملفات تعريف الارتباط بين الطلبات حتى لا تؤثر استجابة على أخرى
+        self.session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        if not keep_alive:
+            self.session.headers['Connection'] = 'close'
+
+        # ذاكرة DNS خاصة بمجمعات هذا الناقل؛ الاتصالات الأخرى في العملية لا تتأثر
+        if self.dns_cache is not None:
+            adapter = CachedDNSAdapter(self.dns_cache, pool_connections=pool_connections,
+                                       pool_maxsize=pool_maxsize, max_retries=0)
+        else:
+            adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        # إشارات تحديد التزامن لكل مضيف
+        self._host_slots = {}
+        self._host_slots_lock = threading.Lock()
+
+        # عميل HTTP/2 المتزامن؛ ينشأ عند أول طلب فحص
+        self._h2_client = None
+        self._h2_lock = threading.Lock()
+
+        # ترميز الاستجابات لكل مضيف ونوع محتوى، حتى لا يحدد من الجسم في كل استجابة
+        self.encodings = EncodingCache()
+
+    def options(self):
+        """
+        إعدادات الناقل لإنشاء ناقل مكافئ في عملية أخرى
+
+        العائد:
+            dict: وسائط HTTPTransport
+        """
+        return {
+            'pool_connections': self.pool_connections,
+            'pool_maxsize': self.pool_maxsize,
+            'per_host_limit': self.per_host_limit,
+            'dns_cache_ttl': self.dns_cache_ttl,
+            'keep_alive': self.keep_alive,
+            'timeout': self.timeout,
+            'verify': self.verify,
+            'http2': self.http2,
+            'http2_prior_knowledge': self.http2_prior_knowledge,
+        }
+
+    @contextmanager
+    def host_slot(self, url):
+        """حجز مكان ضمن حد التزامن الخاص بمضيف الطلب"""
+        if self.per_host_limit <= 0:
+            yield
+            return
+
+        host = urlparse(url).netloc
+        with self._host_slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.per_host_limit)
+                self._host_slots[host] = slot
+
+        with slot:
+            yield
+
+    def request(self, method, url, controller=None, **kwargs):
+        """
+        إرسال طلب HTTP عبر الجلسة المشتركة
+
+        المعلمات:
+            method (str): طريقة HTTP
+            url (str): عنوان URL
+            controller (AdaptiveController): متحكم اختياري في التزامن والمعدل والمهلة
+            kwargs: وسائط requests الإضافية
+
+        العائد:
+            requests.Response: الاستجابة
+        """
+        response, _ = self._controlled(url, controller, kwargs,
+                                       lambda **options: self.session.request(method, url, **options))
+        return response
+
+    def _controlled(self, url, controller, kwargs, send):
+        """
+        تنفيذ الإرسال ضمن حد المضيف ومع المتحكم التكيفي إن وجد
+
+        يقاس الزمن بعد انتظار المتحكم وحد المضيف، فلا يحسب وقت الطابور المحلي ضمن زمن الاستجابة.
+
+        العائد:
+            tuple: (الاستجابة، زمن الطلب على الشبكة بالثواني)
+        """
+        if controller is None:
+            kwargs.setdefault('timeout', self.timeout)
+            with self.host_slot(url):
+                start_time = time.monotonic()
+                response = send(**kwargs)
+                return response, time.monotonic() - start_time
+
+        host = urlparse(url).netloc
+        controller.acquire(host)
+        kwargs.setdefault('timeout', controller.timeout(host))
+        try:
+            with self.host_slot(url):
+                start_time = time.monotonic()
+                response = send(**kwargs)
+                elapsed = time.monotonic() - start_time
+        except requests.exceptions.RequestException:
+            controller.release(host, error=True)
+            raise
+        controller.release(host, elapsed, response.status_code, response.headers)
+        return response, elapsed
+
+    def get(self, url, **kwargs):
+        """إرسال طلب GET"""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        """إرسال طلب POST"""
+        return self.request("POST", url, **kwargs)
+
+    def read_sample(self, response, max_bytes=0, mode='head', scan=None, chunk_size=65536):
+        """
+        قراءة جسم استجابة requests متدفقة (stream=True) إلى ResponseSample
+
+        المعلمات:
+            response (requests.Response): الاستجابة المفتوحة
+            max_bytes (int): الحد الأقصى للبايتات المحتفظ بها (0 بلا حد)
+            mode (str): 'head' أو 'headtail'
+            scan (StreamScan): فاحص تدريجي يغذى بكل جزء
+            chunk_size (int): حجم الجزء المقروء
+
+        العائد:
+            ResponseSample: العينة
+        """
+        url = response.url
+        collector = self._collector(url, response.headers, max_bytes, mode, scan)
+        try:
+            for chunk in response.iter_content(chunk_size):
+                if not collector.feed(chunk):
+                    break
+        finally:
+            response.close()
+
+        return self._sample(url, response.status_code, response.headers, collector, scan)
+
+    def _collector(self, url, headers, max_bytes, mode, scan):
+        """إنشاء مجمع الجسم وإبلاغ الفاحص بالترميز إن كان معروفًا قبل القراءة"""
+        if scan is not None:
+            encoding = self.encodings.expected(url, headers)
+            if encoding is not None:
+                scan.start(encoding)
+        return BodyCollector(max_bytes, mode, scan.feed if scan else None)
+
+    def _sample(self, url, status_code, headers, collector, scan):
+        """
+        إنشاء ResponseSample بترميز من الرأس أو ذاكرة الترميزات أو بداية الجسم
+
+        ترميز requests الافتراضي لـ text/* دون charset هو ISO-8859-1، لذا لا يعتمد على ترميز المكتبة.
+        الرؤوس تحول إلى CaseInsensitiveDict مهما كانت المكتبة حتى يكون البحث فيها واحدًا في كل المسارات.
+        """
+        if not isinstance(headers, CaseInsensitiveDict):
+            headers = CaseInsensitiveDict(headers.items())
+        if scan is not None:
+            scan.finish()
+        body = collector.body()
+        return ResponseSample(status_code, headers, body, self.encodings.resolve(url, headers, body),
+                              collector.total_bytes, collector.truncated, scan)
+
+    async def read_sample_async(self, resp, max_bytes=0, mode='head', scan=None, chunk_size=65536):
+        """
+        قراءة جسم استجابة aiohttp إلى ResponseSample بنفس قواعد read_sample
+
+        العائد:
+            ResponseSample: العينة
+        """
+        url = str(resp.url)
+        headers = CaseInsensitiveDict(resp.headers.items())
+        collector = self._collector(url, headers, max_bytes, mode, scan)
+        async for chunk in resp.content.iter_chunked(chunk_size):
+            if not collector.feed(chunk):
+                resp.close()
+                break
+
+        return self._sample(url, resp.status, headers, collector, scan)
+
+    def fetch(self, method, url, controller=None, max_bytes=0, mode='head', scan=None, **kwargs):
+        """
+        إرسال طلب فحص وقراءة جسمه إلى ResponseSample عبر HTTP/1.1 أو HTTP/2 حسب إعداد الناقل
+
+        المعلمات:
+            method (str): طريقة HTTP
+            url (str): عنوان URL
+            controller (AdaptiveController): متحكم اختياري في التزامن والمعدل والمهلة
+            max_bytes (int): الحد الأقصى للبايتات المحتفظ بها (0 بلا حد)
+            mode (str): 'head' أو 'headtail'
+            scan (StreamScan): فاحص تدريجي يغذى بكل جزء
+            kwargs: params و data و headers و allow_redirects و timeout
+
+        العائد:
+            ResponseSample: العينة وزمن الطلب على الشبكة في elapsed
+        """
+        if not self.http2:
+            kwargs['stream'] = True
+            response, elapsed = self._controlled(url, controller, kwargs,
+                                                 lambda **options: self.session.request(method, url, **options))
+            sample = self.read_sample(response, max_bytes, mode, scan)
+        else:
+            sample, elapsed = self._controlled(
+                url, controller, kwargs,
+                lambda **options: self._fetch_h2(method, url, max_bytes, mode, scan, **options))
+        sample.elapsed = elapsed
+        return sample
+
+    def _h2(self):
+        """عميل httpx المشترك بين المواضيع؛ ينشئ اتصالاً واحدًا لكل مضيف تتعدد فيه التدفقات"""
+        httpx = _import_httpx()
+        with self._h2_lock:
+            if self._h2_client is None:
+                self._h2_client = httpx.Client(**self._h2_options(httpx, self.pool_maxsize))
+            return httpx, self._h2_client
+
+    def _h2_options(self, httpx, max_connections, timeout=None):
+        """
+        وسائط عميل httpx
+
+        يوزع httpcore الطلبات المتزامنة كتدفقات على الاتصال المفتوح ولا يتجاوز
+        SETTINGS_MAX_CONCURRENT_STREAMS التي يعلنها الخادم؛ الطلبات الزائدة تنتظر
+        تدفقًا متاحًا بدلاً من فتح اتصالات جديدة.
+        """
+        return {
+            'http1': not self.http2_prior_knowledge,
+            'http2': True,
+            'verify': self.verify,
+            'timeout': timeout or self.timeout,
+            'limits': httpx.Limits(max_connections=max_connections,
+                                   max_keepalive_connections=self.pool_connections if self.keep_alive else 0),
+            'cookies': http.cookiejar.CookieJar(http.cookiejar.DefaultCookiePolicy(allowed_domains=[])),
+        }
+
+    @staticmethod
+    def _h2_request(client, method, url, params=None, data=None, headers=None, timeout=None, extensions=None):
+        """بناء طلب httpx من وسائط requests (القواميس نموذج، والنص أو البايت جسم خام)"""
+        options = {'data': data} if isinstance(data, dict) else {'content': data}
+        if timeout is not None:
+            options['timeout'] = timeout
+        if extensions is not None:
+            options['extensions'] = extensions
+        return client.build_request(method, url, params=params, headers=headers, **options)
+
+    def _fetch_h2(self, method, url, max_bytes, mode, scan, allow_redirects=True, chunk_size=65536, **kwargs):
+        """إرسال طلب عبر عميل HTTP/2 وقراءته بنفس قواعد read_sample"""
+        httpx, client = self._h2()
+        try:
+            response = client.send(self._h2_request(client, method, url, **kwargs),
+                                   stream=True, follow_redirects=allow_redirects)
+            collector = self._collector(url, response.headers, max_bytes, mode, scan)
+            try:
+                for chunk in response.iter_bytes(chunk_size):
+                    if not collector.feed(chunk):
+                        break
+            finally:
+                response.close()
+        # تحويل أخطاء httpx إلى أخطاء requests التي تعالجها الوحدات
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except httpx.HTTPError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+
+        return self._sample(url, response.status_code, response.headers, collector, scan)
+
+    async def fetch_async(self, session, method, url, max_bytes=0, mode='head', scan=None, timeout=None,
+                          allow_redirects=False, chunk_size=65536, **kwargs):
+        """
+        إرسال طلب فحص عبر جلسة async_session وقراءة جسمه إلى ResponseSample
+
+        يبدأ قياس الزمن عند الحصول على اتصال، فلا يحسب انتظار مكان في مجمع الاتصالات
+        ضمن زمن الاستجابة كما في fetch.
+
+        المعلمات:
+            session: الجلسة من async_session
+            timeout (float): مهلة هذا الطلب بالثواني (None لمهلة الجلسة)
+            kwargs: params و data و headers
+
+        العائد:
+            ResponseSample: العينة وزمن الطلب على الشبكة في elapsed
+        """
+        clock = {'start': time.monotonic()}
+        if not self.http2:
+            if timeout is not None:
+                kwargs['timeout'] = aiohttp.ClientTimeout(total=timeout)
+            async with session.request(method, url, allow_redirects=allow_redirects, trace_request_ctx=clock,
+                                       **kwargs) as resp:
+                sample = await self.read_sample_async(resp, max_bytes, mode, scan, chunk_size)
+            sample.elapsed = time.monotonic() - clock['start']
+            return sample
+
+        async def trace(event, info):
+            # أول حدث بعد خروج الطلب من طابور المجمع: فتح اتصال جديد أو إرسال الرؤوس على اتصال قائم
+            if not clock.get('acquired') and event.endswith(_H2_ACQUIRED_EVENTS):
+                clock['start'] = time.monotonic()
+                clock['acquired'] = True
+
+        httpx = _import_httpx()
+        try:
+            request = self._h2_request(session, method, url, timeout=timeout, extensions={'trace': trace}, **kwargs)
+            response = await session.send(request, stream=True, follow_redirects=allow_redirects)
+            collector = self._collector(url, response.headers, max_bytes, mode, scan)
+            try:
+                async for chunk in response.aiter_bytes(chunk_size):
+                    if not collector.feed(chunk):
+                        break
+            finally:
+                await response.aclose()
+        # تحويل أخطاء httpx إلى أخطاء aiohttp التي يعالجها محرك asyncio
+        except httpx.TimeoutException as e:
+            raise asyncio.TimeoutError(str(e)) from e
+        except httpx.HTTPError as e:
+            raise aiohttp.ClientError(str(e)) from e
+
+        sample = self._sample(url, response.status_code, response.headers, collector, scan)
+        sample.elapsed = time.monotonic() - clock['start']
+        return sample
+
+    def async_session(self, concurrency=500, timeout=None):
+        """
+        إنشاء جلسة aiohttp بنفس إعدادات المجمع، أو عميل httpx غير متزامن مع HTTP/2
+
+        المعلمات:
+            concurrency (int): الحد الأقصى للاتصالات المتزامنة
+            timeout (float): مهلة الطلب بالثواني
+
+        العائد:
+            aiohttp.ClientSession أو httpx.AsyncClient: جلسة غير متزامنة لاستخدامها مع fetch_async
+        """
+        if self.http2:
+            httpx = _import_httpx()
+            return httpx.AsyncClient(**self._h2_options(httpx, concurrency, timeout))
+
+        connector = aiohttp.TCPConnector(
+            limit=concurrency,
+            limit_per_host=max(self.per_host_limit, 0),
+            use_dns_cache=self.dns_cache_ttl > 0,
+            ttl_dns_cache=self.dns_cache_ttl or None,
+            force_close=not self.keep_alive,
+            ssl=None if self.verify else False,
+        )
+        client_timeout = aiohttp.ClientTimeout(total=timeout or self.timeout)
+        return aiohttp.ClientSession(connector=connector, timeout=client_timeout,
+                                     cookie_jar=aiohttp.DummyCookieJar(), trace_configs=[_queue_trace()])
+
+    def close(self):
+        """إغلاق جميع الاتصالات المفتوحة"""
+        self.session.close()
+        with self._h2_lock:
+            if self._h2_client is not None:
+                self._h2_client.close()
+                self._h2_client = None
+
+
+# الناقل المشترك بين جميع الوحدات
+_shared_transport = None
+_shared_lock = threading.Lock()
+
+
+def get_transport():
+    """
+    الحصول على الناقل المشترك، وإنشاؤه بالإعدادات الافتراضية عند الحاجة
+
+    العائد:
+        HTTPTransport: الناقل المشترك
+    """
+    global _shared_transport
+    with _shared_lock:
+        if _shared_transport is None:
+            _shared_transport = HTTPTransport()
+        return _shared_transport
+
+
+def configure_transport(**options):
+    """
+    استبدال الناقل المشترك بناقل جديد بالإعدادات المحددة
+
+    المعلمات:
+        options: وسائط HTTPTransport
+
+    العائد:
+        HTTPTransport: الناقل المشترك الجديد
+    """
+    global _shared_transport
+    with _shared_lock:
+        if _shared_transport is not None:
+            _shared_transport.close()
+        _shared_transport = HTTPTransport(**options)
+        return _shared_transport
@@ -15,10 +15,10 @@ import logging
 import platform
 import subprocess
 import pkg_resources
-import requests
 from datetime import datetime, timedelta
 from packaging import version
 
+from urlget.transport import get_transport
 from urlget.utils import setup_logger
 
 # عنوان مستودع GitHub
@@ -125,7 +125,7 @@ class Updater:
         
         try:
             # التحقق من أحدث إصدار
-            response = requests.get(GITHUB_RELEASES_URL, timeout=10)
+            response = get_transport().get(GITHUB_RELEASES_URL, timeout=10)
             response.raise_for_status()
             release_info = response.json()
             
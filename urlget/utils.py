@@ -13,6 +13,10 @@ def setup_logger(name, log_file=None, level=logging.INFO):
     logger = logging.getLogger(name)
     logger.setLevel(level)
     
+    # عدم تكرار المعالجات عند إنشاء عدة كائنات بنفس اسم المسجل (مثل فحص عدة أهداف)
+    if logger.handlers:
+        return logger
+    
     # إنشاء منسق السجل
     formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     
@@ -56,6 +60,19 @@ def save_results(results, output_file=None):
     
     return output_file
 
+def parse_address(address, default_host="127.0.0.1"):
+    """
+    تحويل "المضيف:المنفذ" إلى زوج
+
+    المعلمات:
+        address (str): العنوان، مثل 127.0.0.1:7700 أو :7700
+
+    العائد:
+        tuple: (المضيف، المنفذ)
+    """
+    host, _, port = address.rpartition(":")
+    return host or default_host, int(port)
+
 def check_linux():
     """التحقق من أن النظام هو لينكس"""
     if sys.platform != "linux":
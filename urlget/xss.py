@@ -4,44 +4,75 @@
 import os
 import re
 import logging
+import threading
 import requests
 from urllib.parse import urlparse, parse_qs, urlencode
 from bs4 import BeautifulSoup
 from colorama import Fore, Style
 from tqdm import tqdm
 
+from urlget.charset import encode_variants
+from urlget.corpus import open_corpus
+from urlget.metrics import RequestMetrics, estimate_request_bytes
+from urlget.mutations import mutate, with_origin
+from urlget.ratecontrol import AdaptiveController
+from urlget.signatures import SignatureMatcher
+from urlget.transport import get_transport
 from urlget.utils import setup_logger
 
 class XSSScanner:
     """فئة لاختبار ثغرات XSS والثغرات المماثلة"""
     
-    def __init__(self, url, payloads_file=None, params=None, verbose=False):
+    def __init__(self, url, payloads_file=None, params=None, transport=None, adaptive=False, max_rate=None,
+                 max_body=262144, mutations=None, verbose=False):
         """تهيئة الماسح"""
         self.url = url
         self.payloads_file = payloads_file
         self.params = params.split(',') if params else None
+        self.transport = transport or get_transport()
+        self.max_body = max_body
+        # سلاسل تحويلات الترميز المطبقة على كل حمولة (مثل "raw,url,html")
+        self.mutations = mutations
         self.verbose = verbose
         
+        # مطابق بدون تواقيع يستخدم فقط للبحث التدريجي عن الحمولة المنعكسة أثناء القراءة
+        self.reflection_matcher = SignatureMatcher(packs=[])
+        
+        # متحكم AIMD في المعدل والمهلة؛ الفحص تسلسلي لذا يبقى التزامن واحدًا
+        self.controller = None
+        if adaptive:
+            self.controller = AdaptiveController(initial_concurrency=1, max_concurrency=1, max_rate=max_rate)
+        
         # إعداد السجل
         self.logger = setup_logger("XSSScanner", level=logging.DEBUG if verbose else logging.INFO)
         
+        # مقاييس الطلبات (تعرض عبر --metrics)
+        self.request_metrics = RequestMetrics("xss")
+        
         # قوائم لتخزين البيانات
         self.payloads = []
         self.results = []
         self.vulnerable_params = []
+        
+        # قفل الطباعة عند فحص عدة نقاط حقن أو أهداف بالتوازي
+        self.print_lock = threading.Lock()
     
     def load_payloads(self):
         """تحميل حمولات XSS من ملف أو استخدام الحمولات الافتراضية"""
         if self.payloads_file and os.path.exists(self.payloads_file):
             try:
-                with open(self.payloads_file, 'r', encoding='utf-8') as f:
-                    self.payloads = [line.strip() for line in f if line.strip()]
+                self.payloads = open_corpus(self.payloads_file)
                 self.logger.info(f"تم تحميل {len(self.payloads)} حمولة XSS من الملف")
             except Exception as e:
                 self.logger.error(f"فشل في تحميل حمولات XSS من الملف: {str(e)}")
                 self._use_default_payloads()
         else:
             self._use_default_payloads()
+        
+        if self.mutations:
+            base_count = len(self.payloads)
+            self.payloads = mutate(self.payloads, self.mutations)
+            self.logger.info(f"توليد {len(self.payloads)} متغيرًا من {base_count} حمولة XSS")
     
     def _use_default_payloads(self):
         """استخدام حمولات XSS الافتراضية"""
@@ -101,12 +132,39 @@ class XSSScanner:
         
         return base_url, params
     
+    def _fetch(self, method, url, payload=None, mode="param", **kwargs):
+        """
+        إرسال طلب وقراءة الجسم بشكل متدفق حتى الحد الأقصى مع البحث عن الحمولة أثناء القراءة
+        
+        mode هو تسمية الطلب في المقاييس (param أو form)، وجلب الصفحة دون حمولة يسمى page.
+        """
+        scan = None
+        if payload:
+            clean_payload = re.sub(r'[\'"`()]', '', payload)
+            scan = self.reflection_matcher.stream(encode_variants(clean_payload, self.transport.encodings.likely(url)))
+        try:
+            sample = self.transport.fetch(method, url, self.controller, self.max_body, scan=scan, **kwargs)
+        except requests.exceptions.RequestException as e:
+            self.request_metrics.error(e)
+            raise
+        self.request_metrics.record(sample.status_code, sample.elapsed,
+                                    estimate_request_bytes(url, kwargs.get('params'), kwargs.get('headers'),
+                                                           kwargs.get('data')),
+                                    sample.total_bytes or 0, mode if payload else "page")
+        return sample
+    
+    def _is_reflected(self, response, payload):
+        """التحقق من انعكاس الحمولة؛ يتم تحليل HTML فقط إذا ظهرت الحمولة أثناء القراءة"""
+        if response.scan is not None and not response.scan.found:
+            return False
+        return self._check_xss_reflection(response.text, payload)
+    
     def extract_forms(self, url):
         """استخراج النماذج من صفحة الويب"""
         self.logger.info(f"استخراج النماذج من: {url}")
         
         try:
-            response = requests.get(url, timeout=10)
+            response = self._fetch("GET", url)
             soup = BeautifulSoup(response.text, 'lxml')
             
             forms = []
@@ -145,54 +203,71 @@ class XSSScanner:
             return []
         
         vulnerable_params = []
+        for param_name in self.target_params(params):
+            vuln = self.scan_param(base_url, params, param_name)
+            if vuln:
+                vulnerable_params.append(vuln)
         
-        # تحديد المعلمات المستهدفة
-        target_params = self.params if self.params else params.keys()
+        return vulnerable_params
+    
+    def target_params(self, params):
+        """المعلمات المستهدفة الموجودة في عنوان URL"""
+        if not self.params:
+            return list(params)
+        
+        missing = [name for name in self.params if name not in params]
+        for param_name in missing:
+            self.logger.warning(f"المعلمة '{param_name}' غير موجودة في عنوان URL")
+        return [name for name in self.params if name in params]
+    
+    def scan_param(self, base_url, params, param_name):
+        """
+        فحص معلمة URL واحدة بالحمولات حتى أول انعكاس
+        
+        العائد:
+            dict: الثغرة أو None
+        """
+        self.logger.info(f"فحص المعلمة: {param_name}")
         
-        for param_name in target_params:
-            if param_name not in params:
-                self.logger.warning(f"المعلمة '{param_name}' غير موجودة في عنوان URL")
-                continue
+        # يرسل المتغير المرمز، ويبحث عن الحمولة الأصلية القابلة للتنفيذ في الاستجابة
+        for payload, origin in tqdm(with_origin(self.payloads), total=len(self.payloads),
+                                    desc=f"فحص {param_name}", disable=not self.verbose):
+            # نسخ المعلمات الأصلية
+            new_params = {k: v[0] if isinstance(v, list) and len(v) > 0 else v for k, v in params.items()}
             
-            self.logger.info(f"فحص المعلمة: {param_name}")
+            # استبدال قيمة المعلمة بالحمولة
+            new_params[param_name] = payload
             
-            for payload in tqdm(self.payloads, desc=f"فحص {param_name}", disable=not self.verbose):
-                # نسخ المعلمات الأصلية
-                new_params = {k: v[0] if isinstance(v, list) and len(v) > 0 else v for k, v in params.items()}
-                
-                # استبدال قيمة المعلمة بالحمولة
-                new_params[param_name] = payload
-                
-                # إنشاء عنوان URL الجديد
-                query_string = urlencode(new_params, doseq=True)
-                test_url = f"{base_url}?{query_string}"
+            # إنشاء عنوان URL الجديد
+            query_string = urlencode(new_params, doseq=True)
+            test_url = f"{base_url}?{query_string}"
+            
+            try:
+                response = self._fetch("GET", test_url, origin)
                 
-                try:
-                    response = requests.get(test_url, timeout=10)
+                # التحقق من وجود الحمولة في الاستجابة
+                if self._is_reflected(response, origin):
+                    vuln = {
+                        'param_name': param_name,
+                        'payload': payload,
+                        'url': test_url,
+                        'type': 'reflected'
+                    }
                     
-                    # التحقق من وجود الحمولة في الاستجابة
-                    if self._check_xss_reflection(response.text, payload):
-                        vuln = {
-                            'param_name': param_name,
-                            'payload': payload,
-                            'url': test_url,
-                            'type': 'reflected'
-                        }
-                        vulnerable_params.append(vuln)
-                        
+                    with self.print_lock:
                         print(f"{Fore.RED}[!] تم العثور على ثغرة XSS محتملة!{Style.RESET_ALL}")
                         print(f"  المعلمة: {param_name}")
                         print(f"  الحمولة: {payload}")
                         print(f"  URL: {test_url}")
                         print(f"  النوع: منعكس (Reflected)")
-                        
-                        # تجنب اختبار المزيد من الحمولات لهذه المعلمة
-                        break
-                        
-                except requests.exceptions.RequestException as e:
-                    self.logger.error(f"خطأ أثناء اختبار المعلمة {param_name}: {str(e)}")
+                    
+                    # تجنب اختبار المزيد من الحمولات لهذه المعلمة
+                    return vuln
+                    
+            except requests.exceptions.RequestException as e:
+                self.logger.error(f"خطأ أثناء اختبار المعلمة {param_name}: {str(e)}")
         
-        return vulnerable_params
+        return None
     
     def scan_forms(self):
         """فحص النماذج للبحث عن ثغرات XSS"""
@@ -212,54 +287,66 @@ class XSSScanner:
                 if input_field['type'] in ['hidden', 'submit', 'button', 'image']:
                     continue
                 
-                input_name = input_field['name']
-                
                 # تحديد المعلمات المستهدفة
-                if self.params and input_name not in self.params:
+                if self.params and input_field['name'] not in self.params:
                     continue
                 
-                self.logger.info(f"فحص الحقل: {input_name}")
+                vuln = self.scan_field(form, input_field['name'])
+                if vuln:
+                    vulnerable_forms.append(vuln)
+        
+        return vulnerable_forms
+    
+    def scan_field(self, form, input_name):
+        """
+        فحص حقل نموذج واحد بالحمولات حتى أول انعكاس
+        
+        العائد:
+            dict: الثغرة أو None
+        """
+        self.logger.info(f"فحص الحقل: {input_name}")
+        
+        for payload, origin in tqdm(with_origin(self.payloads), total=len(self.payloads),
+                                    desc=f"فحص {input_name}", disable=not self.verbose):
+            # إنشاء بيانات النموذج
+            data = {}
+            for inp in form['inputs']:
+                if inp['type'] not in ['submit', 'button', 'image']:
+                    if inp['name'] == input_name:
+                        data[inp['name']] = payload
+                    else:
+                        data[inp['name']] = inp['value'] or "test"
+            
+            try:
+                if form['method'] == 'post':
+                    response = self._fetch("POST", form['action'], origin, mode="form", data=data)
+                else:
+                    response = self._fetch("GET", form['action'], origin, mode="form", params=data)
                 
-                for payload in tqdm(self.payloads, desc=f"فحص {input_name}", disable=not self.verbose):
-                    # إنشاء بيانات النموذج
-                    data = {}
-                    for inp in form['inputs']:
-                        if inp['type'] not in ['submit', 'button', 'image']:
-                            if inp['name'] == input_name:
-                                data[inp['name']] = payload
-                            else:
-                                data[inp['name']] = inp['value'] or "test"
+                # التحقق من وجود الحمولة في الاستجابة
+                if self._is_reflected(response, origin):
+                    vuln = {
+                        'form_action': form['action'],
+                        'form_method': form['method'],
+                        'input_name': input_name,
+                        'payload': payload,
+                        'type': 'reflected'
+                    }
+                    
+                    with self.print_lock:
+                        print(f"{Fore.RED}[!] تم العثور على ثغرة XSS محتملة في النموذج!{Style.RESET_ALL}")
+                        print(f"  النموذج: {form['action']} ({form['method']})")
+                        print(f"  الحقل: {input_name}")
+                        print(f"  الحمولة: {payload}")
+                        print(f"  النوع: منعكس (Reflected)")
                     
-                    try:
-                        if form['method'] == 'post':
-                            response = requests.post(form['action'], data=data, timeout=10)
-                        else:
-                            response = requests.get(form['action'], params=data, timeout=10)
-                        
-                        # التحقق من وجود الحمولة في الاستجابة
-                        if self._check_xss_reflection(response.text, payload):
-                            vuln = {
-                                'form_action': form['action'],
-                                'form_method': form['method'],
-                                'input_name': input_name,
-                                'payload': payload,
-                                'type': 'reflected'
-                            }
-                            vulnerable_forms.append(vuln)
-                            
-                            print(f"{Fore.RED}[!] تم العثور على ثغرة XSS محتملة في النموذج!{Style.RESET_ALL}")
-                            print(f"  النموذج: {form['action']} ({form['method']})")
-                            print(f"  الحقل: {input_name}")
-                            print(f"  الحمولة: {payload}")
-                            print(f"  النوع: منعكس (Reflected)")
-                            
-                            # تجنب اختبار المزيد من الحمولات لهذا الحقل
-                            break
-                            
-                    except requests.exceptions.RequestException as e:
-                        self.logger.error(f"خطأ أثناء اختبار الحقل {input_name}: {str(e)}")
+                    # تجنب اختبار المزيد من الحمولات لهذا الحقل
+                    return vuln
+                    
+            except requests.exceptions.RequestException as e:
+                self.logger.error(f"خطأ أثناء اختبار الحقل {input_name}: {str(e)}")
         
-        return vulnerable_forms
+        return None
     
     def _check_xss_reflection(self, response_text, payload):
         """التحقق من وجود الحمولة في الاستجابة"""